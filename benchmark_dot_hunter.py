@@ -0,0 +1,231 @@
+"""
+benchmark_dot_hunter.py
+
+Headless end-to-end benchmark: replays a video file or a directory of
+images through the same per-frame path as the real-time game (hand
+tracking, fingertip extraction, resize, then play_frame: fingertips,
+object movement, drawing, collisions and HUD), without opening any
+window, and reports per-stage latency percentiles, frames per second and
+peak memory as JSON.
+
+Usage:
+    python benchmark_dot_hunter.py --source path/to/video.mp4
+    python benchmark_dot_hunter.py --source path/to/frames/ --players 2 -o result.json
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import cv2
+
+from src.hand_tracker import HandTracker
+from src.dot_game import CollectibleGame
+from src.buffers import BufferPool, ScreenBuffer
+from src.frame_source import open_capture
+from src.hud import game_hud_rect
+from src.instrumentation import Profiler, summarize
+from src.session import play_frame
+
+
+STAGES = ("read", "flip", "inference", "landmarks", "resize", "play")
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MiB.
+
+    Returns:
+        float or None: None on platforms without the resource module.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # bytes on macOS, KiB elsewhere
+        rss /= 1024
+    return rss / 1024
+
+
+def run_benchmark(source, players=1, screen_size=(1920, 1080), max_frames=None,
+                  warmup=5, seed=0, tracker_options=None, timer_duration=60, source_fps=30,
+                  game_options=None, buffered=False):
+    """
+    Push every frame of a source through the game loop and time each stage.
+
+    Args:
+        source (str): Video file or image directory.
+        players (int): Number of players (1 or 2).
+        screen_size (tuple): (width, height) the frames are resized to.
+        max_frames (int or None): Stop after this many timed frames.
+        warmup (int): Frames processed before timing starts.
+        seed (int): Seed for object placement so runs are comparable.
+        tracker_options (dict or None): Extra HandTracker keyword arguments.
+        timer_duration (int): Round length shown by the HUD timer.
+        source_fps (float): Frame rate used to derive the HUD timer and the
+            time step of moving objects from the frame index, so the game
+            does the same work as in a live game.
+        game_options (dict or None): Extra CollectibleGame keyword arguments.
+        buffered (bool): Capture into recycled buffers, mirror landmarks
+            instead of pixels and scale into a preallocated screen image,
+            like streaming_dot_hunter.py --buffers.
+
+    Returns:
+        dict: The benchmark report.
+    """
+    cap = open_capture(source)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open source: {source}")
+
+    screen_width, screen_height = screen_size
+    tracker_options = tracker_options or {}
+    tracker = HandTracker(
+        mode=False, maxHands=players, detectionCon=0.7, trackCon=0.7, mirror=buffered,
+        **tracker_options
+    )
+    pool = BufferPool() if buffered else None
+    screen = ScreenBuffer(screen_size, mirror=True) if buffered else None
+    # full-size images allocated by the frame loop (read, flip, resize)
+    frame_allocations = 0
+    # the parts of play_frame: "update", "draw", "collisions" and "hud"
+    profiler = Profiler(enabled=True, window=max_frames or 100000)
+    game = CollectibleGame(
+        screen_width, screen_height, players=players, max_coins=5, max_bombs=1,
+        avoid_rects=[game_hud_rect(screen_width, players)], rng=seed, profiler=profiler,
+        **(game_options or {}),
+    )
+    huds = {}
+
+    timings = {stage: [] for stage in STAGES}
+    frame_times = []
+    frame_index = 0
+    clock = time.perf_counter
+
+    while max_frames is None or len(frame_times) < max_frames:
+        t0 = clock()
+        ret, frame = pool.read(cap) if buffered else cap.read()
+        t1 = clock()
+        if not ret:
+            break
+        if not buffered:
+            frame = cv2.flip(frame, 1)
+            frame_allocations += 2
+        t2 = clock()
+        frame = tracker.find_hands(frame, draw=False)
+        t3 = clock()
+        tips = tracker.get_player_tips(frame, players)
+        t4 = clock()
+
+        scale_x = screen_width / frame.shape[1]
+        scale_y = screen_height / frame.shape[0]
+        if buffered:
+            captured, frame = frame, screen.render(frame)
+            pool.release(captured)
+        else:
+            frame = cv2.resize(frame, (screen_width, screen_height), interpolation=cv2.INTER_LINEAR)
+            frame_allocations += 1
+        tips = [
+            (int(x * scale_x), int(y * scale_y)) if x is not None and y is not None
+            else (None, None)
+            for x, y in tips
+        ]
+        t5 = clock()
+        remaining_time = max(0, timer_duration - int(frame_index / source_fps))
+        play_frame(frame, game, tips, 1.0 / source_fps, remaining_time, huds, profiler=profiler)
+        t6 = clock()
+
+        frame_index += 1
+        if frame_index <= warmup:
+            if frame_index == warmup:
+                profiler.reset()
+            continue
+        for stage, start, end in zip(STAGES, (t0, t1, t2, t3, t4, t5),
+                                     (t1, t2, t3, t4, t5, t6)):
+            timings[stage].append(end - start)
+        frame_times.append(t6 - t0)
+
+    cap.release()
+
+    total = sum(frame_times)
+    if buffered:
+        frame_allocations = pool.allocations + screen.allocations
+    allocations = frame_allocations + tracker.allocations
+    return {
+        "source": source,
+        "players": players,
+        "screen_size": list(screen_size),
+        "tracker_options": tracker_options,
+        "game_options": game_options or {},
+        "buffered": buffered,
+        "frames": len(frame_times),
+        "warmup_frames": min(warmup, frame_index),
+        "total_s": round(total, 4),
+        "fps": round(len(frame_times) / total, 2) if total > 0 else None,
+        "frame": summarize(frame_times),
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+        "play_stages": profiler.stats(),
+        "scores": list(game.scores),
+        "hud_cache": huds[1.0].stats()["total"] if huds else None,
+        "allocations_per_frame": round(allocations / frame_index, 3) if frame_index else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "opencv": cv2.__version__,
+        "python": sys.version.split()[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay recorded frames through the Dot Hunter game loop "
+        "without a webcam or display and report timings as JSON."
+    )
+    parser.add_argument(
+        "--source", "-s", required=True, help="Video file or directory of images"
+    )
+    parser.add_argument("--players", "-p", type=int, choices=(1, 2), default=1)
+    parser.add_argument(
+        "--screen-size",
+        nargs=2,
+        type=int,
+        default=(1920, 1080),
+        metavar=("WIDTH", "HEIGHT"),
+        help="Resolution frames are resized to, like the fullscreen window",
+    )
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed warm-up frames")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--inference-scale", type=float, default=1.0)
+    parser.add_argument("--roi", action="store_true")
+    parser.add_argument("--swept", action="store_true", help="Use swept fingertip collisions")
+    parser.add_argument(
+        "--object-speed", type=float, default=0.0, help="Speed of the objects in pixels/s"
+    )
+    parser.add_argument(
+        "--buffers", action="store_true", help="Use the preallocated buffer frame loop"
+    )
+    parser.add_argument("--output", "-o", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.source,
+        players=args.players,
+        screen_size=tuple(args.screen_size),
+        max_frames=args.max_frames,
+        warmup=args.warmup,
+        seed=args.seed,
+        tracker_options={"inference_scale": args.inference_scale, "roi": args.roi},
+        game_options={"swept": args.swept, "object_speed": args.object_speed},
+        buffered=args.buffers,
+    )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
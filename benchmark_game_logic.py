@@ -0,0 +1,341 @@
+"""
+benchmark_game_logic.py
+
+Game-logic micro-benchmarks: drives CollectibleGame and DotGame with
+synthetic fingertip trajectories (random walks, swipes, many fingers; see
+src/trajectories.py) without a camera, and times check_collisions, the
+respawn of one or many caught objects, draw_objects and bulk spawning
+separately for object counts from 5 to 10,000. Games and trajectories are seeded, so every run
+does the same work. The suite runs several times and keeps each case's
+fastest p50, and the results are written as JSON and can be compared
+against a stored baseline to catch performance regressions.
+
+Usage:
+    python benchmark_game_logic.py --output baseline.json
+    python benchmark_game_logic.py --baseline baseline.json --output latest.json
+    python benchmark_game_logic.py --quick --counts 5 1000 --trajectories swipes
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from src.dot_game import CollectibleGame, DotGame
+from src.instrumentation import summarize
+from src.trajectories import TRAJECTORIES, as_tips
+
+
+COUNTS = (5, 50, 500, 5000, 10000)
+# fingertips (= players) driven by each trajectory
+FINGERS = {"random_walk": 1, "swipes": 2, "multi_finger": 10}
+FRAME_SIZE = (1920, 1080)
+
+
+def make_game(count, players, seed, frame_size=FRAME_SIZE, swept=True):
+    """
+    A CollectibleGame holding `count` objects (about 80% coins).
+
+    The spawn spacing shrinks with the count so that many objects still
+    fit inside the spawn padding, well below the packing limit.
+    """
+    width, height = frame_size
+    bombs = max(1, count // 5)
+    spacing = min(60.0, 0.55 * math.sqrt((width - 160) * (height - 160) / count))
+    game = CollectibleGame(
+        width, height, players=players, max_coins=count - bombs, max_bombs=bombs,
+        spawn_spacing=spacing, swept=swept, rng=seed,
+    )
+    fill(game)
+    return game
+
+
+def fill(game):
+    """Replace the initial objects by max_coins coins and max_bombs bombs."""
+    game.store.clear()
+    game.spawn_objects("coin", game.max_coins)
+    game.spawn_objects("bomb", game.max_bombs)
+
+
+def timed(function, repeats, warmup=2):
+    """Call function repeats + warmup times and return the timed durations."""
+    samples = []
+    for i in range(repeats + warmup):
+        start = time.perf_counter()
+        function()
+        if i >= warmup:
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_collisions(game, points):
+    """Time check_collisions on every frame of a trajectory."""
+    frames = [as_tips(frame) for frame in points]
+    samples = []
+    for tips in frames:
+        start = time.perf_counter()
+        game.check_collisions(tips)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_respawn(game, repeats, seed, catches=1):
+    """
+    Time replacing `catches` random objects the way a frame's catches are
+    (CollectibleGame._replace), keeping the count.
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(repeats):
+        indices = game.store.indices().tolist()
+        slots = rng.sample(indices, min(catches, len(indices)))
+        start = time.perf_counter()
+        game._replace(slots)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_suite(counts=COUNTS, trajectories=tuple(TRAJECTORIES), frames=300, repeats=30,
+              seed=0, frame_size=FRAME_SIZE, log=None):
+    """
+    Run every benchmark case.
+
+    Args:
+        counts (Iterable[int]): Object counts.
+        trajectories (Iterable[str]): Names from TRAJECTORIES.
+        frames (int): Frames per trajectory (check_collisions calls).
+        repeats (int): Timed calls of the other operations per case.
+            Above 500 objects, frames and repeats shrink in proportion to
+            the count (to at least 10), so large cases take seconds, not
+            minutes, while every run still does the same work.
+        seed (int): Seed of the games and trajectories.
+        frame_size (tuple): (width, height) of the game area.
+        log (callable or None): Called with the name of each case.
+
+    Returns:
+        dict: Case name -> its parameters and timing stats (see summarize),
+        in milliseconds per call.
+    """
+    cases = {}
+
+    def add(name, samples, **params):
+        if log is not None:
+            log(name)
+        cases[name] = {**params, "samples": len(samples), **summarize(samples)}
+
+    frame = np.zeros((frame_size[1], frame_size[0], 3), dtype=np.uint8)
+    for count in counts:
+        def scaled(n):
+            return max(10, min(n, n * 500 // count))
+
+        game = make_game(count, 1, seed, frame_size)
+        add(f"collectible/spawn/n={count}", timed(lambda: fill(game), scaled(repeats)),
+            operation="spawn", objects=count)
+        add(f"collectible/respawn/n={count}", bench_respawn(game, scaled(repeats), seed),
+            operation="respawn", objects=count)
+        # a frame where a swipe through a crowded screen catches many objects
+        catches = min(count, max(10, count // 100))
+        add(f"collectible/respawn_many/n={count}",
+            bench_respawn(game, scaled(repeats), seed, catches),
+            operation="respawn_many", objects=count, catches=catches)
+        add(f"collectible/draw_batch/n={count}",
+            timed(lambda: game.draw_objects(frame, batch=True), scaled(repeats)),
+            operation="draw_batch", objects=count)
+        add(f"collectible/draw/n={count}",
+            timed(lambda: game.draw_objects(frame), scaled(repeats)),
+            operation="draw", objects=count)
+        for name in trajectories:
+            fingers = FINGERS[name]
+            points = TRAJECTORIES[name](scaled(frames), fingers, frame_size, rng=seed)
+            game = make_game(count, fingers, seed, frame_size)
+            samples = bench_collisions(game, points)
+            add(f"collectible/check_collisions/{name}/n={count}", samples,
+                operation="check_collisions", trajectory=name, objects=count,
+                fingers=fingers, score=sum(game.scores))
+
+    for name in trajectories:
+        fingers = FINGERS[name]
+        points = TRAJECTORIES[name](frames, fingers, frame_size, rng=seed)
+        game = DotGame(*frame_size, players=fingers, rng=seed)
+        samples = bench_collisions(game, points)
+        add(f"dot/check_collisions/{name}", samples,
+            operation="check_collisions", trajectory=name, objects=1, fingers=fingers,
+            score=sum(game.scores))
+    game = DotGame(*frame_size, rng=seed)
+    add("dot/spawn", timed(game.spawn_dot, repeats), operation="spawn", objects=1)
+    return cases
+
+
+def best_of(runs):
+    """
+    Merge several run_suite results into one, keeping for every case the
+    run with the lowest p50. Slow runs are mostly other load on the
+    machine, so the fastest one is the most repeatable; the p50 of every
+    run is kept as p50_ms_runs to show the spread.
+
+    Args:
+        runs (List[dict]): Results of run_suite with the same cases.
+
+    Returns:
+        dict: Case name -> the fastest run's case plus p50_ms_runs.
+    """
+    cases = {}
+    for name in runs[0]:
+        results = [run[name] for run in runs if name in run]
+        best = min(results, key=lambda case: case["p50_ms"])
+        cases[name] = {**best, "p50_ms_runs": [case["p50_ms"] for case in results]}
+    return cases
+
+
+def compare(cases, baseline, tolerance=0.25, min_delta_ms=0.005, metric="p50_ms"):
+    """
+    Compare results against a baseline run.
+
+    A case regressed when its metric grew by more than `tolerance` (as a
+    fraction), by more than min_delta_ms, and beyond the spread of the
+    baseline's runs: its best run must be slower than the slowest baseline
+    run (p50_ms_runs), so run-to-run noise is not reported. Improvements
+    are judged the same way the other way round.
+
+    Args:
+        cases (dict): Results of run_suite or best_of.
+        baseline (dict): Results of an earlier run.
+        tolerance (float): Allowed relative slowdown.
+        min_delta_ms (float): Smallest absolute change reported.
+        metric (str): Stat compared, e.g. "p50_ms".
+
+    Returns:
+        List[dict]: Per case: name, baseline and current value, their ratio
+        and status ("ok", "regression", "improvement", "new" or "missing").
+    """
+    rows = []
+    for name in list(cases) + [name for name in baseline if name not in cases]:
+        old = baseline.get(name, {}).get(metric)
+        new = cases.get(name, {}).get(metric)
+        if old is None or new is None:
+            status, ratio = ("new" if old is None else "missing"), None
+        else:
+            ratio = round(new / old, 3) if old > 0 else None
+            status = "ok"
+            runs = baseline[name].get(f"{metric}_runs") or [old]
+            current_runs = cases[name].get(f"{metric}_runs") or [new]
+            if abs(new - old) > min_delta_ms:
+                if new > old * (1 + tolerance) and new > max(runs):
+                    status = "regression"
+                elif new < old / (1 + tolerance) and max(current_runs) < old:
+                    status = "improvement"
+        rows.append({"name": name, "baseline": old, "current": new, "ratio": ratio,
+                     "status": status})
+    return rows
+
+
+def environment():
+    """Versions and machine the results were measured on."""
+    return {
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the Dot Hunter game logic on synthetic fingertip trajectories "
+        "and compare the results against a baseline."
+    )
+    parser.add_argument(
+        "--counts", nargs="+", type=int, default=list(COUNTS), help="Object counts to test"
+    )
+    parser.add_argument(
+        "--trajectories",
+        nargs="+",
+        choices=list(TRAJECTORIES),
+        default=list(TRAJECTORIES),
+        help="Fingertip trajectories driving check_collisions",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=300, help="Trajectory frames per check_collisions case"
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=30, help="Timed calls per spawn, respawn and draw case"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=3,
+        help="Runs of the whole suite; each case keeps its fastest p50",
+    )
+    parser.add_argument("--quick", action="store_true", help="60 frames and 10 repeats")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="Write the JSON results here instead of stdout")
+    parser.add_argument(
+        "--baseline",
+        help="Results of an earlier run to compare against; exits with status 1 "
+        "if a case regressed",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative p50 slowdown reported as a regression",
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=0.005,
+        help="Smaller p50 changes are never reported",
+    )
+    args = parser.parse_args()
+    if args.quick:
+        args.frames, args.repeats = 60, 10
+
+    started = time.perf_counter()
+    runs = []
+    for run in range(max(1, args.runs)):
+        runs.append(run_suite(
+            counts=args.counts, trajectories=args.trajectories, frames=args.frames,
+            repeats=args.repeats, seed=args.seed,
+            log=lambda name: print(f"  [{run + 1}/{args.runs}] {name}", file=sys.stderr),
+        ))
+    cases = best_of(runs)
+    report = {
+        "environment": environment(),
+        "config": {"counts": args.counts, "trajectories": args.trajectories,
+                   "frames": args.frames, "repeats": args.repeats, "seed": args.seed,
+                   "runs": len(runs)},
+        "duration_s": round(time.perf_counter() - started, 2),
+        "cases": cases,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(cases, baseline["cases"], args.tolerance, args.min_delta_ms)
+        report["comparison"] = {"baseline": args.baseline, "tolerance": args.tolerance,
+                                "cases": rows}
+        for row in rows:
+            if row["status"] != "ok":
+                print(f"{row['status']:>11}  {row['name']}: {row['baseline']} -> "
+                      f"{row['current']} ms p50 (x{row['ratio']})", file=sys.stderr)
+        regressions = [row for row in rows if row["status"] == "regression"]
+        print(f"{len(regressions)} regressions in {len(rows)} cases", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+dot_hunter_server.py
+
+Headless Dot Hunter server: hosts many independent game rooms over UDP,
+each with its own game state and timer, for remote clients that run hand
+tracking themselves and send fingertip coordinates. The server advances
+all rooms in one batched tick and sends each room's subscribers compact
+state diffs (see src/game_server.py for the protocol).
+
+--load-test plays that many rooms with synthetic clients on localhost,
+in the same process, and prints the server and client stats as JSON.
+
+Usage:
+    python dot_hunter_server.py --port 9999
+    python dot_hunter_server.py --load-test 1000 --duration 30
+    python dot_hunter_server.py --load-test 500 --no-server --host 192.168.1.20
+"""
+
+import argparse
+import asyncio
+import json
+
+from src.game_server import GameServer
+from src.instrumentation import Profiler
+from src.load_client import LoadClient
+
+
+async def run(args):
+    """Run the server and/or the synthetic clients for the given options."""
+    profiler = Profiler(enabled=True, window=10000)
+    frame_size = (args.width, args.height)
+    server = None
+    tasks = []
+    if not args.no_server:
+        server = GameServer(
+            tick_rate=args.tick_rate, frame_size=frame_size, max_rooms=args.max_rooms,
+            keyframe_interval=args.keyframe_interval,
+            game_options={"object_speed": args.object_speed}, profiler=profiler,
+            seed=args.seed,
+        )
+        tasks.append(asyncio.create_task(
+            server.serve(args.host, args.port, duration=args.duration)
+        ))
+        await asyncio.sleep(0)  # bind before the clients send
+
+    client = None
+    if args.load_test:
+        client = LoadClient(
+            args.load_test, players=args.players, duration=args.game_duration,
+            tip_rate=args.tip_rate, frame_size=frame_size, seed=args.seed,
+        )
+        tasks.append(asyncio.create_task(
+            client.run(args.host, args.port, duration=args.duration)
+        ))
+
+    if server is not None and args.stats_interval:
+        async def report():
+            while True:
+                await asyncio.sleep(args.stats_interval)
+                tick = server.profiler.stats().get("tick", {})
+                print(f"{len(server.rooms)} rooms, tick {tick.get('p50_ms')} ms p50 / "
+                      f"{tick.get('p95_ms')} ms p95, {server.counters['late_ticks']} late ticks")
+        reporter = asyncio.create_task(report())
+    else:
+        reporter = None
+
+    results = await asyncio.gather(*tasks)
+    if reporter is not None:
+        reporter.cancel()
+    if client is not None:
+        if server is not None:
+            server.stop()
+        report = {"client": results[-1]}
+        if server is not None:
+            report["server"] = server.stats()
+        print(json.dumps(report, indent=2))
+    elif server is not None:
+        print(json.dumps(server.stats(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Dot Hunter game server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on / connect to")
+    parser.add_argument("--port", type=int, default=9999, help="UDP port")
+    parser.add_argument("--tick-rate", type=float, default=30.0, help="Room updates per second")
+    parser.add_argument("--width", type=int, default=1280, help="Width of the game areas")
+    parser.add_argument("--height", type=int, default=720, help="Height of the game areas")
+    parser.add_argument("--max-rooms", type=int, default=10000, help="Maximum number of rooms")
+    parser.add_argument(
+        "--keyframe-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between two full states of a room (diffs are sent in between)",
+    )
+    parser.add_argument(
+        "--object-speed",
+        type=float,
+        default=0.0,
+        help="Make coins and bombs move at this speed (pixels/second)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop after this many seconds (default: run forever, 30 with --load-test)",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=5.0,
+        help="Print the room count and tick time every this many seconds (0 to disable)",
+    )
+    parser.add_argument(
+        "--load-test",
+        type=int,
+        default=0,
+        metavar="ROOMS",
+        help="Play this many rooms with synthetic clients",
+    )
+    parser.add_argument(
+        "--no-server",
+        action="store_true",
+        help="Only run the --load-test clients, against a server at --host/--port",
+    )
+    parser.add_argument("--players", type=int, default=1, help="Players per load test room")
+    parser.add_argument(
+        "--game-duration", type=int, default=60, help="Seconds per load test game"
+    )
+    parser.add_argument(
+        "--tip-rate",
+        type=float,
+        default=30.0,
+        help="Fingertip updates per second sent for each load test room",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed of the synthetic fingertips and of the server's games",
+    )
+    args = parser.parse_args()
+    if args.no_server and not args.load_test:
+        parser.error("--no-server needs --load-test")
+    if args.load_test and args.duration is None:
+        args.duration = 30.0
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
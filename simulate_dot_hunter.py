@@ -0,0 +1,196 @@
+"""
+simulate_dot_hunter.py
+
+Offline Dot Hunter simulation for balance tuning: bots play thousands of
+rounds at once on the batched game engine (src/batch_sim.py), with every
+combination of the given max coins, max bombs, bomb penalty and coin
+respawn weight, and the score and catch rates of each combination are
+printed as JSON. No camera or window is needed.
+
+--verify plays the same rounds on the batched engine and on CollectibleGame
+and exits with status 1 if their scores or objects ever differ.
+
+Usage:
+    python simulate_dot_hunter.py --games 10000 --seconds 60
+    python simulate_dot_hunter.py --bomb-points -3 -2 -1 --coin-weight 80 70 --bot greedy
+    python simulate_dot_hunter.py --verify
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+
+from src.batch_sim import COIN, GameBatch, differential_check
+from src.dot_game import POINTS, RESPAWN_WEIGHTS
+
+
+def bot_targets(kind, batch, tips, targets, rng):
+    """
+    Next target of every bot fingertip.
+
+    "wander" bots pick a new random point when they reach their target;
+    "greedy" bots head for the nearest coin of their game, ignoring bombs
+    on the way.
+
+    Args:
+        kind (str): "wander" or "greedy".
+        batch (GameBatch): The games played.
+        tips (np.ndarray): (games, players, 2) current fingertips.
+        targets (np.ndarray): (games, players, 2) current targets.
+        rng (np.random.Generator): Source of the random targets.
+
+    Returns:
+        np.ndarray: (games, players, 2) targets.
+    """
+    arrived = np.hypot(*np.moveaxis(targets - tips, -1, 0)) < 1.0
+    targets = targets.copy()
+    targets[arrived] = rng.uniform((0, 0), batch.frame_size, size=(int(arrived.sum()), 2))
+    if kind == "greedy":
+        coins = batch.alive & (batch.type == COIN)
+        dx = batch.x[:, None, :] - tips[..., 0:1]
+        dy = batch.y[:, None, :] - tips[..., 1:2]
+        distance = np.where(coins[:, None, :], dx * dx + dy * dy, np.inf)
+        nearest = np.argmin(distance, axis=2)
+        found = np.isfinite(np.take_along_axis(distance, nearest[..., None], axis=2)[..., 0])
+        xs = np.take_along_axis(batch.x, nearest, axis=1)
+        ys = np.take_along_axis(batch.y, nearest, axis=1)
+        targets = np.where(found[..., None], np.stack([xs, ys], axis=-1), targets)
+    return targets
+
+
+def simulate(batch, kind, ticks, speed, dropout=0.0, seed=None):
+    """
+    Play every game of a batch for a number of frames with bots.
+
+    Args:
+        batch (GameBatch): The games.
+        kind (str): Bot behaviour, see bot_targets.
+        ticks (int): Frames played.
+        speed (float): Pixels a fingertip moves per frame.
+        dropout (float): Probability that a fingertip is not detected in a
+            frame.
+        seed (int or None): Seed of the bots.
+
+    Returns:
+        float: Seconds spent in GameBatch.step.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (batch.games, batch.players, 2)
+    tips = rng.uniform((0, 0), batch.frame_size, size=shape)
+    targets = rng.uniform((0, 0), batch.frame_size, size=shape)
+    stepping = 0.0
+    for _ in range(ticks):
+        targets = bot_targets(kind, batch, tips, targets, rng)
+        offset = targets - tips
+        distance = np.hypot(offset[..., 0], offset[..., 1])[..., None]
+        tips = np.where(distance <= speed, targets, tips + offset * speed / np.maximum(distance, 1))
+        seen = np.trunc(tips)
+        if dropout > 0:
+            seen[rng.uniform(0, 1, shape[:2]) < dropout] = np.nan
+        start = time.perf_counter()
+        batch.step(seen)
+        stepping += time.perf_counter() - start
+    return stepping
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play Dot Hunter rounds with bots on the batched engine and compare "
+        "balance settings."
+    )
+    parser.add_argument("--games", type=int, default=2000, help="Rounds per combination")
+    parser.add_argument("--players", type=int, default=1, help="Players per round")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of a round")
+    parser.add_argument("--fps", type=float, default=30.0, help="Frames per second")
+    parser.add_argument("--width", type=int, default=1280, help="Width of the game area")
+    parser.add_argument("--height", type=int, default=720, help="Height of the game area")
+    parser.add_argument(
+        "--bot", choices=["wander", "greedy"], default="greedy", help="Bot behaviour"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=25.0, help="Pixels a bot fingertip moves per frame"
+    )
+    parser.add_argument(
+        "--dropout",
+        type=float,
+        default=0.0,
+        help="Probability that a fingertip is not detected in a frame",
+    )
+    parser.add_argument("--max-coins", nargs="+", type=int, default=[3], help="Values to try")
+    parser.add_argument("--max-bombs", nargs="+", type=int, default=[2], help="Values to try")
+    parser.add_argument(
+        "--bomb-points", nargs="+", type=int, default=[POINTS['bomb']], help="Values to try"
+    )
+    parser.add_argument(
+        "--coin-weight",
+        nargs="+",
+        type=float,
+        default=[float(RESPAWN_WEIGHTS['coin'])],
+        help="Respawn chance of a coin in percent, when both types can spawn (values to try)",
+    )
+    parser.add_argument(
+        "--point-collisions",
+        action="store_true",
+        help="Test fingertips as points instead of swipes",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the batched engine against CollectibleGame instead of simulating",
+    )
+    args = parser.parse_args()
+    frame_size = (args.width, args.height)
+    swept = not args.point_collisions
+
+    if args.verify:
+        failed = False
+        for options in (
+            {"swept": True},
+            {"swept": True, "max_sweep": 150.0, "trajectory": "swipes"},
+            {"swept": False},
+            {"max_coins": [3, 4, 6, 8] * 8, "max_bombs": [0, 1, 2, 6] * 8,
+             "trajectory": "random_walk"},
+        ):
+            result = differential_check(frame_size=frame_size, seed=args.seed, **options)
+            failed |= bool(result["mismatches"])
+            print(json.dumps(result))
+        sys.exit(1 if failed else 0)
+
+    combinations = list(itertools.product(
+        args.max_coins, args.max_bombs, args.bomb_points, args.coin_weight
+    ))
+    settings = np.repeat(np.array(combinations, dtype=np.float64), args.games, axis=0).T
+    max_coins, max_bombs, bomb_points, coin_weight = settings
+    batch = GameBatch(
+        len(settings[0]), args.players, frame_size,
+        max_coins=max_coins.astype(np.int64), max_bombs=max_bombs.astype(np.int64),
+        bomb_points=bomb_points.astype(np.int64), coin_weight=coin_weight,
+        bomb_weight=100.0 - coin_weight, swept=swept, seed=args.seed,
+    )
+    ticks = int(args.seconds * args.fps)
+    started = time.perf_counter()
+    stepping = simulate(batch, args.bot, ticks, args.speed, args.dropout, seed=args.seed)
+    results = []
+    for i, (coins, bombs, penalty, weight) in enumerate(combinations):
+        games = np.arange(i * args.games, (i + 1) * args.games)
+        results.append({
+            "max_coins": coins, "max_bombs": bombs, "bomb_points": penalty,
+            "coin_weight": weight, **batch.stats(args.seconds, games),
+        })
+    print(json.dumps({
+        "config": {"games": batch.games, "players": args.players, "seconds": args.seconds,
+                   "fps": args.fps, "bot": args.bot, "speed": args.speed,
+                   "dropout": args.dropout, "swept": swept, "seed": args.seed},
+        "duration_s": round(time.perf_counter() - started, 2),
+        "game_frames_per_s": round(batch.games * ticks / stepping),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
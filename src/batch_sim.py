@@ -0,0 +1,467 @@
+import random
+
+import numpy as np
+
+from src.collision import pair_hits
+from src.dot_game import POINTS, RESPAWN_WEIGHTS, CollectibleGame
+from src.object_store import TYPE_IDS
+from src.trajectories import TRAJECTORIES
+
+COIN, BOMB = TYPE_IDS['coin'], TYPE_IDS['bomb']
+
+
+def _per_game(value, games, dtype):
+    """Broadcast a scalar or per-game setting to a (games,) array."""
+    return np.broadcast_to(np.asarray(value, dtype=dtype), (games,)).copy()
+
+
+class GameBatch:
+    """
+    Many independent CollectibleGame rounds stepped together, for bots and
+    offline balance tuning.
+
+    Game n keeps its objects in row n of a set of (games, slots) arrays,
+    where slots = max_coins + max_bombs, and step() advances every game by
+    one frame from a (games, players, 2) array of fingertips. The rules are
+    those of CollectibleGame.check_collisions:
+
+      - a fingertip collects the first object it touches in spawn order
+        (swept=False), or every object its swipe since the previous step
+        crosses (swept=True, see segment_hits);
+      - every (player, object) hit scores the object's points, so two
+        players touching the same object both score;
+      - the caught objects are removed one by one in the order they were
+        first hit, and each removal is followed by one respawn in the freed
+        slot: a coin or a bomb at random (coin_weight : bomb_weight) when
+        both are below their maximum, otherwise the type that is.
+
+    Positions are drawn like PoissonSpawner's (inside the padding, away from
+    other objects, the fingertips and avoid_rects), but from the batch's own
+    generator, so they differ from those of a CollectibleGame with the same
+    seed. Objects do not move.
+
+    Scoring and respawn settings may be scalars or one value per game, so
+    different balance settings can be compared in one batch.
+
+    Attributes:
+        games (int): Number of games.
+        players (int): Players (fingertips) per game.
+        frame_size (tuple): (width, height) of the game areas.
+        x, y (np.ndarray): (games, slots) float64 object centers.
+        type (np.ndarray): (games, slots) int8 index into OBJECT_TYPES.
+        alive (np.ndarray): (games, slots) bool, True for occupied slots.
+        order (np.ndarray): (games, slots) int64 spawn sequence numbers.
+        counts (np.ndarray): (games, 2) live coins and bombs.
+        radius (float): Collision radius of every object.
+        scores (np.ndarray): (games, players) int64 scores.
+        caught (np.ndarray): (games, players, 2) int64 coins and bombs
+            collected by each player.
+        max_coins, max_bombs (np.ndarray): (games,) int64 maximum counts.
+        coin_points, bomb_points (np.ndarray): (games,) int64 score changes.
+        coin_weight, bomb_weight (np.ndarray): (games,) float64 respawn
+            weights.
+        swept (bool): Test swipes instead of points.
+        max_sweep (float or None): Longest movement tested as a swipe.
+        replay (list or None): Per game, the positions and random draws of
+            its respawns (see step); None unless record is set.
+    """
+
+    def __init__(self, games, players=1, frame_size=(1280, 720), max_coins=3, max_bombs=2,
+                 object_size=(60, 60), spawn_spacing=None, avoid_rects=(),
+                 fingertip_clearance=None, swept=False, max_sweep=None,
+                 coin_points=POINTS['coin'], bomb_points=POINTS['bomb'],
+                 coin_weight=RESPAWN_WEIGHTS['coin'], bomb_weight=RESPAWN_WEIGHTS['bomb'],
+                 candidates=16, seed=None, record=False):
+        """
+        Args:
+            games (int): Number of games.
+            players (int): Players per game.
+            frame_size (tuple): (width, height) of the game areas.
+            max_coins (int or array-like): Maximum coins on screen, at least
+                3 (the initial round has 3 to 5 coins, like CollectibleGame).
+            max_bombs (int or array-like): Maximum bombs on screen.
+            object_size (tuple): (width, height) of the objects.
+            spawn_spacing (float or None): Minimum distance between object
+                centers; defaults to the object size.
+            avoid_rects (Iterable[tuple]): Areas objects must not overlap.
+            fingertip_clearance (float or None): Minimum distance from a
+                fingertip to a new object; defaults to twice the object size.
+            swept (bool): Collect every object a swipe crosses.
+            max_sweep (float or None): Longest movement tested as a swipe.
+            coin_points, bomb_points (int or array-like): Score changes.
+            coin_weight, bomb_weight (float or array-like): Respawn weights.
+            candidates (int): Positions tried per spawn; the first one that
+                keeps the spacing is used, else the first one.
+            seed (int or None): Seed of the spawn positions and decisions.
+            record (bool): Keep the respawn positions and draws in `replay`,
+                e.g. to play the same games on CollectibleGame.
+        """
+        self.games = games
+        self.players = players
+        self.frame_size = tuple(frame_size)
+        self.max_coins = _per_game(max_coins, games, np.int64)
+        self.max_bombs = _per_game(max_bombs, games, np.int64)
+        if (self.max_coins < 3).any() or (self.max_bombs < 0).any():
+            raise ValueError("max_coins must be at least 3 and max_bombs at least 0")
+        self.coin_points = _per_game(coin_points, games, np.int64)
+        self.bomb_points = _per_game(bomb_points, games, np.int64)
+        self.coin_weight = _per_game(coin_weight, games, np.float64)
+        self.bomb_weight = _per_game(bomb_weight, games, np.float64)
+        self.swept = swept
+        self.max_sweep = max_sweep
+        self.candidates = candidates
+        self._rng = np.random.default_rng(seed)
+
+        object_size = tuple(object_size)
+        self.radius = float(min(object_size) // 2)
+        self.spacing = float(max(object_size) if spawn_spacing is None else spawn_spacing)
+        self.fingertip_clearance = float(
+            2 * max(object_size) if fingertip_clearance is None else fingertip_clearance
+        )
+        half_w, half_h = object_size[0] / 2, object_size[1] / 2
+        self.avoid_rects = [
+            (x1 - half_w, y1 - half_h, x2 + half_w, y2 + half_h)
+            for x1, y1, x2, y2 in avoid_rects
+        ]
+        padding = 80  # as CollectibleGame's spawner
+        width, height = self.frame_size
+        self._low = np.array([padding, padding], dtype=np.float64)
+        self._high = np.maximum(
+            np.array([width - padding, height - padding], dtype=np.float64), self._low
+        )
+
+        slots = int((self.max_coins + self.max_bombs).max())
+        self.x = np.zeros((games, slots), dtype=np.float64)
+        self.y = np.zeros((games, slots), dtype=np.float64)
+        self.type = np.zeros((games, slots), dtype=np.int8)
+        self.alive = np.zeros((games, slots), dtype=bool)
+        self.order = np.zeros((games, slots), dtype=np.int64)
+        self.counts = np.zeros((games, 2), dtype=np.int64)
+        self.scores = np.zeros((games, players), dtype=np.int64)
+        self.caught = np.zeros((games, players, 2), dtype=np.int64)
+        self._next_order = 0
+        self._tips = np.full((games, players, 2), np.nan)
+        self._previous = np.full((games, players, 2), np.nan)
+        self.replay = [{"positions": [], "draws": []} for _ in range(games)] if record else None
+        self.reset()
+
+    def reset(self, games=None):
+        """
+        Start new rounds: scores, objects and fingertip history of the given
+        games are cleared and their initial objects spawned (3-5 coins and
+        0-1 bombs, like CollectibleGame).
+
+        Args:
+            games (array-like or None): Game indices; None resets all.
+        """
+        rows = np.arange(self.games) if games is None else np.asarray(games, dtype=np.int64)
+        self.alive[rows] = False
+        self.counts[rows] = 0
+        self.scores[rows] = 0
+        self.caught[rows] = 0
+        self._tips[rows] = np.nan
+        self._previous[rows] = np.nan
+        max_coins, max_bombs = self.max_coins[rows], self.max_bombs[rows]
+        coins = self._rng.integers(np.maximum(3, max_coins - 2), max_coins + 1)
+        bombs = self._rng.integers(0, np.minimum(1, max_bombs) + 1)
+        # coins take the first slots and bombs the next ones, as in a fresh store
+        for slot in range(int((coins + bombs).max(initial=0))):
+            spawning = slot < coins + bombs
+            if spawning.any():
+                self._spawn(rows[spawning], slot, np.where(slot < coins[spawning], COIN, BOMB))
+
+    def _place(self, rows):
+        """One new position per game in rows, keeping the spawn rules."""
+        points = self._rng.uniform(self._low, self._high, size=(len(rows), self.candidates, 2))
+        px, py = points[..., 0], points[..., 1]
+        ok = np.ones(px.shape, dtype=bool)
+        dx = px[:, :, None] - self.x[rows][:, None, :]
+        dy = py[:, :, None] - self.y[rows][:, None, :]
+        crowded = (dx * dx + dy * dy < self.spacing ** 2) & self.alive[rows][:, None, :]
+        ok &= ~crowded.any(axis=2)
+        tips = self._tips[rows]
+        dx = px[:, :, None] - tips[:, None, :, 0]
+        dy = py[:, :, None] - tips[:, None, :, 1]
+        with np.errstate(invalid="ignore"):
+            ok &= ~(dx * dx + dy * dy < self.fingertip_clearance ** 2).any(axis=2)
+        for x1, y1, x2, y2 in self.avoid_rects:
+            ok &= ~((px >= x1) & (px <= x2) & (py >= y1) & (py <= y2))
+        first = np.argmax(ok, axis=1)  # the first candidate if none is free
+        return np.rint(points[np.arange(len(rows)), first])
+
+    def _spawn(self, rows, slots, types):
+        """
+        Place one object of the given type in slots[i] of game rows[i].
+
+        Returns:
+            np.ndarray: (len(rows), 2) positions of the new objects.
+        """
+        positions = self._place(rows)
+        self.x[rows, slots] = positions[:, 0]
+        self.y[rows, slots] = positions[:, 1]
+        self.type[rows, slots] = types
+        self.alive[rows, slots] = True
+        self.order[rows, slots] = self._next_order
+        self._next_order += 1
+        np.add.at(self.counts, (rows, types), 1)
+        return positions
+
+    def _respawn(self, rows, slots):
+        """
+        Remove the object in slots[i] of game rows[i] and spawn a new one in
+        the freed slot (see CollectibleGame._respawn_object).
+        """
+        removed = self.type[rows, slots]
+        self.alive[rows, slots] = False
+        np.add.at(self.counts, (rows, removed), -1)
+
+        can_coin = self.counts[rows, COIN] < self.max_coins[rows]
+        can_bomb = self.counts[rows, BOMB] < self.max_bombs[rows]
+        both = can_coin & can_bomb
+        draws = self._rng.random(int(both.sum()))
+        coin = can_coin.copy()
+        # random.choices: the first type whose cumulative weight exceeds u * total
+        total = self.coin_weight[rows[both]] + self.bomb_weight[rows[both]]
+        coin[both] = draws * total < self.coin_weight[rows[both]]
+        # a removal always leaves room for its own type, so every game spawns
+        positions = self._spawn(rows, slots, np.where(coin, COIN, BOMB))
+
+        if self.replay is not None:
+            for row, u in zip(rows[both].tolist(), draws.tolist()):
+                self.replay[row]["draws"].append(u)
+            for row, point in zip(rows.tolist(), positions.tolist()):
+                self.replay[row]["positions"].append(point)
+
+    def step(self, tips):
+        """
+        Advance every game by one frame.
+
+        Args:
+            tips (array-like): (games, players, 2) fingertip positions, NaN
+                where a fingertip was not detected.
+
+        Returns:
+            np.ndarray: (games, players) int64 score changes.
+        """
+        tips = np.asarray(tips, dtype=np.float64).reshape(self.games, self.players, 2)
+        tx, ty = tips[..., 0], tips[..., 1]
+        seen = ~np.isnan(tx)
+        sx, sy = tx, ty
+        if self.swept:
+            px, py = self._previous[..., 0], self._previous[..., 1]
+            from_previous = seen & ~np.isnan(px)
+            if self.max_sweep is not None:
+                with np.errstate(invalid="ignore"):
+                    from_previous &= np.hypot(tx - px, ty - py) <= self.max_sweep
+            sx = np.where(from_previous, px, tx)
+            sy = np.where(from_previous, py, ty)
+        self._previous = tips.copy()
+        self._tips = self._previous
+
+        delta = np.zeros((self.games, self.players), dtype=np.int64)
+        if not seen.any():
+            return delta
+        sx, sy, tx, ty = (np.nan_to_num(a)[:, :, None] for a in (sx, sy, tx, ty))
+        xs, ys = self.x[:, None, :], self.y[:, None, :]
+        hits = pair_hits(sx, sy, tx, ty, xs, ys, self.radius)
+        hits &= self.alive[:, None, :] & seen[:, :, None]
+        if not hits.any():
+            return delta
+
+        if self.swept:
+            counted = hits
+            entry = self._entries(sx, sy, tx, ty, xs, ys)
+        else:
+            # the first object in spawn order under each fingertip
+            first = np.argmin(np.where(hits, self.order[:, None, :], np.iinfo(np.int64).max),
+                              axis=2)
+            counted = np.zeros_like(hits)
+            np.put_along_axis(counted, first[:, :, None], hits.any(axis=2)[:, :, None], axis=2)
+            entry = np.zeros(hits.shape)
+
+        is_coin = (self.type == COIN)[:, None, :]
+        coins = (counted & is_coin).sum(axis=2)
+        bombs = (counted & ~is_coin).sum(axis=2)
+        delta = coins * self.coin_points[:, None] + bombs * self.bomb_points[:, None]
+        self.scores += delta
+        self.caught[..., COIN] += coins
+        self.caught[..., BOMB] += bombs
+
+        # respawn order: by first player to hit, then entry along its swipe,
+        # then spawn order (the order CollectibleGame collects them in)
+        caught = counted.any(axis=1)
+        rows = np.flatnonzero(caught.any(axis=1))
+        caught = caught[rows]
+        player = np.argmax(counted[rows], axis=1)
+        entry = np.take_along_axis(entry[rows], player[:, None, :], axis=1)[:, 0, :]
+        ranked = np.lexsort((self.order[rows], entry, player, ~caught), axis=-1)
+        number = caught.sum(axis=1)
+        for i in range(int(number.max())):
+            respawning = number > i
+            self._respawn(rows[respawning], ranked[respawning, i])
+        return delta
+
+    def _entries(self, sx, sy, tx, ty, xs, ys):
+        """Where each swipe enters each circle, as in segment_hits."""
+        dx, dy = tx - sx, ty - sy
+        fx, fy = sx - xs, sy - ys
+        fd = fx * dx + fy * dy
+        c = fx * fx + fy * fy - self.radius ** 2
+        a = dx * dx + dy * dy
+        safe_a = np.where(a > 0, a, 1.0)
+        disc = np.maximum(fd * fd - safe_a * c, 0.0)
+        return np.where(c < 0, 0.0, np.clip((-fd - np.sqrt(disc)) / safe_a, 0.0, 1.0))
+
+    def stats(self, seconds=None, games=None):
+        """
+        Args:
+            seconds (float or None): Length of the rounds played, to report
+                rates per minute.
+            games (array-like or None): Game indices to summarize; None
+                summarizes all.
+
+        Returns:
+            dict: Number of games, mean and standard deviation of the
+            per-player score, and the mean coins and bombs collected per
+            player (per minute if seconds is given).
+        """
+        rows = slice(None) if games is None else np.asarray(games, dtype=np.int64)
+        scores, caught = self.scores[rows], self.caught[rows]
+        scale = 60.0 / seconds if seconds else 1.0
+        suffix = "_per_min" if seconds else ""
+        return {
+            "games": len(scores),
+            "mean_score": round(float(scores.mean()), 3),
+            "std_score": round(float(scores.std()), 3),
+            f"coins{suffix}": round(float(caught[..., COIN].mean()) * scale, 3),
+            f"bombs{suffix}": round(float(caught[..., BOMB].mean()) * scale, 3),
+        }
+
+
+class _ReplayRandom(random.Random):
+    """A random.Random whose random() returns recorded values."""
+
+    def __init__(self, draws):
+        super().__init__(0)
+        self.draws = draws
+
+    def random(self):
+        if not self.draws:
+            raise IndexError("more random draws than the batch made")
+        return self.draws.pop(0)
+
+
+class _ReplaySpawner:
+    """Stands in for a PoissonSpawner, returning recorded positions."""
+
+    def __init__(self, positions):
+        self.positions = positions
+
+    def sample(self, n, existing=None, avoid_circles=(), avoid_rects=()):
+        if len(self.positions) < n:
+            raise IndexError("more spawns than the batch made")
+        points = self.positions[:n]
+        del self.positions[:n]
+        return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+    def remove(self, points):
+        pass
+
+
+def differential_check(games=32, ticks=300, players=2, frame_size=(1280, 720), swept=True,
+                       max_sweep=None, max_coins=3, max_bombs=2, trajectory="multi_finger",
+                       seed=0, limit=10):
+    """
+    Play the same games on a GameBatch and on one CollectibleGame each, and
+    compare their scores and objects after every frame.
+
+    The CollectibleGames start from the batch's initial objects and are
+    given the batch's respawn positions and random draws, so both place the
+    same objects at the same points if and only if they apply the same
+    rules: which objects are hit, the points scored, the order of the
+    respawns, their types and their slots.
+
+    Args:
+        games (int): Number of games.
+        ticks (int): Frames played.
+        players (int): Fingertips per game.
+        frame_size (tuple): (width, height) of the game areas.
+        swept (bool): Test swipes instead of points.
+        max_sweep (float or None): Longest movement tested as a swipe.
+        max_coins (int or array-like): Maximum coins per game.
+        max_bombs (int or array-like): Maximum bombs per game.
+        trajectory (str): Name from TRAJECTORIES driving the fingertips.
+        seed (int): Seed of the batch and the trajectories.
+        limit (int): Maximum number of mismatches reported.
+
+    Returns:
+        dict: The settings, number of objects caught, number of games that
+        diverged, and the first `limit` mismatches as (game, tick,
+        description); empty if the engines agree.
+    """
+    batch = GameBatch(
+        games, players, frame_size, max_coins=max_coins, max_bombs=max_bombs, swept=swept,
+        max_sweep=max_sweep, seed=seed, record=True,
+    )
+    references = []
+    for n in range(games):
+        game = CollectibleGame(
+            *frame_size, players=players, max_coins=int(batch.max_coins[n]),
+            max_bombs=int(batch.max_bombs[n]), swept=swept, max_sweep=max_sweep, rng=n,
+        )
+        game.store.clear()
+        for slot in np.flatnonzero(batch.alive[n]).tolist():
+            game.store.add(batch.x[n, slot], batch.y[n, slot], int(batch.type[n, slot]),
+                           batch.radius)
+        game.rng = _ReplayRandom(batch.replay[n]["draws"])
+        game.spawner = _ReplaySpawner(batch.replay[n]["positions"])
+        references.append(game)
+
+    # int() of a fingertip, as as_tips does, so both engines see the same points
+    points = np.trunc(TRAJECTORIES[trajectory](ticks, games * players, frame_size, rng=seed))
+    points = points.reshape(ticks, games, players, 2)
+    mismatches = []
+    diverged = set()  # games already reported, not compared any more
+    for tick in range(ticks):
+        batch.step(points[tick])
+        for n, game in enumerate(references):
+            if n in diverged:
+                continue
+            try:
+                game.check_collisions([
+                    (None, None) if x != x else (int(x), int(y))
+                    for x, y in points[tick, n].tolist()
+                ])
+                problem = _compare(batch, n, game)
+            except IndexError as e:
+                problem = str(e)
+            if problem:
+                diverged.add(n)
+                if len(mismatches) < limit:
+                    mismatches.append((n, tick, problem))
+    return {
+        "games": games, "ticks": ticks, "players": players, "swept": swept,
+        "max_sweep": max_sweep, "trajectory": trajectory,
+        "caught": int(batch.caught.sum()), "diverged": len(diverged), "mismatches": mismatches,
+    }
+
+
+def _compare(batch, n, game):
+    """Difference between game n of a batch and a CollectibleGame, or None."""
+    if game.scores != batch.scores[n].tolist():
+        return f"scores {batch.scores[n].tolist()}, CollectibleGame {game.scores}"
+    store = game.store
+    slots = batch.alive.shape[1]
+    if store.alive[slots:].any() or not np.array_equal(store.alive[:slots], batch.alive[n]):
+        return "different slots in use"
+    live = batch.alive[n]
+    if not (np.array_equal(store.x[:slots][live], batch.x[n][live])
+            and np.array_equal(store.y[:slots][live], batch.y[n][live])
+            and np.array_equal(store.type[:slots][live], batch.type[n][live])):
+        return "different objects"
+    return None
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
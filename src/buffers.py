@@ -0,0 +1,174 @@
+import threading
+
+import cv2
+import numpy as np
+
+
+class BufferPool:
+    """
+    Reference-counted pool of reusable frame buffers.
+
+    Frames are read straight into pooled arrays (see read()); every stage
+    holding a frame owns one reference and calls release() when done, and
+    a buffer whose last reference is released goes back to the pool for
+    the next capture. A new array is only allocated when all buffers are
+    in use or the frame size changes, so in steady state capture allocates
+    nothing.
+
+    Attributes:
+        max_free (int): Free buffers kept for reuse; extra ones are dropped.
+        allocations (int): Arrays allocated (by the pool or, when it
+            ignored the buffer it was given, by the capture backend).
+        reuses (int): Captures that went into a recycled buffer.
+    """
+
+    def __init__(self, max_free=8):
+        """
+        Args:
+            max_free (int): Maximum number of idle buffers kept.
+        """
+        self.max_free = max_free
+        self.allocations = 0
+        self.reuses = 0
+        self._free = []
+        self._refs = {}
+        self._shape = None
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype=np.uint8):
+        """
+        Take a free buffer of this shape, allocating one if none is left.
+
+        Returns:
+            np.ndarray: Buffer with one reference, contents undefined.
+        """
+        with self._lock:
+            self._shape = tuple(shape)
+            while self._free:
+                buffer = self._free.pop()
+                if buffer.shape == tuple(shape) and buffer.dtype == dtype:
+                    self.reuses += 1
+                    break
+            else:
+                buffer = np.empty(shape, dtype=dtype)
+                self.allocations += 1
+            self._refs[id(buffer)] = [buffer, 1]
+            return buffer
+
+    def retain(self, buffer):
+        """Add a reference to a pooled buffer (e.g. a second consumer)."""
+        with self._lock:
+            entry = self._refs.get(id(buffer))
+            if entry is not None:
+                entry[1] += 1
+
+    def release(self, buffer):
+        """
+        Drop one reference; the buffer is reused once none are left.
+        Arrays that do not come from the pool are ignored.
+        """
+        with self._lock:
+            entry = self._refs.get(id(buffer))
+            if entry is None or entry[0] is not buffer:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._refs[id(buffer)]
+            if buffer.shape == self._shape and len(self._free) < self.max_free:
+                self._free.append(buffer)
+
+    def read(self, cap):
+        """
+        Read the next frame of a capture into a pooled buffer.
+
+        The first frame (or the first after a resolution change) is
+        allocated by the capture itself and adopted by the pool.
+
+        Args:
+            cap: An opened capture whose read() accepts an output image,
+                like cv2.VideoCapture.
+
+        Returns:
+            (bool, np.ndarray or None): Same contract as cv2.VideoCapture.read;
+            the frame holds one reference.
+        """
+        buffer = self.acquire(self._shape) if self._shape is not None else None
+        ret, frame = cap.read(buffer) if buffer is not None else cap.read()
+        if not ret or frame is None:
+            if buffer is not None:
+                self.release(buffer)
+            return False, None
+        if buffer is not None and frame.ctypes.data == buffer.ctypes.data:
+            return True, buffer
+
+        # the backend allocated a new array: adopt it
+        with self._lock:
+            self.allocations += 1
+            self._shape = frame.shape
+            self._refs[id(frame)] = [frame, 1]
+        if buffer is not None:
+            self.release(buffer)
+        return True, frame
+
+    def stats(self):
+        """
+        Returns:
+            dict: Allocation and reuse counters, buffers in use and idle.
+        """
+        with self._lock:
+            return {
+                "allocations": self.allocations,
+                "reuses": self.reuses,
+                "in_use": len(self._refs),
+                "free": len(self._free),
+            }
+
+
+class ScreenBuffer:
+    """
+    Scales frames to the screen into one preallocated image, mirroring
+    them in place when asked (the hand tracker then mirrors landmark
+    coordinates instead of the camera pixels, see HandTracker(mirror=True)).
+
+    Attributes:
+        size (tuple): (width, height) of the screen image.
+        mirror (bool): Flip the scaled image horizontally.
+        image (np.ndarray or None): The screen image, reused every frame.
+        allocations (int): Number of times the screen image was allocated.
+    """
+
+    def __init__(self, size, mirror=False):
+        """
+        Args:
+            size (tuple): (width, height) of the screen image.
+            mirror (bool): Flip the scaled image horizontally.
+        """
+        self.size = tuple(size)
+        self.mirror = mirror
+        self.image = None
+        self.allocations = 0
+
+    def render(self, frame):
+        """
+        Scale (and mirror) a frame into the screen image.
+
+        Args:
+            frame (np.ndarray): BGR camera frame; it is not modified.
+
+        Returns:
+            np.ndarray: The screen image, valid until the next render().
+        """
+        width, height = self.size
+        if self.image is None or self.image.shape != (height, width) + frame.shape[2:]:
+            self.image = np.empty((height, width) + frame.shape[2:], dtype=frame.dtype)
+            self.allocations += 1
+        cv2.resize(frame, self.size, dst=self.image, interpolation=cv2.INTER_LINEAR)
+        if self.mirror:
+            cv2.flip(self.image, 1, dst=self.image)
+        return self.image
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
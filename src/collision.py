@@ -0,0 +1,155 @@
+import numpy as np
+
+
+def first_hits(px, py, xs, ys, radii, chunk=1 << 20):
+    """
+    For every point, find the first circle (lowest index) that contains it.
+
+    A point is inside a circle when its distance to the center is strictly
+    smaller than the radius, matching GameObject.check_collision. All points
+    are tested against all circles at once; the (points x circles) distance
+    matrix is processed in chunks of at most `chunk` entries.
+
+    Args:
+        px, py (array-like): Point coordinates, shape (F,).
+        xs, ys (array-like): Circle centers, shape (N,).
+        radii (array-like): Circle radii, shape (N,).
+        chunk (int): Maximum number of distance entries computed at once.
+
+    Returns:
+        np.ndarray: int64 array of shape (F,) with the circle index hit by
+        each point, or -1 where a point hits nothing.
+    """
+    px = np.asarray(px, dtype=np.float64)
+    py = np.asarray(py, dtype=np.float64)
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    r2 = np.square(np.asarray(radii, dtype=np.float64))
+
+    hits = np.full(len(px), -1, dtype=np.int64)
+    if len(px) == 0 or len(xs) == 0:
+        return hits
+
+    step = max(1, chunk // len(px))
+    pending = np.ones(len(px), dtype=bool)
+    for start in range(0, len(xs), step):
+        end = start + step
+        dx = px[pending, None] - xs[None, start:end]
+        dy = py[pending, None] - ys[None, start:end]
+        inside = dx * dx + dy * dy < r2[None, start:end]
+        found = inside.any(axis=1)
+        rows = np.flatnonzero(pending)[found]
+        hits[rows] = start + inside[found].argmax(axis=1)
+        pending[rows] = False
+        if not pending.any():
+            break
+    return hits
+
+
+def segment_hits(ax, ay, bx, by, xs, ys, radii, chunk=1 << 20):
+    """
+    Find every circle crossed by each segment (swept point collision).
+
+    A segment from A to B hits a circle when its closest point is strictly
+    closer to the center than the radius, so a zero-length segment behaves
+    like first_hits' point test. For each hit, the entry parameter t in
+    [0, 1] is where the segment first enters the circle (0 if A is already
+    inside). Hits are returned ordered by segment, then by t, then by
+    circle index, i.e. the order in which a swipe crosses the circles.
+
+    Args:
+        ax, ay (array-like): Segment start points, shape (S,).
+        bx, by (array-like): Segment end points, shape (S,).
+        xs, ys (array-like): Circle centers, shape (N,).
+        radii (array-like): Circle radii, shape (N,).
+        chunk (int): Maximum number of (segment, circle) pairs tested at once.
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): int64 segment indices, int64
+        circle indices and float64 entry parameters of all hits.
+    """
+    ax = np.asarray(ax, dtype=np.float64)
+    ay = np.asarray(ay, dtype=np.float64)
+    dx = np.asarray(bx, dtype=np.float64) - ax
+    dy = np.asarray(by, dtype=np.float64) - ay
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    r2 = np.square(np.asarray(radii, dtype=np.float64))
+
+    seg_ids, circle_ids, entries = [], [], []
+    if len(ax) and len(xs):
+        a = dx * dx + dy * dy
+        moving = a > 0
+        safe_a = np.where(moving, a, 1.0)
+        step = max(1, chunk // len(ax))
+        for start in range(0, len(xs), step):
+            end = start + step
+            # f = A - C; the closest point of the segment is at t* = -(f.d)/|d|^2
+            fx = ax[:, None] - xs[None, start:end]
+            fy = ay[:, None] - ys[None, start:end]
+            fd = fx * dx[:, None] + fy * dy[:, None]
+            ff = fx * fx + fy * fy
+            c = ff - r2[None, start:end]
+            t_min = np.clip(-fd / safe_a[:, None], 0.0, 1.0) * moving[:, None]
+            cx = fx + t_min * dx[:, None]
+            cy = fy + t_min * dy[:, None]
+            rows, cols = np.nonzero(cx * cx + cy * cy < r2[None, start:end])
+            if not len(rows):
+                continue
+            # entry: smaller root of |f + t d|^2 = r^2, or 0 if A is inside
+            fd, c = fd[rows, cols], c[rows, cols]
+            a_hit = safe_a[rows]
+            disc = np.maximum(fd * fd - a_hit * c, 0.0)
+            t = np.where(c < 0, 0.0, np.clip((-fd - np.sqrt(disc)) / a_hit, 0.0, 1.0))
+            seg_ids.append(rows)
+            circle_ids.append(start + cols)
+            entries.append(t)
+
+    if not seg_ids:
+        return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.float64))
+    seg_ids = np.concatenate(seg_ids).astype(np.int64)
+    circle_ids = np.concatenate(circle_ids).astype(np.int64)
+    entries = np.concatenate(entries)
+    order = np.lexsort((circle_ids, entries, seg_ids))
+    return seg_ids[order], circle_ids[order], entries[order]
+
+
+def pair_hits(ax, ay, bx, by, xs, ys, radii):
+    """
+    Test segment i against circle i only, for many (segment, circle) pairs.
+
+    Uses the same test as segment_hits, but pairs are given explicitly
+    instead of testing every segment against every circle, e.g. to test the
+    fingertips of many games against the objects of their own game at once.
+
+    The arguments broadcast against each other like NumPy arrays, e.g.
+    segments of shape (S, 1) against circles of shape (S, N).
+
+    Args:
+        ax, ay (array-like): Segment start points.
+        bx, by (array-like): Segment end points.
+        xs, ys (array-like): Circle centers.
+        radii (array-like): Circle radii.
+
+    Returns:
+        np.ndarray: bool array of the broadcast shape, True where the
+        segment hits its circle.
+    """
+    ax = np.asarray(ax, dtype=np.float64)
+    ay = np.asarray(ay, dtype=np.float64)
+    dx = np.asarray(bx, dtype=np.float64) - ax
+    dy = np.asarray(by, dtype=np.float64) - ay
+    fx = ax - np.asarray(xs, dtype=np.float64)
+    fy = ay - np.asarray(ys, dtype=np.float64)
+    a = dx * dx + dy * dy
+    moving = a > 0
+    t = np.clip(-(fx * dx + fy * dy) / np.where(moving, a, 1.0), 0.0, 1.0) * moving
+    cx = fx + t * dx
+    cy = fy + t * dy
+    return cx * cx + cy * cy < np.square(np.asarray(radii, dtype=np.float64))
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -2,6 +2,23 @@ import cv2
 import random
 import math
 import os
+import numpy as np
+from src.collision import first_hits, segment_hits
+from src.instrumentation import NULL_PROFILER, profiled
+from src.object_store import OBJECT_TYPES, TYPE_IDS, ObjectStore
+from src.spawner import PoissonSpawner
+from src.sprites import ASSET_CACHE, Sprite, composite, composite_many, prepare_bgra
+
+
+# Get path to assets folder (parent directory of src)
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+COIN_PATH = os.path.join(ASSETS_DIR, "vecteezy_game-coin-pixelated_54978935.png")
+BOMB_PATH = os.path.join(ASSETS_DIR, "vecteezy_game-item-pixelated-bomb_57467426.png")
+
+# Score change for collecting each object type
+POINTS = {'coin': 1, 'bomb': -3}
+# Respawn weights when both types are below their maximum (80% coin, 20% bomb)
+RESPAWN_WEIGHTS = {'coin': 80, 'bomb': 20}
 
 
 def load_image_with_alpha(image_path, size=(60, 60)):
@@ -19,15 +36,25 @@ def load_image_with_alpha(image_path, size=(60, 60)):
     if img is None:
         raise FileNotFoundError(f"Could not load image: {image_path}")
     
-    # Resize with high-quality interpolation
-    img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
-    
-    # Ensure image has alpha channel
-    if img.shape[2] == 3:
-        # Add alpha channel if missing
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+    return prepare_bgra(img, size)
+
+
+def _make_rng(rng):
+    """A random.Random for a generator or seed; the random module for None."""
+    if rng is None:
+        return random
+    return rng if isinstance(rng, random.Random) else random.Random(rng)
+
+
+def prewarm_assets(sizes=((60, 60),)):
+    """
+    Decode the coin and bomb images and build their sprites for every
+    given size, so games created later never touch the disk.
     
-    return img
+    Args:
+        sizes (Iterable[tuple]): (width, height) object sizes to prepare.
+    """
+    ASSET_CACHE.prewarm((COIN_PATH, BOMB_PATH), sizes)
 
 
 class GameObject:
@@ -39,12 +66,14 @@ class GameObject:
         y (int): Y-coordinate of the object center.
         obj_type (str): Type of object ('coin' or 'bomb').
         image (np.ndarray): Image data with alpha channel.
+        sprite (Sprite): Image prepared for compositing (shared between
+            objects of the same type).
         width (int): Width of the object.
         height (int): Height of the object.
         radius (int): Collision radius (approximate).
     """
     
-    def __init__(self, x, y, obj_type, image):
+    def __init__(self, x, y, obj_type, image, sprite=None):
         """
         Initialize a game object.
         
@@ -53,43 +82,26 @@ class GameObject:
             y (int): Y-coordinate.
             obj_type (str): 'coin' or 'bomb'.
             image (np.ndarray): Image data with alpha channel.
+            sprite (Sprite or None): Precomputed sprite for image; built
+                from image when omitted.
         """
         self.x = x
         self.y = y
         self.obj_type = obj_type
         self.image = image
+        self.sprite = sprite if sprite is not None else Sprite(image)
         self.height, self.width = image.shape[:2]
         self.radius = min(self.width, self.height) // 2
     
     def draw(self, frame):
         """
         Draw the object on the frame with alpha blending.
+        Objects partly outside the frame are clipped.
         
         Args:
             frame (np.ndarray): The frame to draw on (BGR format).
         """
-        # Calculate top-left corner position
-        x1 = self.x - self.width // 2
-        y1 = self.y - self.height // 2
-        x2 = x1 + self.width
-        y2 = y1 + self.height
-        
-        # Ensure object is within frame bounds
-        if x1 < 0 or y1 < 0 or x2 > frame.shape[1] or y2 > frame.shape[0]:
-            return
-        
-        # Extract alpha channel and create mask
-        if self.image.shape[2] == 4:
-            alpha = self.image[:, :, 3] / 255.0
-            # Overlay RGB channels with alpha blending
-            for c in range(3):
-                frame[y1:y2, x1:x2, c] = (
-                    alpha * self.image[:, :, c] +
-                    (1 - alpha) * frame[y1:y2, x1:x2, c]
-                )
-        else:
-            # No alpha channel, just overlay directly
-            frame[y1:y2, x1:x2] = self.image[:, :, :3]
+        composite(frame, self.sprite, self.x, self.y)
     
     def check_collision(self, finger_x, finger_y):
         """
@@ -109,32 +121,152 @@ class GameObject:
         return distance < self.radius
 
 
+class ObjectView(GameObject):
+    """
+    A lightweight GameObject whose state lives in one slot of an
+    ObjectStore. Reading or assigning x and y goes straight to the store,
+    so views are cheap to create and always reflect the current game state.
+    
+    Slots are reused by later spawns, so a view remembers the spawn number
+    of its object: once that object is caught or removed, alive is False
+    and using the view raises ReferenceError instead of silently reading
+    or moving the object that took over the slot.
+    
+    Attributes:
+        store (ObjectStore): The store holding the object's data.
+        index (int): Slot of the object in the store.
+    """
+    
+    def __init__(self, store, index, sprites):
+        """
+        Args:
+            store (ObjectStore): The store holding the object's data.
+            index (int): Slot of the object in the store.
+            sprites (List[Sprite]): Sprite of each object type.
+        """
+        self.store = store
+        self.index = index
+        self._order = int(store.order[index])
+        self.sprite = sprites[store.type[index]]
+        self.image = self.sprite.image
+        self.height, self.width = self.image.shape[:2]
+    
+    @property
+    def alive(self):
+        """True while the object this view was created for is in the game."""
+        return bool(self.store.alive[self.index]) and self.store.order[self.index] == self._order
+    
+    def _slot(self):
+        if not self.alive:
+            raise ReferenceError("the object of this view is no longer in the game")
+        return self.index
+    
+    @property
+    def x(self):
+        return int(self.store.x[self._slot()])
+    
+    @x.setter
+    def x(self, value):
+        self.store.x[self._slot()] = value
+    
+    @property
+    def y(self):
+        return int(self.store.y[self._slot()])
+    
+    @y.setter
+    def y(self, value):
+        self.store.y[self._slot()] = value
+    
+    @property
+    def obj_type(self):
+        return OBJECT_TYPES[self.store.type[self._slot()]]
+    
+    @property
+    def radius(self):
+        return int(self.store.radius[self._slot()])
+
+
 class CollectibleGame:
     """
     CollectibleGame manages coins and bombs that players can collect.
     
+    Objects live in a struct-of-arrays ObjectStore; the objects attribute
+    exposes them as GameObject views for code that works per object.
+    
     Attributes:
         frame_width (int): Width of the frame/canvas.
         frame_height (int): Height of the frame/canvas.
         players (int): Number of players.
         scores (List[int]): Scores for each player.
-        objects (List[GameObject]): Active game objects on screen.
+        store (ObjectStore): Positions, types, radii and velocities of the
+            active objects.
+        objects (Tuple[GameObject]): Active game objects on screen, in spawn
+            order (views on store). The tuple is a snapshot: objects are
+            added with spawn_objects and removed by collisions, or all
+            replaced by assigning a new sequence.
         coin_image (np.ndarray): Loaded coin image.
         bomb_image (np.ndarray): Loaded bomb image.
         max_coins (int): Maximum number of coins on screen.
         max_bombs (int): Maximum number of bombs on screen.
+        object_size (tuple): (width, height) of the coin and bomb sprites.
+        object_speed (float): Speed in pixels per second given to newly
+            spawned objects (0 keeps them still).
+        spawner (PoissonSpawner): Places new objects at least
+            spawn_spacing apart, away from fingertips and avoid_rects. Its
+            grid follows the store and is rebuilt only after the store was
+            changed by other means (see ObjectStore.version).
+        avoid_rects (List[tuple]): (x1, y1, x2, y2) areas, such as the HUD,
+            that spawned objects must not overlap.
+        fingertip_clearance (float): Minimum distance between a new object
+            and the fingertips seen in the last check_collisions call.
+        swept (bool): Test the path of each fingertip since the previous
+            check_collisions call instead of only its current point.
+        max_sweep (float or None): Longest fingertip movement treated as a
+            swipe; longer jumps (e.g. tracking switching hands) are tested
+            as a point. None means no limit.
+        profiler (Profiler): Records the "update", "draw" and "collisions"
+            spans.
+        track_changes (bool): The store records changed slots (see
+            ObjectStore.take_changes).
+        rng (random.Random or module): Source of the spawn decisions, object
+            directions and the spawner's seed.
+        last_catches (List[tuple]): (player, type id, x, y) of every object
+            collected in the last check_collisions call, in scoring order.
     """
     
-    def __init__(self, frame_width, frame_height, players=1, max_coins=3, max_bombs=2):
+    def __init__(self, frame_width, frame_height, players=1, max_coins=3, max_bombs=2,
+                 object_size=(60, 60), object_speed=0.0, spawn_spacing=None,
+                 avoid_rects=(), fingertip_clearance=None, swept=False, max_sweep=None,
+                 profiler=None, track_changes=False, rng=None):
         """
         Initialize the game state and load assets.
         
+        Assets come from the process-wide ASSET_CACHE, so only the first
+        game (or prewarm_assets) decodes and scales the images.
+        
         Args:
             frame_width (int): Width of game area.
             frame_height (int): Height of game area.
             players (int): Number of players.
             max_coins (int): Maximum coins on screen.
             max_bombs (int): Maximum bombs on screen.
+            object_size (tuple): (width, height) of the objects.
+            object_speed (float): Speed of spawned objects in pixels/second.
+            spawn_spacing (float or None): Minimum distance between object
+                centers; defaults to the object size, so objects never overlap.
+            avoid_rects (Iterable[tuple]): Areas objects must not overlap.
+            fingertip_clearance (float or None): Minimum distance from a
+                fingertip to a new object center; defaults to twice the
+                object size.
+            swept (bool): Collect every object a fingertip passed through
+                since the previous frame, so fast swipes at low tracking
+                rates still register.
+            max_sweep (float or None): Longest movement tested as a swipe.
+            profiler (Profiler or None): Timing spans; disabled by default.
+            track_changes (bool): Record the slots of spawned, caught and
+                moved objects, e.g. to send state diffs.
+            rng (random.Random, int or None): Generator or seed, so a game
+                can be replayed exactly; None uses the global random module.
         """
         self.frame_width = frame_width
         self.frame_height = frame_height
@@ -142,33 +274,85 @@ class CollectibleGame:
         self.scores = [0] * players
         self.max_coins = max_coins
         self.max_bombs = max_bombs
-        self.objects = []
+        self.object_size = tuple(object_size)
+        self.object_speed = object_speed
+        self.profiler = profiler or NULL_PROFILER
+        self.rng = _make_rng(rng)
+        self.track_changes = track_changes
+        self.store = ObjectStore(
+            capacity=max(16, max_coins + max_bombs), track_changes=track_changes
+        )
         
-        # Load game assets
-        # Get path to assets folder (parent directory of src)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        assets_dir = os.path.join(os.path.dirname(current_dir), "assets")
+        # Load game assets (shared, decoded once per process)
+        self.coin_sprite = ASSET_CACHE.get(COIN_PATH, self.object_size, "sprite")
+        self.bomb_sprite = ASSET_CACHE.get(BOMB_PATH, self.object_size, "sprite")
+        self.coin_image = self.coin_sprite.image
+        self.bomb_image = self.bomb_sprite.image
+        self._sprites = [self.coin_sprite, self.bomb_sprite]  # indexed by type id
         
-        coin_path = os.path.join(assets_dir, "vecteezy_game-coin-pixelated_54978935.png")
-        bomb_path = os.path.join(assets_dir, "vecteezy_game-item-pixelated-bomb_57467426.png")
+        # Spawning: keep objects apart and away from fingertips and the HUD
+        half_w, half_h = self.object_size[0] / 2, self.object_size[1] / 2
+        self.avoid_rects = [
+            (x1 - half_w, y1 - half_h, x2 + half_w, y2 + half_h)
+            for x1, y1, x2, y2 in avoid_rects
+        ]
+        self.fingertip_clearance = (
+            2 * max(self.object_size) if fingertip_clearance is None else fingertip_clearance
+        )
+        self.spawner = PoissonSpawner(
+            frame_width, frame_height,
+            max(self.object_size) if spawn_spacing is None else spawn_spacing,
+            padding=80,
+            rng=self.rng.getrandbits(64),
+        )
+        self._spawner_version = None  # store version the spawner grid matches
+        self._tips = []
+        self.last_catches = []
         
-        self.coin_image = load_image_with_alpha(coin_path, size=(60, 60))
-        self.bomb_image = load_image_with_alpha(bomb_path, size=(60, 60))
+        # Swept collisions: last fingertip of each player (None if not seen)
+        self.swept = swept
+        self.max_sweep = max_sweep
+        self._previous_tips = [None] * players
         
         # Spawn initial objects
         self._spawn_initial_objects()
     
+    def reset(self):
+        """
+        Start a new round in place: scores, objects and fingertip history
+        are cleared and the initial objects spawned again, while assets,
+        buffers and settings are kept.
+        """
+        self.scores = [0] * self.players
+        self.store.clear()
+        self._tips = []
+        self.last_catches = []
+        self._previous_tips = [None] * self.players
+        self._spawn_initial_objects()
+    
+    @property
+    def objects(self):
+        return tuple(
+            ObjectView(self.store, i, self._sprites) for i in self.store.indices().tolist()
+        )
+    
+    @objects.setter
+    def objects(self, objects):
+        # read first: the objects may be views on the slots cleared below
+        states = [(obj.x, obj.y, TYPE_IDS[obj.obj_type], obj.radius) for obj in objects]
+        self.store.clear()
+        for state in states:
+            self.store.add(*state)
+    
     def _spawn_initial_objects(self):
         """Spawn initial random objects on the screen."""
         # Spawn 3-5 coins (higher spawn rate)
-        num_coins = random.randint(max(3, self.max_coins - 2), self.max_coins)
-        for _ in range(num_coins):
-            self._spawn_object('coin')
+        num_coins = self.rng.randint(max(3, self.max_coins - 2), self.max_coins)
+        self.spawn_objects('coin', num_coins)
         
         # Spawn 0-1 bombs (lower spawn rate)
-        num_bombs = random.randint(0, min(1, self.max_bombs))
-        for _ in range(num_bombs):
-            self._spawn_object('bomb')
+        num_bombs = self.rng.randint(0, min(1, self.max_bombs))
+        self.spawn_objects('bomb', num_bombs)
     
     def _spawn_object(self, obj_type):
         """
@@ -177,17 +361,65 @@ class CollectibleGame:
         Args:
             obj_type (str): 'coin' or 'bomb'.
         """
-        padding = 80
-        x = random.randint(padding, self.frame_width - padding)
-        y = random.randint(padding, self.frame_height - padding)
+        self.spawn_objects(obj_type, 1)
+    
+    def spawn_objects(self, obj_type, count):
+        """
+        Spawn several objects of one type in a single spawner call.
         
-        image = self.coin_image if obj_type == 'coin' else self.bomb_image
-        obj = GameObject(x, y, obj_type, image)
-        self.objects.append(obj)
+        Positions keep spawn_spacing from every object and each other, and
+        stay clear of the last fingertips and of avoid_rects. If the free
+        area runs out, fewer objects are spawned; the missing ones are
+        counted in spawner.shortfall.
+        Freed slots of the store are reused.
+        
+        Args:
+            obj_type (str): 'coin' or 'bomb'.
+            count (int): Number of objects to spawn.
+        
+        Returns:
+            int: Number of objects spawned.
+        """
+        return self._spawn_types([TYPE_IDS[obj_type]] * max(0, count))
+    
+    def _spawn_types(self, type_ids):
+        """
+        Spawn one object of each type id, in order, in a single spawner call
+        (see spawn_objects).
+        
+        Returns:
+            int: Number of objects spawned; the first ones of type_ids get
+            a position when the free area runs out.
+        """
+        if not type_ids:
+            return 0
+        store = self.store
+        existing = None
+        if self._spawner_version != store.version:
+            # changed behind the spawner's back (moved, added directly, ...)
+            indices = store.indices()
+            existing = np.column_stack([store.x[indices], store.y[indices]])
+        points = self.spawner.sample(
+            len(type_ids),
+            existing=existing,
+            avoid_circles=[(x, y, self.fingertip_clearance) for x, y in self._tips],
+            avoid_rects=self.avoid_rects,
+        )
+        
+        for type_id, (x, y) in zip(type_ids, points.tolist()):
+            sprite = self._sprites[type_id]
+            vx = vy = 0.0
+            if self.object_speed:
+                angle = self.rng.uniform(0, 2 * math.pi)
+                vx = self.object_speed * math.cos(angle)
+                vy = self.object_speed * math.sin(angle)
+            store.add(x, y, type_id, min(sprite.width, sprite.height) // 2, vx, vy)
+        self._spawner_version = store.version
+        return len(points)
     
     def _count_objects(self, obj_type):
         """
-        Count how many objects of a given type are active.
+        Count how many objects of a given type are active, in O(1).
         
         Args:
             obj_type (str): 'coin' or 'bomb'.
@@ -195,79 +427,219 @@ class CollectibleGame:
         Returns:
             int: Count of objects.
         """
-        return sum(1 for obj in self.objects if obj.obj_type == obj_type)
+        return self.store.count(TYPE_IDS[obj_type])
+    
+    @profiled("update")
+    def update(self, dt):
+        """
+        Advance moving objects by dt seconds, bouncing off the frame edges.
+        
+        Args:
+            dt (float): Elapsed time in seconds.
+        """
+        self.store.step(dt, self.frame_width, self.frame_height)
     
-    def draw_objects(self, frame):
+    def _scaled_sprites(self, scale):
+        """Coin and bomb sprites for a render scale (cached by ASSET_CACHE)."""
+        if scale == 1.0:
+            return self._sprites
+        size = tuple(max(1, int(round(d * scale))) for d in self.object_size)
+        return [
+            ASSET_CACHE.get(COIN_PATH, size, "sprite"),
+            ASSET_CACHE.get(BOMB_PATH, size, "sprite"),
+        ]
+    
+    @profiled("draw")
+    def draw_objects(self, frame, batch=False, scale=1.0):
         """
         Draw all active objects on the frame.
         
         Args:
             frame (np.ndarray): The frame to draw on.
+            batch (bool): Composite all objects in one pass (see
+                composite_many) instead of drawing them one by one.
+            scale (float): Size of the frame relative to the game area
+                (e.g. 0.5 to render at half resolution); positions and
+                sprites are scaled accordingly.
         """
-        for obj in self.objects:
-            obj.draw(frame)
+        store = self.store
+        indices = store.indices()
+        type_sprites = self._scaled_sprites(scale)
+        sprites = [type_sprites[t] for t in store.type[indices].tolist()]
+        xs = (store.x[indices] * scale).astype(np.int64)
+        ys = (store.y[indices] * scale).astype(np.int64)
+        if batch:
+            composite_many(frame, sprites, xs, ys)
+            return
+        for sprite, x, y in zip(sprites, xs.tolist(), ys.tolist()):
+            composite(frame, sprite, x, y)
     
+    @profiled("collisions")
     def check_collisions(self, finger_positions: list[tuple[int | None, int | None]]):
         """
         Check all fingertips against all objects for collisions.
         Update scores and respawn objects as needed.
         
+        All fingertips are tested against all objects in one vectorized
+        step (see first_hits). Each finger collects at most one object per
+        frame: the first one in self.objects that it touches.
+        
+        With swept=True, each finger is tested as the segment from its
+        previous position to the current one (see segment_hits) and collects
+        every object on that path, in the order the path crosses them. A
+        finger seen for the first time, or after it was lost, is a point.
+        
         Args:
             finger_positions (List[Tuple[int|None, int|None]]):
                 A list of (x, y) coordinates for each player's index fingertip,
                 or (None, None) if that hand wasn't detected.
         """
-        objects_to_remove = []
+        players, previous = self.track(finger_positions)
+        self.last_catches = []
+        store = self.store
+        if not players or not len(store):
+            return
         
-        for i, (fx, fy) in enumerate(finger_positions):
-            if fx is None or fy is None:
+        indices = store.indices()
+        if self.swept:
+            starts = [self._sweep_start(previous, i, finger_positions[i]) for i in players]
+            segments, hits, _ = segment_hits(
+                [x for x, _ in starts],
+                [y for _, y in starts],
+                [finger_positions[i][0] for i in players],
+                [finger_positions[i][1] for i in players],
+                store.x[indices],
+                store.y[indices],
+                store.radius[indices],
+            )
+            hits_by_player = zip([players[s] for s in segments.tolist()], hits.tolist())
+        else:
+            hits = first_hits(
+                [finger_positions[i][0] for i in players],
+                [finger_positions[i][1] for i in players],
+                store.x[indices],
+                store.y[indices],
+                store.radius[indices],
+            )
+            hits_by_player = zip(players, hits.tolist())
+        
+        # slots caught this frame, in the order they were first hit
+        caught = {}
+        for i, hit in hits_by_player:
+            if hit < 0:
                 continue
-            
-            for obj in self.objects:
-                if obj.check_collision(fx, fy):
-                    # Update score based on object type
-                    if obj.obj_type == 'coin':
-                        self.scores[i] += 1
-                    elif obj.obj_type == 'bomb':
-                        self.scores[i] -= 3
-                    
-                    # Mark object for removal
-                    if obj not in objects_to_remove:
-                        objects_to_remove.append(obj)
-                    
-                    # Only one object per finger per frame
-                    break
-        
-        # Remove caught objects and spawn new ones
-        for obj in objects_to_remove:
-            self.objects.remove(obj)
-            self._respawn_object()
+            slot = int(indices[hit])
+            # Update score based on object type
+            type_id = int(store.type[slot])
+            self.scores[i] += POINTS[OBJECT_TYPES[type_id]]
+            self.last_catches.append((i, type_id, float(store.x[slot]), float(store.y[slot])))
+            caught[slot] = None
+        
+        self._replace(list(caught))
+    
+    def _replace(self, slots):
+        """
+        Remove caught objects and spawn their replacements with one spawner
+        call. Types are decided as if each object were respawned right
+        after its own removal (see _respawn_type), and the replacements
+        take the freed slots in the same order.
+        
+        Args:
+            slots (List[int]): Slots of live objects, in the order caught.
+        """
+        store = self.store
+        counts = {'coin': self._count_objects('coin'), 'bomb': self._count_objects('bomb')}
+        types = []
+        for slot in slots:
+            counts[OBJECT_TYPES[int(store.type[slot])]] -= 1
+            obj_type = self._respawn_type(counts['coin'], counts['bomb'])
+            if obj_type is not None:
+                counts[obj_type] += 1
+                types.append(TYPE_IDS[obj_type])
+        
+        synced = self._spawner_version == store.version
+        removed = np.column_stack([store.x[slots], store.y[slots]])
+        # freed slots are reused last in, first out
+        for slot in reversed(slots):
+            store.remove(slot)
+        if synced:
+            self.spawner.remove(removed)
+            self._spawner_version = store.version
+        self._spawn_types(types)
+    
+    def track(self, finger_positions):
+        """
+        Record the fingertips of a frame without testing them against the
+        objects, e.g. when the caller already knows nothing can be hit.
+        The next swipe then starts from these positions.
+        
+        Args:
+            finger_positions (List[Tuple[int|None, int|None]]): See
+                check_collisions.
+        
+        Returns:
+            (List[int], list): Indices of the players whose fingertip was
+            seen, and the fingertips recorded before this call.
+        """
+        players = [
+            i for i, (fx, fy) in enumerate(finger_positions)
+            if fx is not None and fy is not None
+        ]
+        # respawned objects must not appear under a fingertip
+        self._tips = [finger_positions[i] for i in players]
+        previous = self._previous_tips
+        self._previous_tips = [
+            finger_positions[i] if i in players else None
+            for i in range(max(self.players, len(finger_positions)))
+        ]
+        return players, previous
+    
+    def _sweep_start(self, previous, player, tip):
+        """Start of a player's swipe: the previous fingertip, or tip itself."""
+        start = previous[player] if player < len(previous) else None
+        if start is None:
+            return tip
+        if self.max_sweep is not None and math.hypot(
+            tip[0] - start[0], tip[1] - start[1]
+        ) > self.max_sweep:
+            return tip
+        return start
     
     def _respawn_object(self):
         """
         Spawn a new random object, respecting maximum counts.
         Favors coins over bombs (80% coin, 20% bomb when both available).
         """
-        coin_count = self._count_objects('coin')
-        bomb_count = self._count_objects('bomb')
+        obj_type = self._respawn_type(self._count_objects('coin'), self._count_objects('bomb'))
+        if obj_type is not None:
+            self._spawn_object(obj_type)
+    
+    def _respawn_type(self, coin_count, bomb_count):
+        """
+        Type of the next respawned object given the current counts: 80%
+        coin, 20% bomb when both are below their maximum.
         
+        Returns:
+            str or None: 'coin' or 'bomb', None if both are at their maximum.
+        """
         # Determine what can be spawned
         can_spawn_coin = coin_count < self.max_coins
         can_spawn_bomb = bomb_count < self.max_bombs
         
         if not can_spawn_coin and not can_spawn_bomb:
-            return  # Both at max, don't spawn
+            return None  # Both at max, don't spawn
         
         # Choose randomly among available options, favoring coins
         if can_spawn_coin and can_spawn_bomb:
             # 80% chance of coin, 20% chance of bomb
-            obj_type = random.choices(['coin', 'bomb'], weights=[80, 20])[0]
+            obj_type = self.rng.choices(
+                ['coin', 'bomb'], weights=[RESPAWN_WEIGHTS['coin'], RESPAWN_WEIGHTS['bomb']]
+            )[0]
         elif can_spawn_coin:
             obj_type = 'coin'
         else:
             obj_type = 'bomb'
-        
-        self._spawn_object(obj_type)
+        return obj_type
 
 
 # Keep DotGame for backward compatibility (though it won't be used)
@@ -282,12 +654,18 @@ class DotGame:
         players (int): Number of players (i.e. number of fingertips to track).
         scores (List[int]): Scores for each player.
         dot_x (int), dot_y (int): Current center coordinates of the dot.
+        rng (random.Random or module): Source of the dot positions.
     """
 
-    def __init__(self, frame_width, frame_height, dot_radius=20, players=1):
+    def __init__(self, frame_width, frame_height, dot_radius=20, players=1, rng=None):
         """
         Initialize the game state, allocate score counters, and spawn the first dot.
+
+        Args:
+            rng (random.Random, int or None): Generator or seed; None uses
+                the global random module.
         """
+        self.rng = _make_rng(rng)
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.dot_radius = dot_radius
@@ -301,10 +679,10 @@ class DotGame:
         leaving a padding so it never appears too close to the edges.
         """
         padding = 50
-        self.dot_x = random.randint(
+        self.dot_x = self.rng.randint(
             self.dot_radius + padding, self.frame_width - self.dot_radius - padding
         )
-        self.dot_y = random.randint(
+        self.dot_y = self.rng.randint(
             self.dot_radius + padding, self.frame_height - self.dot_radius - padding
         )
 
@@ -0,0 +1,87 @@
+import os
+
+import cv2
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class ImageDirectoryCapture:
+    """
+    A minimal cv2.VideoCapture look-alike that yields the images of a
+    directory in sorted file-name order.
+
+    Attributes:
+        paths (List[str]): Image files that will be returned, in order.
+        position (int): Index of the next image to read.
+    """
+
+    def __init__(self, directory):
+        """
+        Collect the images in a directory.
+
+        Args:
+            directory (str): Folder containing the frames.
+        """
+        self.paths = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.position = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self, image=None):
+        """
+        Read the next image.
+
+        Args:
+            image (np.ndarray or None): Accepted like cv2.VideoCapture.read's
+                output image, but unused: decoding a file always allocates.
+
+        Returns:
+            (bool, np.ndarray or None): Same contract as cv2.VideoCapture.read.
+        """
+        while self.position < len(self.paths):
+            frame = cv2.imread(self.paths[self.position])
+            self.position += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(len(self.paths))
+        return 0.0
+
+    def set(self, prop_id, value):
+        return False
+
+    def release(self):
+        self.paths = []
+
+
+def open_capture(source):
+    """
+    Open a webcam index, a video file or a directory of images.
+
+    Args:
+        source (int or str): Webcam index (e.g. 0 or "0"), video file path
+            or image directory path.
+
+    Returns:
+        A capture object exposing isOpened(), read(), get(), set() and
+        release().
+    """
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    if isinstance(source, str) and os.path.isdir(source):
+        return ImageDirectoryCapture(source)
+    return cv2.VideoCapture(source)
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
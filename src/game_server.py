@@ -0,0 +1,633 @@
+import asyncio
+import random
+import struct
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from src.collision import pair_hits
+from src.dot_game import CollectibleGame
+from src.instrumentation import NULL_PROFILER
+
+
+# Datagram kinds. A datagram is a kind byte and a record count, followed by
+# that many records of the kind, so one datagram can serve many rooms.
+JOIN = b"J"   # client -> server: room, players, duration in seconds
+TIPS = b"T"   # client -> server: room, players, (x, y) per player
+LEAVE = b"L"  # client -> server: room
+STATE = b"S"  # server -> client: room state, full (keyframe) or diff
+
+# STATE flags
+KEYFRAME = 1   # the record holds every object; drop the previous state
+GAME_OVER = 2  # final state; the room is closed
+
+NO_TIP = -0x8000  # coordinate of a fingertip that was not detected
+MAX_DATAGRAM = 1200  # bytes; stays below common path MTUs
+
+_HEADER = struct.Struct("<cH")
+_JOIN = struct.Struct("<IBH")
+_TIPS = struct.Struct("<IB")
+_TIP = struct.Struct("<hh")
+_LEAVE = struct.Struct("<I")
+_STATE = struct.Struct("<IIBIB")  # room, tick, flags, remaining ms, players
+_SCORE = struct.Struct("<h")
+_COUNT = struct.Struct("<B")
+_SLOT = struct.Struct("<H")
+_OBJECT = struct.Struct("<HBhh")  # slot, type, x, y
+
+
+def encode_join(room, players, duration):
+    """JOIN record: create the room if needed and subscribe to its state."""
+    return _JOIN.pack(room, players, duration)
+
+
+def encode_tips(room, tips):
+    """
+    TIPS record: the fingertips of every player of a room.
+
+    Args:
+        room (int): Room id.
+        tips (List[Tuple[int|None, int|None]]): Fingertip of each player in
+            frame coordinates, in the format of HandTracker.get_player_tips.
+    """
+    return _TIPS.pack(room, len(tips)) + b"".join(
+        _TIP.pack(NO_TIP, NO_TIP) if x is None or y is None else _TIP.pack(int(x), int(y))
+        for x, y in tips
+    )
+
+
+def encode_leave(room):
+    """LEAVE record: unsubscribe from a room."""
+    return _LEAVE.pack(room)
+
+
+def encode_state(room, tick, flags, remaining, scores, removed, objects):
+    """
+    STATE record.
+
+    Args:
+        room (int): Room id.
+        tick (int): Server tick the state belongs to.
+        flags (int): KEYFRAME and/or GAME_OVER.
+        remaining (float): Seconds left in the game.
+        scores (List[int]): Score of each player.
+        removed (Iterable[int]): Slots of objects that disappeared.
+        objects (Iterable[tuple]): (slot, type id, x, y) of objects that
+            appeared or moved (of every object in a keyframe).
+    """
+    removed = list(removed)
+    objects = list(objects)
+    return b"".join([
+        _STATE.pack(room, tick, flags, max(0, int(remaining * 1000)), len(scores)),
+        b"".join(_SCORE.pack(score) for score in scores),
+        _COUNT.pack(len(removed)),
+        b"".join(_SLOT.pack(slot) for slot in removed),
+        _COUNT.pack(len(objects)),
+        b"".join(_OBJECT.pack(*obj) for obj in objects),
+    ])
+
+
+def pack_datagrams(kind, records, limit=MAX_DATAGRAM):
+    """
+    Join encoded records of one kind into as few datagrams as fit in limit.
+
+    Args:
+        kind (bytes): JOIN, TIPS, LEAVE or STATE.
+        records (Iterable[bytes]): Encoded records.
+        limit (int): Maximum datagram size in bytes (a single larger record
+            gets a datagram of its own).
+
+    Returns:
+        List[bytes]: The datagrams.
+    """
+    datagrams, batch, size = [], [], _HEADER.size
+    for record in records:
+        if batch and size + len(record) > limit:
+            datagrams.append(_HEADER.pack(kind, len(batch)) + b"".join(batch))
+            batch, size = [], _HEADER.size
+        batch.append(record)
+        size += len(record)
+    if batch:
+        datagrams.append(_HEADER.pack(kind, len(batch)) + b"".join(batch))
+    return datagrams
+
+
+def decode(datagram):
+    """
+    Parse a datagram.
+
+    Returns:
+        (bytes, list): The kind and its records: (room, players, duration)
+        for JOIN, (room, tips) for TIPS, room for LEAVE and (room, tick,
+        flags, remaining seconds, scores, removed slots, objects) for STATE.
+
+    Raises:
+        ValueError: If the datagram is malformed.
+    """
+    try:
+        kind, count = _HEADER.unpack_from(datagram)
+        offset = _HEADER.size
+        records = []
+        for _ in range(count):
+            if kind == JOIN:
+                records.append(_JOIN.unpack_from(datagram, offset))
+                offset += _JOIN.size
+            elif kind == TIPS:
+                room, players = _TIPS.unpack_from(datagram, offset)
+                offset += _TIPS.size
+                tips = []
+                for _ in range(players):
+                    x, y = _TIP.unpack_from(datagram, offset)
+                    offset += _TIP.size
+                    tips.append((None, None) if x == NO_TIP or y == NO_TIP else (x, y))
+                records.append((room, tips))
+            elif kind == LEAVE:
+                records.append(_LEAVE.unpack_from(datagram, offset)[0])
+                offset += _LEAVE.size
+            elif kind == STATE:
+                room, tick, flags, remaining_ms, players = _STATE.unpack_from(datagram, offset)
+                offset += _STATE.size
+                scores = list(struct.unpack_from(f"<{players}h", datagram, offset))
+                offset += _SCORE.size * players
+                (n,) = _COUNT.unpack_from(datagram, offset)
+                removed = list(struct.unpack_from(f"<{n}H", datagram, offset + 1))
+                offset += 1 + _SLOT.size * n
+                (n,) = _COUNT.unpack_from(datagram, offset)
+                offset += 1
+                objects = []
+                for _ in range(n):
+                    objects.append(_OBJECT.unpack_from(datagram, offset))
+                    offset += _OBJECT.size
+                records.append(
+                    (room, tick, flags, remaining_ms / 1000.0, scores, removed, objects)
+                )
+            else:
+                raise ValueError(f"unknown datagram kind {kind!r}")
+    except struct.error as e:
+        raise ValueError(f"malformed datagram: {e}") from None
+    return kind, records
+
+
+def decode_tips(datagram):
+    """
+    Parse a TIPS datagram whose records all have the same number of players
+    in one step, without a Python loop over the records.
+
+    Returns:
+        (np.ndarray, np.ndarray) or None: uint32 room ids and the (rooms,
+        players, 2) int16 fingertips (NO_TIP where not detected); None if
+        the datagram is not such a TIPS datagram (use decode() instead).
+    """
+    if len(datagram) < _HEADER.size + _TIPS.size or datagram[:1] != TIPS:
+        return None
+    _, count = _HEADER.unpack_from(datagram)
+    players = datagram[_HEADER.size + 4]
+    dtype = np.dtype([("room", "<u4"), ("players", "u1"), ("tips", "<i2", (players, 2))])
+    if count == 0 or len(datagram) != _HEADER.size + count * dtype.itemsize:
+        return None
+    records = np.frombuffer(datagram, dtype=dtype, offset=_HEADER.size)
+    if not (records["players"] == players).all():
+        return None
+    return records["room"], records["tips"]
+
+
+class Room:
+    """
+    One game hosted by a GameServer.
+
+    Attributes:
+        id (int): Room id chosen by the clients.
+        row (int): Row of the room in the server's per-room arrays.
+        game (CollectibleGame): The game state.
+        duration (float): Game length in seconds.
+        started (float): time.perf_counter() when the room was created.
+        subscribers (set): Addresses the room state is sent to.
+    """
+
+    def __init__(self, room_id, row, game, duration, now):
+        self.id = room_id
+        self.row = row
+        self.game = game
+        self.duration = duration
+        self.started = now
+        self.subscribers = set()
+        self._sent_scores = None
+
+    def remaining(self, now):
+        """Seconds left in the game."""
+        return self.duration - (now - self.started)
+
+    def state(self, tick, now, keyframe=False, game_over=False):
+        """
+        Encode the room state for the subscribers.
+
+        Returns:
+            bytes or None: A keyframe with every object, or a diff with the
+            objects changed since the previous call; None if a diff would
+            be empty.
+        """
+        store = self.game.store
+        changed = store.take_changes()
+        scores = self.game.scores
+        flags = (KEYFRAME if keyframe else 0) | (GAME_OVER if game_over else 0)
+        if keyframe:
+            slots = store.indices().tolist()
+            removed = []
+        elif changed or scores != self._sent_scores or game_over:
+            alive = store.alive
+            slots = [slot for slot in sorted(changed) if alive[slot]]
+            removed = [slot for slot in sorted(changed) if not alive[slot]]
+        else:
+            return None
+        self._sent_scores = list(scores)
+        objects = [
+            (slot, int(store.type[slot]), int(store.x[slot]), int(store.y[slot]))
+            for slot in slots
+        ]
+        return encode_state(self.id, tick, flags, self.remaining(now), scores, removed, objects)
+
+
+class GameServer(asyncio.DatagramProtocol):
+    """
+    Headless UDP server hosting many independent CollectibleGame rooms.
+
+    Clients (e.g. a camera running the hand tracker, or the synthetic
+    clients of src/load_client.py) JOIN a room, which creates it with its
+    own game and timer, and stream the fingertips of its players as TIPS;
+    everyone who joined a room receives its STATE. A room closes when its
+    timer runs out (after a final state), when no client datagram arrived
+    for idle_timeout seconds, or when its last subscriber leaves.
+
+    The per-room data the tick needs (fingertips, object circles, timers)
+    lives in struct-of-arrays form, one row per room, so a tick over
+    thousands of rooms is a few vectorized steps:
+      1. rooms whose timer ran out or that went idle are found at once;
+      2. the fingertips received since the previous tick are tested
+         against the objects of their room in one broadcast swept test
+         over all rooms (see pair_hits); it is conservative, and only rooms
+         with a possible hit run CollectibleGame.check_collisions;
+      3. only rooms whose game changed send a diff of the objects spawned,
+         caught or moved and of the scores, and rooms whose keyframe is due
+         (every keyframe_interval seconds, jittered) send their full state
+         so clients recover from lost datagrams; the records for one
+         address are packed into shared datagrams.
+    Rooms with moving objects (object_speed) change every tick and are
+    updated and tested one by one.
+
+    Attributes:
+        tick_rate (float): Ticks per second.
+        frame_size (tuple): (width, height) of every game area; fingertips
+            are given in these coordinates.
+        rooms (dict): Room id -> Room.
+        max_rooms (int): JOINs creating rooms beyond this are ignored.
+        max_players (int): Most players a room may have.
+        keyframe_interval (float): Seconds between two keyframes of a room.
+        idle_timeout (float): Seconds without datagrams before a room closes.
+        game_options (dict): Extra CollectibleGame keyword arguments.
+        tick (int): Number of ticks run.
+        counters (dict): Datagrams and bytes received and sent, malformed
+            datagrams, rooms created, games finished, rooms that ran the
+            exact collision test and late ticks (started more than a tick
+            period after they were due).
+        profiler (Profiler): Records the "tick", "expire", "collisions" and
+            "emit" spans.
+        rng (np.random.Generator): Source of the keyframe jitter and of the
+            seed of every room's game.
+    """
+
+    def __init__(self, tick_rate=30.0, frame_size=(1280, 720), max_rooms=10000, max_players=4,
+                 keyframe_interval=1.0, idle_timeout=10.0, game_options=None, profiler=None,
+                 seed=None):
+        """
+        Args:
+            tick_rate (float): Ticks per second.
+            frame_size (tuple): (width, height) of the game areas.
+            max_rooms (int): Maximum number of rooms.
+            max_players (int): Maximum players per room.
+            keyframe_interval (float): Seconds between keyframes of a room.
+            idle_timeout (float): Seconds before a silent room closes.
+            game_options (dict or None): Extra CollectibleGame keyword
+                arguments (swept collisions are on by default).
+            profiler (Profiler or None): Timing spans; disabled by default.
+            seed (int or None): Seed of rng, so a server fed the same
+                datagrams at the same times plays the same games.
+        """
+        self.tick_rate = tick_rate
+        self.frame_size = tuple(frame_size)
+        self.rooms = {}
+        self.max_rooms = max_rooms
+        self.max_players = max_players
+        self.keyframe_interval = keyframe_interval
+        self.idle_timeout = idle_timeout
+        self.game_options = {"swept": True, **(game_options or {})}
+        self.tick = 0
+        self.counters = defaultdict(int)
+        self.profiler = profiler or NULL_PROFILER
+        self.rng = np.random.default_rng(seed)
+        self.transport = None
+        self._stopped = None
+        self._by_row = []
+        self._free = []
+        self._moving = set()  # rows of rooms with moving objects
+        self._changed = set()  # rows whose state must be sent this tick
+        self._slots_used = 1  # object slots that were ever alive in any room
+        self._allocate(64, 16)
+
+    def _allocate(self, rooms, objects):
+        """(Re)allocate the per-room arrays, keeping the rows in use."""
+        old = len(self._by_row)
+        players = self.max_players
+        columns = {
+            # fingertips of this tick and the previous one, NaN if not seen
+            "_tip": np.full((rooms, players, 2), np.nan),
+            "_last": np.full((rooms, players, 2), np.nan),
+            "_fresh": np.zeros(rooms, dtype=bool),
+            # circles (x, y, radius) of each room's object slots
+            "_objects": np.zeros((rooms, objects, 3)),
+            "_alive": np.zeros((rooms, objects), dtype=bool),
+            "_active": np.zeros(rooms, dtype=bool),
+            "_players": np.zeros(rooms, dtype=np.int64),
+            "_ends": np.zeros(rooms),
+            "_last_seen": np.zeros(rooms),
+            "_next_keyframe": np.zeros(rooms),
+        }
+        for name, column in columns.items():
+            if old:
+                previous = getattr(self, name)
+                column[tuple(slice(0, n) for n in previous.shape)] = previous
+            setattr(self, name, column)
+        self._free.extend(range(rooms - 1, old - 1, -1))
+        self._by_row.extend([None] * (rooms - old))
+
+    def _sync_objects(self, room):
+        """Copy the object circles of a room's store into its row."""
+        store = room.game.store
+        capacity = store.capacity
+        if capacity > self._objects.shape[1]:
+            self._allocate(len(self._by_row), capacity)
+        row = room.row
+        self._objects[row, :capacity, 0] = store.x
+        self._objects[row, :capacity, 1] = store.y
+        self._objects[row, :capacity, 2] = store.radius
+        self._alive[row, :capacity] = store.alive
+        used = np.flatnonzero(store.alive)
+        if len(used):
+            self._slots_used = max(self._slots_used, int(used[-1]) + 1)
+
+    def _create_room(self, room_id, players, duration, now):
+        if len(self.rooms) >= self.max_rooms or not 1 <= players <= self.max_players:
+            return None
+        if duration <= 0:
+            return None
+        if not self._free:
+            self._allocate(2 * len(self._by_row), self._objects.shape[1])
+        row = self._free.pop()
+        game = CollectibleGame(
+            *self.frame_size, players=players, track_changes=True,
+            **{"rng": int(self.rng.integers(2 ** 63)), **self.game_options},
+        )
+        room = self.rooms[room_id] = Room(room_id, row, game, duration, now)
+        self._by_row[row] = room
+        self._tip[row] = np.nan
+        self._last[row] = np.nan
+        self._fresh[row] = False
+        self._active[row] = True
+        self._players[row] = players
+        self._ends[row] = now + duration
+        self._last_seen[row] = now
+        self._next_keyframe[row] = now
+        self._sync_objects(room)
+        if game.object_speed:
+            self._moving.add(row)
+        self.counters["rooms_created"] += 1
+        return room
+
+    def _close_room(self, room):
+        row = room.row
+        del self.rooms[room.id]
+        self._by_row[row] = None
+        self._active[row] = False
+        self._fresh[row] = False
+        self._alive[row] = False
+        self._moving.discard(row)
+        self._changed.discard(row)
+        self._free.append(row)
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.counters["datagrams_in"] += 1
+        self.counters["bytes_in"] += len(data)
+        now = time.perf_counter()
+        batch = decode_tips(data)
+        if batch is not None:
+            self._receive_tips(*batch, now)
+            return
+        try:
+            kind, records = decode(data)
+        except ValueError:
+            self.counters["malformed"] += 1
+            return
+        if kind == TIPS:
+            for room_id, tips in records:
+                tips = [(NO_TIP, NO_TIP) if x is None else (x, y) for x, y in tips]
+                self._receive_tips(
+                    np.array([room_id]), np.array([tips], dtype=np.int16).reshape(1, -1, 2), now
+                )
+        elif kind == JOIN:
+            for room_id, players, duration in records:
+                room = self.rooms.get(room_id) or self._create_room(room_id, players, duration, now)
+                if room is not None:
+                    room.subscribers.add(addr)
+                    # new subscribers need the full state
+                    self._next_keyframe[room.row] = now
+                    self._last_seen[room.row] = now
+        elif kind == LEAVE:
+            for room_id in records:
+                room = self.rooms.get(room_id)
+                if room is not None:
+                    room.subscribers.discard(addr)
+                    if not room.subscribers:
+                        self._close_room(room)
+        else:
+            self.counters["malformed"] += 1
+
+    def _receive_tips(self, room_ids, tips, now):
+        rows = np.array([
+            room.row if room is not None else -1
+            for room in map(self.rooms.get, room_ids.tolist())
+        ], dtype=np.int64)
+        known = rows >= 0
+        rows, tips = rows[known], tips[known, :self.max_players].astype(np.float64)
+        tips[tips == NO_TIP] = np.nan
+        tips[np.isnan(tips).any(axis=2)] = np.nan
+        players = tips.shape[1]
+        self._tip[rows, :players] = tips
+        self._tip[rows, players:] = np.nan
+        self._fresh[rows] = True
+        self._last_seen[rows] = now
+
+    def _send(self, records_by_addr):
+        if self.transport is None:
+            return
+        for addr, records in records_by_addr.items():
+            for datagram in pack_datagrams(STATE, records):
+                self.transport.sendto(datagram, addr)
+                self.counters["datagrams_out"] += 1
+                self.counters["bytes_out"] += len(datagram)
+
+    def step(self, now=None, dt=None):
+        """
+        Run one tick over every room (see the class docstring).
+
+        Args:
+            now (float or None): Current time.perf_counter().
+            dt (float or None): Seconds since the previous tick, for moving
+                objects; defaults to 1 / tick_rate.
+        """
+        now = time.perf_counter() if now is None else now
+        dt = 1.0 / self.tick_rate if dt is None else dt
+        self.tick += 1
+        outgoing = defaultdict(list)
+        with self.profiler.span("tick"):
+            with self.profiler.span("expire"):
+                self._expire(now, outgoing)
+            with self.profiler.span("collisions"):
+                self._collide(dt)
+            with self.profiler.span("emit"):
+                self._emit(now, outgoing)
+        self._send(outgoing)
+
+    def _expire(self, now, outgoing):
+        active = self._active
+        for row in np.flatnonzero(active & (self._ends <= now)).tolist():
+            room = self._by_row[row]
+            record = room.state(self.tick, now, keyframe=True, game_over=True)
+            for addr in room.subscribers:
+                outgoing[addr].append(record)
+            self.counters["games_finished"] += 1
+            self._close_room(room)
+        for row in np.flatnonzero(active & (now - self._last_seen > self.idle_timeout)).tolist():
+            self._close_room(self._by_row[row])
+
+    def _tips(self, row, tips):
+        """Fingertips of a row as a get_player_tips list."""
+        return [
+            (None, None) if x != x else (int(x), int(y))  # NaN: not seen
+            for x, y in tips[row, :self._players[row]].tolist()
+        ]
+
+    def _collide(self, dt):
+        for row in self._moving:
+            room = self._by_row[row]
+            room.game.update(dt)
+            if self._fresh[row]:
+                room.game.check_collisions(self._tips(row, self._tip))
+                self._last[row] = self._tip[row]
+                self._fresh[row] = False
+            self._sync_objects(room)
+            self._changed.add(row)
+
+        rows = np.flatnonzero(self._fresh)
+        if not len(rows):
+            return
+        tips = self._tip[rows]
+        # one segment per seen fingertip, against every object slot in use
+        seg_rows, players = np.nonzero(~np.isnan(tips[:, :, 0]))
+        ends = tips[seg_rows, players]
+        if self.game_options["swept"]:
+            starts = self._last[rows[seg_rows], players]
+            # a player seen for the first time (or again) is a point
+            starts = np.where(np.isnan(starts), ends, starts)
+        else:
+            starts = ends
+        slots = self._slots_used
+        objects = self._objects[rows[seg_rows], :slots]
+        hits = pair_hits(
+            starts[:, 0, None], starts[:, 1, None], ends[:, 0, None], ends[:, 1, None],
+            objects[:, :, 0], objects[:, :, 1], objects[:, :, 2],
+        )
+        hits &= self._alive[rows[seg_rows], :slots]
+        for row in np.unique(rows[seg_rows[hits.any(axis=1)]]).tolist():
+            game = self._by_row[row].game
+            # the game only sees the fingertips of the ticks it is tested
+            game.track(self._tips(row, self._last))
+            game.check_collisions(self._tips(row, self._tip))
+            self._sync_objects(self._by_row[row])
+            self._changed.add(row)
+            self.counters["exact_tests"] += 1
+        self._last[rows] = tips
+        self._fresh[rows] = False
+
+    def _emit(self, now, outgoing):
+        due = np.flatnonzero(self._active & (self._next_keyframe <= now))
+        self._next_keyframe[due] = now + self.keyframe_interval * self.rng.uniform(
+            0.75, 1.25, len(due)
+        )
+        keyframes = set(due.tolist())
+        for row in keyframes | self._changed:
+            room = self._by_row[row]
+            record = room.state(self.tick, now, keyframe=row in keyframes)
+            if record is None:
+                continue
+            for addr in room.subscribers:
+                outgoing[addr].append(record)
+        self._changed = set()
+
+    async def serve(self, host="127.0.0.1", port=9999, duration=None):
+        """
+        Listen on host:port and tick until stop() is called or, if given,
+        duration seconds have passed.
+        """
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        self._stopped = asyncio.Event()
+        period = 1.0 / self.tick_rate
+        start = previous = time.perf_counter()
+        next_tick = start + period
+        try:
+            while not self._stopped.is_set():
+                if duration is not None and time.perf_counter() - start >= duration:
+                    break
+                wait = next_tick - time.perf_counter()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._stopped.wait(), wait)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+                now = time.perf_counter()
+                if now - next_tick > period:
+                    self.counters["late_ticks"] += 1
+                # fall behind rather than run a burst of catch-up ticks
+                next_tick = max(next_tick + period, now)
+                self.step(now, now - previous)
+                previous = now
+                await asyncio.sleep(0)  # let datagrams in between ticks
+        finally:
+            transport.close()
+            self.transport = None
+
+    def stop(self):
+        """Make serve() return after the current tick."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Ticks, open rooms, counters and the tick span timings.
+        """
+        return {
+            "ticks": self.tick,
+            "rooms": len(self.rooms),
+            **self.counters,
+            "timings": self.profiler.stats(),
+        }
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
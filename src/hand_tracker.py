@@ -1,5 +1,28 @@
+import threading
+
 import cv2
-import mediapipe as mp
+import numpy as np
+
+from src.instrumentation import NULL_PROFILER, profiled
+from src.landmark_cache import results_to_arrays
+
+
+# index of the index-finger tip among the 21 hand landmarks
+# (mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP)
+INDEX_FINGER_TIP = 8
+
+
+def import_mediapipe():
+    """
+    Import MediaPipe on first use (it takes seconds), so code that never
+    runs inference never pays for it.
+
+    Returns:
+        module: The mediapipe package.
+    """
+    import mediapipe as mp
+
+    return mp
 
 
 class HandTracker:
@@ -12,33 +35,186 @@ class HandTracker:
         maxHands (int): Maximum number of hands to detect.
         detectionCon (float): Minimum confidence for initial detection.
         trackCon (float): Minimum confidence for tracking landmarks.
-        hands: The MediaPipe Hands object.
+        model_complexity (int): MediaPipe hand landmark model, 0 (lite,
+            faster) or 1 (full).
+        inference_scale (float): Factor applied to the image before it is
+            handed to MediaPipe (1.0 = full resolution).
+        roi (bool): If True, only the region around the last known hands is
+            processed while all expected hands are being tracked. In video
+            mode MediaPipe tracks hands from one image to the next in the
+            coordinates of the image it is given, so its graph is reset
+            whenever the region moves or changes size: the next frame then
+            runs palm detection again instead of tracking. The region is
+            kept stable for that reason (see _update_roi); roi pays off
+            best with mode=True, where every frame is detected anyway.
+        roi_margin (float): Padding around the hands' bounding box, as a
+            fraction of its larger side.
+        roi_box (tuple or None): Current (x1, y1, x2, y2) region of interest
+            in frame pixels, or None when the full frame is processed.
+        cache (LandmarkCache or None): Landmark cache consulted in static
+            image mode (without roi) before running MediaPipe.
+        mirror (bool): Frames are unmirrored camera images and the results
+            are mirrored in coordinate space instead (x -> 1 - x, Left and
+            Right swapped), as if the frame had been flipped horizontally.
+        allocations (int): Number of scratch images (RGB copy, downscaled
+            copy) allocated; they are reused while the frame size is stable.
+        profiler (Profiler): Records the "inference" and "landmarks" spans.
+        hands: The MediaPipe Hands object, created on first use.
+        mpHands: The MediaPipe Hands solution module.
         mpDraw: Utility for drawing landmarks & connections.
         results: Storage for the latest detection results.
     """
 
-    def __init__(self, mode=False, maxHands=1, detectionCon=0.7, trackCon=0.7):
+    def __init__(self, mode=False, maxHands=1, detectionCon=0.7, trackCon=0.7,
+                 inference_scale=1.0, roi=False, roi_margin=0.5, cache=None, mirror=False,
+                 profiler=None, model_complexity=1):
         """
         Configure the MediaPipe Hands solution.
+
+        MediaPipe is only imported, and the model only loaded, by the
+        first frame that needs inference (or by load() or warm_up()), so
+        frames answered by the cache never load it.
         """
         self.mode = mode
         self.maxHands = maxHands
         self.detectionCon = detectionCon
         self.trackCon = trackCon
+        self.model_complexity = model_complexity
+        self.inference_scale = inference_scale
+        self.roi = roi
+        self.roi_margin = roi_margin
+        self.roi_box = None
+        self._processed_box = None
+        self.cache = cache
+        self.mirror = mirror
+        self.profiler = profiler or NULL_PROFILER
+        self.allocations = 0
+        self._scratch = {}
+        self.results = None
+        self._landmarks = None
+        self._pending = {}
+        self._pending_lock = threading.Lock()
 
-        self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(
-            static_image_mode=self.mode,
-            max_num_hands=self.maxHands,
-            min_detection_confidence=self.detectionCon,
-            min_tracking_confidence=self.trackCon,
-        )
-        self.mpDraw = mp.solutions.drawing_utils
+        self._hands = None
+
+    @property
+    def mpHands(self):
+        return import_mediapipe().solutions.hands
+
+    @property
+    def mpDraw(self):
+        return import_mediapipe().solutions.drawing_utils
+
+    @property
+    def hands(self):
+        if self._hands is None:
+            self.load()
+        return self._hands
+
+    @property
+    def loaded(self):
+        """True if the model is loaded."""
+        return self._hands is not None
+
+    def load(self):
+        """
+        Import MediaPipe and load the model now, instead of on the first
+        frame that needs it. Does nothing if the model is loaded.
+        """
+        if self._hands is None:
+            self._hands = self.mpHands.Hands(
+                static_image_mode=self.mode,
+                max_num_hands=self.maxHands,
+                min_detection_confidence=self.detectionCon,
+                min_tracking_confidence=self.trackCon,
+                model_complexity=self.model_complexity,
+            )
+
+    def cache_settings(self):
+        """Tracker settings that change the landmarks of a frame (cache key)."""
+        return (self.mode, self.maxHands, self.detectionCon, self.inference_scale, self.mirror,
+                self.model_complexity)
+
+    def configure(self, inference_scale=None, model_complexity=None):
+        """
+        Change quality settings while tracking (e.g. from a
+        QualityController). They take effect at the next find_hands() call,
+        on the thread running it, so this is safe while another thread
+        tracks (see FramePipeline). A new model_complexity reloads the model.
 
+        Args:
+            inference_scale (float or None): New inference_scale.
+            model_complexity (int or None): New model_complexity.
+        """
+        with self._pending_lock:
+            if inference_scale is not None:
+                self._pending["inference_scale"] = inference_scale
+            if model_complexity is not None:
+                self._pending["model_complexity"] = model_complexity
+
+    def _apply_pending(self):
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        self.inference_scale = pending.get("inference_scale", self.inference_scale)
+        complexity = pending.get("model_complexity", self.model_complexity)
+        if complexity != self.model_complexity:
+            self.model_complexity = complexity
+            self.close()  # reloaded with the new model on first use
+
+    def warm_up(self, frame_size=(1280, 720)):
+        """
+        Load the model (see load()) and run one inference on a blank frame,
+        so the first real frame does not pay for it. The results are
+        discarded.
+
+        Args:
+            frame_size (tuple): (width, height) of the frames to expect, so
+                the scratch buffers are allocated for that size.
+        """
+        width, height = frame_size
+        self._process(np.zeros((height, width, 3), dtype=np.uint8))
+        self.reset()
+
+    def reset(self):
+        """Forget the last results and region of interest (e.g. between rounds)."""
+        self.results = None
+        self._landmarks = None
+        self.roi_box = None
+
+    def close(self):
+        """Release the MediaPipe graph, if it was loaded."""
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
+
+    def _scratch_image(self, name, shape):
+        """A reusable image buffer, reallocated only when its shape changes."""
+        image = self._scratch.get(name)
+        if image is None or image.shape != shape:
+            image = self._scratch[name] = np.empty(shape, dtype=np.uint8)
+            self.allocations += 1
+        return image
+
+    def _cache_key(self, frame):
+        # video mode results depend on earlier frames, roi crops on earlier
+        # results: only plain static-image processing is cacheable
+        if self.cache is None or not self.mode or self.roi:
+            return None
+        return self.cache.key(frame, self.cache_settings())
+
+    @profiled("inference")
     def find_hands(self, frame, draw=True):
         """
         Process an image to detect hand landmarks.
 
+        Depending on inference_scale and roi, MediaPipe may only see a
+        downscaled crop of the frame; landmarks are always mapped back so
+        they are normalized to the full frame. With a cache, frames seen
+        before are answered without running MediaPipe. The RGB (and
+        downscaled) copies given to MediaPipe are written into reused
+        buffers. With mirror=True, draw=True draws the mirrored landmarks,
+        which line up with the mirrored display image, not with frame.
+
         Args:
             frame (np.ndarray): BGR image from OpenCV.
             draw (bool): Whether to overlay the landmark skeletons on the image.
@@ -46,16 +222,172 @@ class HandTracker:
         Returns:
             np.ndarray: The annotated frame (if draw=True) or original frame.
         """
-        imgRGB = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+        if self._pending:
+            self._apply_pending()
+        key = self._cache_key(frame)
+        cached = self.cache.get(key) if key is not None else None
+        if cached is not None:
+            self.results = cached
+        else:
+            self._process(frame)
+            if key is not None:
+                self.cache.put(key, self.results)
 
         if self.results.multi_hand_landmarks and draw:
             for handLms in self.results.multi_hand_landmarks:
+                if cached is not None:
+                    handLms = self._to_proto(handLms)
                 self.mpDraw.draw_landmarks(
                     frame, handLms, self.mpHands.HAND_CONNECTIONS
                 )
         return frame
 
+    def _process(self, frame):
+        """Run MediaPipe on the frame (or its region/downscaled copy)."""
+        h, w = frame.shape[:2]
+        box = self.roi_box if self.roi else None
+        if box is not None:
+            x1, y1, x2, y2 = box
+            image = frame[y1:y2, x1:x2]
+        else:
+            image = frame
+        if box != self._processed_box:
+            # the tracking prior of video mode is in the previous image's
+            # coordinates: start over with detection on the new region
+            if not self.mode and self._hands is not None:
+                self._hands.reset()
+            self._processed_box = box
+
+        if self.inference_scale != 1.0:
+            ih, iw = image.shape[:2]
+            size = (
+                max(1, int(iw * self.inference_scale)),
+                max(1, int(ih * self.inference_scale)),
+            )
+            small = self._scratch_image("small", (size[1], size[0]) + image.shape[2:])
+            image = cv2.resize(image, size, dst=small, interpolation=cv2.INTER_AREA)
+
+        imgRGB = cv2.cvtColor(
+            image, cv2.COLOR_BGR2RGB, dst=self._scratch_image("rgb", image.shape[:2] + (3,))
+        )
+        self.results = self.hands.process(imgRGB)
+
+        if box is not None and self.results.multi_hand_landmarks:
+            self._map_region_to_frame(box, w, h)
+        if self.roi:
+            self._update_roi(w, h)
+        if self.mirror and self.results.multi_hand_landmarks:
+            self._mirror_results()
+
+    def _mirror_results(self):
+        """Mirror the results horizontally, as if the frame had been flipped."""
+        for handLms in self.results.multi_hand_landmarks:
+            for lm in handLms.landmark:
+                lm.x = 1.0 - lm.x
+        for handedness in self.results.multi_handedness or []:
+            for classification in handedness.classification:
+                classification.label = "Right" if classification.label == "Left" else "Left"
+
+    @staticmethod
+    def _to_proto(hand):
+        """Convert cached landmarks to the protobuf drawing_utils expects."""
+        from mediapipe.framework.formats import landmark_pb2
+
+        return landmark_pb2.NormalizedLandmarkList(landmark=[
+            landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in hand.landmark
+        ])
+
+    def _map_region_to_frame(self, box, w, h):
+        """
+        Re-normalize landmarks detected in a crop to the full frame.
+
+        Args:
+            box (tuple): (x1, y1, x2, y2) crop that was processed.
+            w (int), h (int): Full frame dimensions.
+        """
+        x1, y1, x2, y2 = box
+        sx, sy = (x2 - x1) / w, (y2 - y1) / h
+        ox, oy = x1 / w, y1 / h
+        for handLms in self.results.multi_hand_landmarks:
+            for lm in handLms.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+
+    def _update_roi(self, w, h):
+        """
+        Choose the region to process on the next call.
+
+        The region is only narrowed while every expected hand is tracked,
+        so a hand entering the scene is still found, and it is only moved
+        when the hands approach its border, so MediaPipe sees a stable crop.
+
+        Args:
+            w (int), h (int): Full frame dimensions.
+        """
+        hands = self.results.multi_hand_landmarks
+        if not hands or len(hands) < self.maxHands:
+            self.roi_box = None  # tracking lost: widen back to the full frame
+            return
+
+        landmarks = results_to_arrays(self.results)[0].astype(np.float64)
+        hx1, hy1 = landmarks[:, :, :2].min(axis=(0, 1)) * (w, h)
+        hx2, hy2 = landmarks[:, :, :2].max(axis=(0, 1)) * (w, h)
+        pad = self.roi_margin * max(hx2 - hx1, hy2 - hy1)
+
+        if self.roi_box is not None:
+            x1, y1, x2, y2 = self.roi_box
+            slack = pad / 2
+            if (hx1 - x1 >= slack or x1 == 0) and (x2 - hx2 >= slack or x2 == w) \
+                    and (hy1 - y1 >= slack or y1 == 0) and (y2 - hy2 >= slack or y2 == h):
+                return  # hands comfortably inside the current region
+
+        # square region centered on the hands, clamped to the frame
+        side = max(hx2 - hx1, hy2 - hy1) + 2 * pad
+        cx, cy = (hx1 + hx2) / 2, (hy1 + hy2) / 2
+        x1 = int(max(0, cx - side / 2))
+        y1 = int(max(0, cy - side / 2))
+        x2 = int(min(w, cx + side / 2))
+        y2 = int(min(h, cy + side / 2))
+        if x2 - x1 >= w * 0.9 and y2 - y1 >= h * 0.9:
+            self.roi_box = None
+        else:
+            self.roi_box = (x1, y1, x2, y2)
+
+    def get_landmarks(self, frame):
+        """
+        Get all landmarks of all detected hands as arrays.
+
+        The landmarks are read from the results in one pass and scaled to
+        pixels in one vectorized step; the arrays are computed once per
+        find_hands call and shared by the other getters.
+
+        Args:
+            frame (np.ndarray): Used to obtain image dimensions.
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): float64 (n_hands, 21, 3)
+            landmarks in pixels (x, y, and z scaled like x), the handedness
+            label of each hand ("Left"/"Right") and its float32 score. No
+            hands before the first find_hands call and after reset().
+        """
+        h, w = frame.shape[:2]
+        cached = self._landmarks
+        if cached is not None and cached[0] is self.results and cached[1] == (w, h):
+            return cached[2]
+
+        if self.results is None:  # no frame tracked since creation or reset()
+            normalized, labels, scores = np.empty((0, 21, 3), dtype=np.float32), [], []
+        else:
+            normalized, labels, scores = results_to_arrays(self.results)
+        landmarks = normalized.astype(np.float64) * np.array([w, h, w], dtype=np.float64)
+        value = (
+            landmarks,
+            np.array(labels, dtype="<U5"),
+            np.array(scores, dtype=np.float32),
+        )
+        self._landmarks = (self.results, (w, h), value)
+        return value
+
     def get_index_finger_tip(self, frame):
         """
         Get the (x, y) pixel coordinates of the first detected index-finger tip.
@@ -66,12 +398,10 @@ class HandTracker:
         Returns:
             (int, int) or (None, None): Coordinates of the tip, or None if no hand.
         """
-        h, w = frame.shape[:2]
-        if self.results.multi_hand_landmarks:
-            lm = self.results.multi_hand_landmarks[0].landmark[
-                self.mpHands.HandLandmark.INDEX_FINGER_TIP
-            ]
-            return int(lm.x * w), int(lm.y * h)
+        landmarks, _, _ = self.get_landmarks(frame)
+        if len(landmarks):
+            x, y = landmarks[0, INDEX_FINGER_TIP, :2].tolist()
+            return int(x), int(y)
         return None, None
 
     def get_index_finger_tips_by_handedness(self, frame):
@@ -84,18 +414,37 @@ class HandTracker:
         Returns:
             dict: {"Left": (x, y), "Right": (x, y)}, keys only for detected hands.
         """
-        tips = {}
-        h, w = frame.shape[:2]
-        if not (self.results.multi_hand_landmarks and self.results.multi_handedness):
-            return tips
-
-        for handLms, handedness in zip(
-            self.results.multi_hand_landmarks, self.results.multi_handedness
-        ):
-            label = handedness.classification[0].label  # "Left" or "Right"
-            lm = handLms.landmark[self.mpHands.HandLandmark.INDEX_FINGER_TIP]
-            tips[label] = (int(lm.x * w), int(lm.y * h))
-        return tips
+        landmarks, handedness, _ = self.get_landmarks(frame)
+        if not len(landmarks) or not len(handedness):
+            return {}
+        tips = landmarks[:, INDEX_FINGER_TIP, :2].tolist()
+        return {
+            label: (int(x), int(y)) for label, (x, y) in zip(handedness.tolist(), tips)
+        }
+
+    @profiled("landmarks")
+    def get_player_tips(self, frame, players):
+        """
+        Get the index-finger tip of every player, in player order.
+
+        Solo games use the first detected hand; two-player games assign
+        the "Left" hand to player 1 and the "Right" hand to player 2.
+
+        Args:
+            frame (np.ndarray): Used to obtain image dimensions.
+            players (int): Number of players (1 or 2).
+
+        Returns:
+            List[Tuple[int|None, int|None]]: One (x, y) per player,
+            (None, None) for players whose hand wasn't detected.
+        """
+        if players == 2:
+            by_hand = self.get_index_finger_tips_by_handedness(frame)
+            return [
+                by_hand.get("Left", (None, None)),
+                by_hand.get("Right", (None, None)),
+            ]
+        return [self.get_index_finger_tip(frame)]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,246 @@
+import json
+import os
+import sqlite3
+import time
+
+
+_SCHEMA_VERSION = 1
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS scores (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        score INTEGER NOT NULL,
+        mode TEXT NOT NULL,
+        created REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS scores_by_mode ON scores (mode, score DESC, created)",
+    "CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, created)",
+    "CREATE INDEX IF NOT EXISTS scores_by_time ON scores (created)",
+)
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+
+
+def mode_name(players):
+    """High score mode label of a player count."""
+    return "Solo" if players == 1 else "Two Players"
+
+
+class HighscoreStore:
+    """
+    High score history in an SQLite database.
+
+    Every score is kept. Top-N queries per mode and per time window use
+    indexes, so they stay fast as the history grows. The database runs in
+    WAL mode: each write is an atomic transaction that survives a crash,
+    readers never block the writer, and several processes (e.g. kiosks
+    sharing a disk) may write at once, waiting up to `timeout` seconds for
+    each other.
+
+    On first use, entries of the old JSON high score file are imported.
+
+    Attributes:
+        path (str): Database file.
+    """
+
+    def __init__(self, path="highscores.db", legacy_json=None, timeout=10.0):
+        """
+        Open (and create or migrate if needed) a high score database.
+
+        Args:
+            path (str): Database file.
+            legacy_json (str or None): JSON high score file whose entries are
+                imported when the database is created.
+            timeout (float): Seconds to wait for another writer.
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        try:
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # with WAL, NORMAL only risks the last commits on power loss, never corruption
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._migrate(legacy_json)
+        except BaseException:
+            self._conn.close()
+            raise
+
+    def _migrate(self, legacy_json):
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        with self._transaction():
+            # re-check under the write lock: another process may have won
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+                return
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            if legacy_json and os.path.exists(legacy_json):
+                self._import_json(legacy_json)
+            self._conn.execute(f"PRAGMA user_version={_SCHEMA_VERSION}")
+
+    def _import_json(self, path):
+        try:
+            with open(path) as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return
+        if not isinstance(entries, list):
+            return
+        rows = []
+        for entry in entries:
+            # a malformed entry is skipped; failing here would roll back
+            # the migration and fail again on every open
+            try:
+                name, score = str(entry["name"]), int(entry["score"])
+                mode = str(entry.get("mode", "Solo"))
+            except (KeyError, TypeError, ValueError, OverflowError, AttributeError):
+                continue
+            try:
+                created = time.mktime(time.strptime(entry["date"], DATE_FORMAT))
+            except (KeyError, TypeError, ValueError):
+                created = os.path.getmtime(path)
+            rows.append((name, score, mode, created))
+        self._conn.executemany(
+            "INSERT INTO scores (name, score, mode, created) VALUES (?, ?, ?, ?)", rows
+        )
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    def add(self, name, score, mode, created=None):
+        """
+        Record one score.
+
+        Args:
+            name (str): Player name.
+            score (int): Final score.
+            mode (str): Game mode, e.g. "Solo" (see mode_name).
+            created (float or None): Unix time; defaults to now.
+
+        Returns:
+            int: Id of the new entry.
+        """
+        return self.add_many([(name, score, mode)], created)[0]
+
+    def add_many(self, entries, created=None):
+        """
+        Record several scores (e.g. both players of a round) in one
+        transaction.
+
+        Args:
+            entries (Iterable[tuple]): (name, score, mode) of each score.
+            created (float or None): Unix time; defaults to now.
+
+        Returns:
+            List[int]: Ids of the new entries.
+        """
+        created = time.time() if created is None else created
+        ids = []
+        with self._transaction():
+            for name, score, mode in entries:
+                cursor = self._conn.execute(
+                    "INSERT INTO scores (name, score, mode, created) VALUES (?, ?, ?, ?)",
+                    (name, int(score), mode, created),
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def top(self, n=10, mode=None, since=None, until=None):
+        """
+        Best scores, highest first (earliest first among equal scores).
+
+        Args:
+            n (int): Number of entries.
+            mode (str or None): Only this mode; None for all modes.
+            since (float or None): Only scores made at or after this Unix time.
+            until (float or None): Only scores made before this Unix time.
+
+        Returns:
+            List[dict]: Entries with name, score, mode and date, the format
+            of the old JSON file.
+        """
+        where, params = self._filters(mode, since, until)
+        rows = self._conn.execute(
+            f"SELECT name, score, mode, created FROM scores {where} "
+            "ORDER BY score DESC, created LIMIT ?",
+            params + [n],
+        ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def history(self, mode=None, since=None, until=None, limit=None):
+        """
+        All recorded scores, newest first.
+
+        Args:
+            mode (str or None), since (float or None), until (float or None):
+                Filters, see top().
+            limit (int or None): Maximum number of entries.
+
+        Returns:
+            List[dict]: Entries like top().
+        """
+        where, params = self._filters(mode, since, until)
+        rows = self._conn.execute(
+            f"SELECT name, score, mode, created FROM scores {where} "
+            "ORDER BY created DESC, id DESC LIMIT ?",
+            params + [-1 if limit is None else limit],
+        ).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def count(self):
+        """Number of recorded scores."""
+        return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    @staticmethod
+    def _filters(mode, since, until):
+        clauses, params = [], []
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        if since is not None:
+            clauses.append("created >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created < ?")
+            params.append(until)
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def _entry(row):
+        return {
+            "name": row["name"],
+            "score": row["score"],
+            "mode": row["mode"],
+            "date": time.strftime(DATE_FORMAT, time.localtime(row["created"])),
+        }
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class _Transaction:
+    """Write transaction that takes the database lock up front."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __enter__(self):
+        # IMMEDIATE: wait for other writers now rather than fail on commit
+        self._conn.execute("BEGIN IMMEDIATE")
+        return self._conn
+
+    def __exit__(self, exc_type, *exc):
+        self._conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
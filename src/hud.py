@@ -0,0 +1,231 @@
+import cv2
+import numpy as np
+
+
+class HudElement:
+    """
+    One HUD text element, rendered into a small sprite + mask that is only
+    rebuilt when its content or style changes.
+
+    Attributes:
+        key (tuple): Everything the rendered sprite depends on.
+        sprite (np.ndarray): BGR pixels of the element.
+        mask (np.ndarray): uint8 mask, non-zero where sprite pixels are drawn.
+        x (int), y (int): Top-left corner of the sprite in frame pixels.
+        hits (int), misses (int): Reuse statistics for this element.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.sprite = None
+        self.mask = None
+        self.x = 0
+        self.y = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key):
+        """
+        Draw the element with cv2.putText into its own sprite and mask.
+
+        Args:
+            key (tuple): (text, org, color, font, scale, thickness,
+                background, padding, align), see Hud.text.
+        """
+        text, org, color, font, scale, thickness, background, padding, align = key
+        (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+
+        # text origin (baseline-left) in frame coordinates
+        ox = org[0] - tw // 2 if align == "center" else org[0]
+        oy = org[1]
+
+        if background is not None:
+            pad_x, pad_top, pad_bottom = padding
+            x1, y1 = ox - pad_x, oy - pad_top
+            x2, y2 = ox + tw + pad_x, oy + pad_bottom
+        else:
+            x1, y1 = ox - thickness, oy - th - thickness
+            x2, y2 = ox + tw + thickness, oy + baseline + thickness
+
+        w, h = x2 - x1 + 1, y2 - y1 + 1
+        sprite = np.zeros((h, w, 3), dtype=np.uint8)
+        mask = np.zeros((h, w), dtype=np.uint8)
+        if background is not None:
+            sprite[:] = background
+            mask[:] = 255
+        local = (ox - x1, oy - y1)
+        cv2.putText(sprite, text, local, font, scale, color, thickness)
+        cv2.putText(mask, text, local, font, scale, 255, thickness)
+
+        self.key = key
+        self.sprite, self.mask = sprite, mask
+        self.x, self.y = x1, y1
+
+    def draw(self, frame):
+        """Copy the masked sprite into the frame, clipped to its borders."""
+        fh, fw = frame.shape[:2]
+        h, w = self.mask.shape
+        fx1, fy1 = max(self.x, 0), max(self.y, 0)
+        fx2, fy2 = min(self.x + w, fw), min(self.y + h, fh)
+        if fx1 >= fx2 or fy1 >= fy2:
+            return
+        sx1, sy1 = fx1 - self.x, fy1 - self.y
+        sx2, sy2 = sx1 + (fx2 - fx1), sy1 + (fy2 - fy1)
+        cv2.copyTo(
+            self.sprite[sy1:sy2, sx1:sx2],
+            self.mask[sy1:sy2, sx1:sx2],
+            frame[fy1:fy2, fx1:fx2],
+        )
+
+
+class Hud:
+    """
+    Hud keeps the on-screen text (timer, scores, ...) as cached sprites.
+
+    Call text() for each element every frame; the element is only
+    re-rendered when one of its arguments changed. draw() then blits every
+    element with its mask, in the order they were first declared.
+
+    Attributes:
+        elements (dict): Element name -> HudElement.
+    """
+
+    def __init__(self, font=cv2.FONT_HERSHEY_SIMPLEX, scale=1, thickness=2):
+        """
+        Args:
+            font (int): Default OpenCV font face.
+            scale (float): Default font scale.
+            thickness (int): Default stroke thickness.
+        """
+        self.font = font
+        self.scale = scale
+        self.thickness = thickness
+        self.elements = {}
+
+    def text(self, name, text, org, color=(255, 255, 255), background=None,
+             padding=(10, 25, 10), align="left", scale=None, thickness=None):
+        """
+        Declare (or update) a text element.
+
+        Args:
+            name (str): Unique element name, e.g. "timer".
+            text (str): Text to show.
+            org (tuple): (x, y) of the text baseline, like cv2.putText. With
+                align="center", x is the horizontal center of the text.
+            color (tuple): BGR text color.
+            background (tuple or None): BGR fill of a box behind the text.
+            padding (tuple): (horizontal, above, below) box extent around
+                the text baseline; only used with a background.
+            align (str): "left" or "center".
+            scale (float or None): Font scale; defaults to the Hud's.
+            thickness (int or None): Stroke thickness; defaults to the Hud's.
+        """
+        element = self.elements.get(name)
+        if element is None:
+            element = self.elements[name] = HudElement()
+        key = (
+            text, tuple(org), tuple(color), self.font,
+            self.scale if scale is None else scale,
+            self.thickness if thickness is None else thickness,
+            None if background is None else tuple(background),
+            tuple(padding), align,
+        )
+        if key == element.key:
+            element.hits += 1
+        else:
+            element.misses += 1
+            element.render(key)
+
+    def remove(self, name):
+        """Stop drawing an element."""
+        self.elements.pop(name, None)
+
+    def draw(self, frame):
+        """
+        Blit all elements onto the frame.
+
+        Args:
+            frame (np.ndarray): BGR frame to draw on, modified in place.
+        """
+        for element in self.elements.values():
+            element.draw(frame)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Per-element and overall sprite cache hits, misses and hit rate.
+        """
+        report = {}
+        hits = misses = 0
+        for name, element in self.elements.items():
+            total = element.hits + element.misses
+            report[name] = {
+                "hits": element.hits,
+                "misses": element.misses,
+                "hit_rate": element.hits / total if total else 0.0,
+            }
+            hits += element.hits
+            misses += element.misses
+        report["total"] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+        return report
+
+
+def update_game_hud(hud, frame_width, scores, remaining_time, colors, scale=1.0):
+    """
+    Declare the Dot Hunter HUD: a centered countdown timer (red when ten
+    seconds or less remain) and one score per player.
+
+    Args:
+        hud (Hud): The HUD to update.
+        frame_width (int): Width of the frame the HUD is drawn on.
+        scores (List[int]): Score of each player.
+        remaining_time (int): Seconds left in the round.
+        colors (List[tuple]): BGR color of each player.
+        scale (float): Layout scale, for frames rendered below the game
+            resolution (use a Hud whose font scale matches).
+    """
+    minutes = remaining_time // 60
+    seconds = remaining_time % 60
+    line = int(round(40 * scale))
+    top = int(round(30 * scale))
+    padding = tuple(int(round(p * scale)) for p in (10, 25, 10))
+    hud.text(
+        "timer",
+        f"Time: {minutes:02d}:{seconds:02d}",
+        (frame_width // 2, top),
+        background=(0, 0, 255) if remaining_time <= 10 else (0, 0, 0),
+        padding=padding,
+        align="center",
+    )
+    if len(scores) == 1:
+        hud.text("score", f"Score: {scores[0]}", (int(round(10 * scale)), top), padding=padding)
+    else:
+        for i, score in enumerate(scores):
+            hud.text(
+                f"p{i + 1}", f"P{i + 1}: {score}", (int(round(10 * scale)), top + line * i),
+                colors[i], padding=padding,
+            )
+
+
+def game_hud_rect(frame_width, players):
+    """
+    Area covered by the HUD of update_game_hud, so game objects can be kept
+    out of it.
+
+    Args:
+        frame_width (int): Width of the frame the HUD is drawn on.
+        players (int): Number of players (one score line each).
+
+    Returns:
+        tuple: (x1, y1, x2, y2) in frame pixels.
+    """
+    return (0, 0, frame_width, 40 * max(1, players))
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,285 @@
+import csv
+import functools
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from src.hud import Hud
+
+
+def summarize(samples):
+    """
+    Summarize a list of durations (seconds) as milliseconds.
+
+    Returns:
+        dict: mean/p50/p95/p99/max in milliseconds.
+    """
+    if not samples:
+        return {}
+    ms = np.asarray(samples) * 1000.0
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+class _Span:
+    """Times one with-block and records it on exit."""
+
+    __slots__ = ("_samples", "_start")
+
+    def __init__(self, samples):
+        self._samples = samples
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._samples.append(time.perf_counter() - self._start)
+        return False
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Named timing spans with rolling windows, an on-screen overlay and
+    periodic export.
+
+        with profiler.span("inference"):
+            tracker.find_hands(frame)
+
+    Each span name keeps its last `window` durations, from which stats()
+    and histogram() are computed. While disabled, span() returns a shared
+    no-op context manager, so instrumented code costs one method call.
+    Spans may be recorded from several threads (e.g. the inference thread
+    of FramePipeline).
+
+    Attributes:
+        enabled (bool): Record spans.
+        overlay (bool): Draw the stats on the frame in draw_overlay().
+        window (int): Durations kept per span.
+        export_path (str or None): File written by maybe_export(); ".json"
+            is overwritten with the latest snapshot, ".jsonl" and ".csv"
+            get one snapshot appended per export.
+        export_interval (float): Seconds between two exports.
+    """
+
+    def __init__(self, enabled=True, window=600, export_path=None, export_interval=5.0):
+        """
+        Args:
+            enabled (bool): Start recording immediately.
+            window (int): Durations kept per span.
+            export_path (str or None): Periodic export target.
+            export_interval (float): Seconds between exports.
+        """
+        self.enabled = enabled
+        self.overlay = False
+        self.window = window
+        self.export_path = export_path
+        self.export_interval = export_interval
+        self._samples = {}
+        self._hud = Hud(scale=0.5, thickness=1)
+        self._overlay_lines = []
+        self._overlay_time = 0.0
+        self._last_export = time.perf_counter()
+
+    def span(self, name):
+        """
+        Context manager timing a block under this name.
+
+        Args:
+            name (str): Span name, e.g. "inference".
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        return _Span(samples)
+
+    def record(self, name, seconds):
+        """Add a duration measured elsewhere."""
+        if not self.enabled:
+            return
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def reset(self):
+        """Forget all recorded durations."""
+        self._samples = {}
+
+    def stats(self):
+        """
+        Returns:
+            dict: Span name -> count and mean/p50/p95/p99/max in
+            milliseconds over its rolling window, in first-use order.
+        """
+        report = {}
+        for name, samples in list(self._samples.items()):
+            samples = list(samples)
+            report[name] = dict(count=len(samples), **summarize(samples))
+        return report
+
+    def histogram(self, name, edges_ms=(0.5, 1, 2, 4, 8, 16, 33, 66, 133)):
+        """
+        Histogram of a span's rolling window.
+
+        Args:
+            name (str): Span name.
+            edges_ms (Iterable[float]): Upper bin edges in milliseconds; a
+                last bin collects everything slower.
+
+        Returns:
+            List[Tuple[float or None, int]]: (upper edge in ms, count) per
+            bin, None as the edge of the last bin.
+        """
+        ms = np.asarray(list(self._samples.get(name, ()))) * 1000.0
+        edges = np.asarray(edges_ms, dtype=np.float64)
+        counts = np.bincount(np.searchsorted(edges, ms), minlength=len(edges) + 1)
+        return list(zip(edges.tolist() + [None], counts.tolist()))
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Unix timestamp and the stats of every span.
+        """
+        return {"time": round(time.time(), 3), "spans": self.stats()}
+
+    def export(self, path=None):
+        """
+        Write the current stats to a JSON, JSON lines or CSV file.
+
+        Args:
+            path (str or None): Target file; defaults to export_path.
+        """
+        path = path or self.export_path
+        snapshot = self.snapshot()
+        if path.lower().endswith(".csv"):
+            fields = ["time", "span", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+            new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+            with open(path, "a", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                if new_file:
+                    writer.writeheader()
+                for name, stats in snapshot["spans"].items():
+                    writer.writerow(dict(time=snapshot["time"], span=name, **stats))
+        elif path.lower().endswith(".jsonl"):
+            with open(path, "a") as f:
+                f.write(json.dumps(snapshot) + "\n")
+        else:
+            with open(path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+
+    def maybe_export(self):
+        """Export if export_path is set and export_interval has elapsed."""
+        if self.export_path is None or not self.enabled:
+            return
+        now = time.perf_counter()
+        if now - self._last_export >= self.export_interval:
+            self._last_export = now
+            self.export()
+
+    def draw_overlay(self, frame, origin=(10, 130), refresh=0.5):
+        """
+        Draw the mean and p95 of every span onto the frame, if overlay is on.
+
+        The text is refreshed every `refresh` seconds so it stays readable,
+        and drawn through a Hud, so unchanged lines are not re-rendered.
+
+        Args:
+            frame (np.ndarray): BGR frame to draw on, modified in place.
+            origin (tuple): (x, y) of the first line's baseline.
+            refresh (float): Seconds between text updates.
+        """
+        if not self.overlay:
+            return
+        now = time.perf_counter()
+        if now - self._overlay_time >= refresh:
+            self._overlay_time = now
+            self._overlay_lines = [
+                f"{name:<11}{stats.get('mean_ms', 0):7.2f} ms  p95 {stats.get('p95_ms', 0):7.2f}"
+                for name, stats in self.stats().items()
+            ]
+            for i in range(len(self._overlay_lines), len(self._hud.elements)):
+                self._hud.remove(f"line{i}")
+            x, y = origin
+            for i, line in enumerate(self._overlay_lines):
+                self._hud.text(
+                    f"line{i}", line, (x, y + 18 * i), background=(0, 0, 0), padding=(4, 13, 5),
+                    color=(0, 255, 255),
+                )
+        self._hud.draw(frame)
+
+
+class _NullProfiler(Profiler):
+    """
+    A disabled profiler that cannot be turned on. It is shared as the
+    default of every instrumented object, so enabling it (or its overlay,
+    or export) would profile all of them at once; give the object its own
+    Profiler instead.
+    """
+
+    _frozen = ("enabled", "overlay", "export_path")
+
+    def __init__(self):
+        super().__init__(enabled=False)
+        self._ready = True
+
+    def __setattr__(self, name, value):
+        if name in self._frozen and getattr(self, "_ready", False):
+            raise AttributeError(
+                f"NULL_PROFILER is shared and cannot be changed; give the object its own "
+                f"Profiler to set {name}"
+            )
+        super().__setattr__(name, value)
+
+
+# shared disabled profiler, the default of every instrumented class
+NULL_PROFILER = _NullProfiler()
+
+
+def profiled(name):
+    """
+    Decorator timing a method as a span of its object's `profiler`.
+
+    Args:
+        name (str): Span name.
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.profiler.enabled:
+                return method(self, *args, **kwargs)
+            with self.profiler.span(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,334 @@
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+_MAGIC = b"LMK1"
+_HEADER = struct.Struct("<4sB")        # magic, number of hands
+_HAND = struct.Struct("<Bf")           # handedness (0 Left, 1 Right), score
+_LABELS = ("Left", "Right")
+_NUM_LANDMARKS = 21
+
+
+class Landmark:
+    """A normalized landmark, like MediaPipe's NormalizedLandmark."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+class LandmarkList:
+    """The landmarks of one hand, like MediaPipe's NormalizedLandmarkList."""
+
+    __slots__ = ("landmark",)
+
+    def __init__(self, landmark):
+        self.landmark = landmark
+
+
+class Classification:
+    """One handedness entry, like MediaPipe's Classification."""
+
+    __slots__ = ("index", "label", "score")
+
+    def __init__(self, index, label, score):
+        self.index, self.label, self.score = index, label, score
+
+
+class ClassificationList:
+    """Handedness of one hand, like MediaPipe's ClassificationList."""
+
+    __slots__ = ("classification",)
+
+    def __init__(self, classification):
+        self.classification = classification
+
+
+class CachedResults:
+    """
+    Stand-in for the results of MediaPipe Hands.process(), rebuilt from a
+    cache entry without MediaPipe. Only the fields HandTracker reads are
+    provided.
+
+    Attributes:
+        multi_hand_landmarks (List[LandmarkList] or None): None if no hand.
+        multi_handedness (List[ClassificationList] or None): None if no hand.
+        arrays (tuple): The (landmarks, handedness, scores) it was built
+            from, see results_to_arrays.
+    """
+
+    def __init__(self, landmarks, handedness, scores):
+        """
+        Args:
+            landmarks (np.ndarray): float32 (hands, 21, 3) normalized x, y, z.
+            handedness (List[str]): "Left" or "Right" for each hand.
+            scores (List[float]): Handedness score of each hand.
+        """
+        self.arrays = (landmarks, list(handedness), list(scores))
+        if not len(landmarks):
+            self.multi_hand_landmarks = None
+            self.multi_handedness = None
+            return
+        self.multi_hand_landmarks = [
+            LandmarkList([Landmark(x, y, z) for x, y, z in hand.tolist()])
+            for hand in landmarks
+        ]
+        self.multi_handedness = [
+            ClassificationList([Classification(_LABELS.index(label), label, score)])
+            for label, score in zip(handedness, scores)
+        ]
+
+
+def results_to_arrays(results):
+    """
+    Extract what the cache stores from hand-tracking results.
+
+    All landmarks of all hands are read in one pass into a flat array.
+
+    Args:
+        results: MediaPipe Hands results (or CachedResults).
+
+    Returns:
+        (np.ndarray, List[str], List[float]): float32 (hands, 21, 3)
+        normalized landmarks, handedness labels and handedness scores.
+    """
+    arrays = getattr(results, "arrays", None)
+    if arrays is not None:
+        return arrays
+    hands = results.multi_hand_landmarks or []
+    handedness = results.multi_handedness or []
+    landmarks = np.array(
+        [(lm.x, lm.y, lm.z) for hand in hands for lm in hand.landmark],
+        dtype=np.float32,
+    ).reshape(-1, _NUM_LANDMARKS, 3)
+    labels = [h.classification[0].label for h in handedness]
+    scores = [float(h.classification[0].score) for h in handedness]
+    return landmarks, labels, scores
+
+
+class LandmarkCache:
+    """
+    On-disk, content-addressed cache of hand landmarks.
+
+    Entries are keyed by a hash of the image pixels and the tracker settings
+    that change the result, and stored one small binary file each:
+
+        "LMK1", uint8 hands, then per hand uint8 handedness + float32
+        score, then float32 (hands, 21, 3) normalized landmarks.
+
+    A frame with no hand is cached too (zero hands). Files are written
+    atomically, so several processes may share a directory.
+
+    The total size of all entries in the directory is kept under max_bytes
+    by deleting the least recently used ones. The directory itself is the
+    shared bookkeeping: recency is the file modification time (refreshed
+    on every hit), and the sizes and recency of the entries of other
+    processes are only known after a rescan. A cache rescans before
+    trusting its own count, once the bytes it wrote since the last scan,
+    times the number of processes sharing the directory, could have
+    filled the cap. It then evicts down to low_water of the cap, so the
+    next rescan is some way off. Between scans, every process writes at
+    most its share of the room left, so the directory stays at or close to
+    the cap however many processes share it.
+
+    Attributes:
+        directory (str): Where entries are stored.
+        max_bytes (int): Size cap of all entries of all processes.
+        processes (int): Processes sharing the directory at most.
+        low_water (float): Fraction of max_bytes evictions go down to.
+        nbytes (int): Size of the entries at the last scan plus the ones
+            written by this process since.
+        hits (int), misses (int), evictions (int), scans (int): Statistics
+            of this process.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024, processes=1, low_water=0.9):
+        """
+        Args:
+            directory (str): Cache directory, created if missing.
+            max_bytes (int): Size cap in bytes.
+            processes (int): Number of processes writing to the directory
+                at the same time (e.g. pool workers).
+            low_water (float): Evictions free space down to this fraction
+                of max_bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.processes = max(1, processes)
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.scans = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        # key -> size, least recently used first
+        self._index = OrderedDict()
+        self.nbytes = 0
+        self._scanned = 0   # total size found by the last scan
+        self._written = 0   # bytes this process wrote since then
+        self._scan()
+
+    def _scan(self):
+        """Rebuild the index from the directory, the entries of all processes."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".lmk") and entry.is_file():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # evicted by another process meanwhile
+                entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        self._index.clear()
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+        self.nbytes = self._scanned = sum(size for _, _, size in entries)
+        self._written = 0
+        self.scans += 1
+
+    @staticmethod
+    def key(image, settings):
+        """
+        Content hash of an image and the settings it is processed with.
+
+        Args:
+            image (np.ndarray): The frame given to the tracker.
+            settings (tuple): Tracker settings that affect the landmarks.
+
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((image.shape, image.dtype.str, tuple(settings))).encode())
+        digest.update(np.ascontiguousarray(image).data)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".lmk")
+
+    def get(self, key):
+        """
+        Look up an entry.
+
+        Args:
+            key (str): Key from key().
+
+        Returns:
+            CachedResults or None: The cached results, None on a miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            data = None
+
+        entry = self._decode(data) if data else None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if key not in self._index:
+                self.nbytes += len(data)
+            self._index[key] = len(data)
+            self._index.move_to_end(key)
+        return CachedResults(*entry)
+
+    def put(self, key, results):
+        """
+        Store the landmarks and handedness of hand-tracking results.
+
+        Args:
+            key (str): Key from key().
+            results: MediaPipe Hands results.
+        """
+        landmarks, labels, scores = results_to_arrays(results)
+        parts = [_HEADER.pack(_MAGIC, len(landmarks))]
+        parts += [_HAND.pack(_LABELS.index(label), score) for label, score in zip(labels, scores)]
+        parts.append(landmarks.tobytes())
+        data = b"".join(parts)
+
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self.nbytes += len(data) - self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._written += len(data)
+            if self._scanned + self._written * self.processes > self.max_bytes:
+                self._scan()
+                self._evict()
+
+    def _decode(self, data):
+        if len(data) < _HEADER.size:
+            return None
+        magic, count = _HEADER.unpack_from(data)
+        expected = _HEADER.size + count * (_HAND.size + _NUM_LANDMARKS * 3 * 4)
+        if magic != _MAGIC or len(data) != expected:
+            return None  # foreign or truncated file: treat as a miss
+        labels, scores = [], []
+        offset = _HEADER.size
+        for _ in range(count):
+            side, score = _HAND.unpack_from(data, offset)
+            labels.append(_LABELS[side])
+            scores.append(score)
+            offset += _HAND.size
+        landmarks = np.frombuffer(data, dtype=np.float32, offset=offset)
+        return landmarks.reshape(count, _NUM_LANDMARKS, 3), labels, scores
+
+    def _evict(self):
+        # the newest entry always stays, even if it alone exceeds the cap
+        while self.nbytes > self.max_bytes * self.low_water and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass  # already removed by another process
+        self._scanned = self.nbytes
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            for key in self._index:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._index.clear()
+            self.nbytes = self._scanned = self._written = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Entry count, size on disk and hit/miss counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "scans": self.scans,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,201 @@
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+
+from src.game_server import (
+    GAME_OVER, JOIN, KEYFRAME, STATE, TIPS, decode, encode_join, encode_tips, pack_datagrams,
+)
+
+
+class _RoomMirror:
+    """Client-side copy of one room, rebuilt from keyframes and diffs."""
+
+    __slots__ = ("objects", "scores", "tick", "remaining", "phases", "joined_at", "done")
+
+    def __init__(self, players, rng):
+        self.objects = {}
+        self.scores = [0] * players
+        self.tick = -1
+        self.remaining = None
+        # each fingertip follows its own Lissajous curve over the frame
+        self.phases = [
+            (rng.uniform(0, 2 * math.pi), rng.uniform(0.3, 0.7), rng.uniform(0.4, 0.9))
+            for _ in range(players)
+        ]
+        self.joined_at = None
+        self.done = False
+
+
+class LoadClient(asyncio.DatagramProtocol):
+    """
+    Synthetic remote landmark clients for load-testing a GameServer.
+
+    Plays `rooms` rooms from one UDP socket: each room is joined, its
+    players' fingertips sweep the frame along Lissajous curves and are sent
+    `tip_rate` times per second (the TIPS records of all rooms packed into
+    shared datagrams), and the STATE records received are applied to a
+    local copy of each room. A diff removing an object the copy does not
+    have counts as a desync (e.g. after a lost datagram) until the next
+    keyframe. Finished games are joined again when rejoin is set.
+
+    Attributes:
+        room_ids (List[int]): Ids of the rooms played.
+        players (int): Players per room.
+        duration (int): Game length requested in JOIN, in seconds.
+        tip_rate (float): Fingertip updates per second and room.
+        frame_size (tuple): (width, height) of the server's game areas.
+        rejoin (bool): Start a new game when one ends.
+        counters (dict): Datagrams and bytes sent and received, states,
+            keyframes, stale (out of order) states, desyncs and finished games.
+    """
+
+    def __init__(self, rooms, players=1, duration=60, tip_rate=30.0, frame_size=(1280, 720),
+                 first_room=0, rejoin=True, seed=None):
+        """
+        Args:
+            rooms (int): Number of rooms.
+            players (int): Players per room.
+            duration (int): Game length in seconds.
+            tip_rate (float): Fingertip updates per second and room.
+            frame_size (tuple): (width, height) of the game areas.
+            first_room (int): Id of the first room; the others follow.
+            rejoin (bool): Join again when a game ends.
+            seed (int or None): Seed of the fingertip paths.
+        """
+        rng = random.Random(seed)
+        self.room_ids = list(range(first_room, first_room + rooms))
+        self.players = players
+        self.duration = duration
+        self.tip_rate = tip_rate
+        self.frame_size = tuple(frame_size)
+        self.rejoin = rejoin
+        self.counters = defaultdict(int)
+        self.transport = None
+        self._mirrors = {room: _RoomMirror(players, rng) for room in self.room_ids}
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.counters["datagrams_in"] += 1
+        self.counters["bytes_in"] += len(data)
+        try:
+            kind, records = decode(data)
+        except ValueError:
+            self.counters["malformed"] += 1
+            return
+        if kind != STATE:
+            return
+        for room, tick, flags, remaining, scores, removed, objects in records:
+            mirror = self._mirrors.get(room)
+            if mirror is None:
+                continue
+            self.counters["states"] += 1
+            if tick < mirror.tick and not flags & GAME_OVER:
+                self.counters["stale"] += 1
+                continue
+            mirror.tick = tick
+            mirror.remaining = remaining
+            mirror.scores = scores
+            if flags & KEYFRAME:
+                self.counters["keyframes"] += 1
+                mirror.objects = {}
+            for slot in removed:
+                if mirror.objects.pop(slot, None) is None:
+                    self.counters["desyncs"] += 1
+            for slot, type_id, x, y in objects:
+                mirror.objects[slot] = (type_id, x, y)
+            if flags & GAME_OVER:
+                self.counters["games_finished"] += 1
+                mirror.joined_at = None
+                mirror.remaining = None
+                mirror.done = not self.rejoin
+
+    def error_received(self, exc):
+        self.counters["errors"] += 1
+
+    def tips(self, room, now):
+        """Fingertip of every player of a room at time now."""
+        mirror = self._mirrors[room]
+        width, height = self.frame_size
+        return [
+            (
+                int(width / 2 + 0.45 * width * math.sin(fx * now + phase)),
+                int(height / 2 + 0.45 * height * math.sin(fy * now + 2 * phase)),
+            )
+            for phase, fx, fy in mirror.phases
+        ]
+
+    def _send(self, kind, records):
+        for datagram in pack_datagrams(kind, records):
+            self.transport.sendto(datagram)
+            self.counters["datagrams_out"] += 1
+            self.counters["bytes_out"] += len(datagram)
+
+    def send_updates(self, now):
+        """
+        Join the rooms not in a game (again if no state came back within a
+        second), and send the fingertips of the others.
+        """
+        joins, tips = [], []
+        for room, mirror in self._mirrors.items():
+            if mirror.done:
+                continue
+            if mirror.remaining is None:
+                if mirror.joined_at is None or now - mirror.joined_at > 1.0:
+                    joins.append(encode_join(room, self.players, self.duration))
+                    mirror.joined_at = now
+                continue
+            tips.append(encode_tips(room, self.tips(room, now)))
+        self._send(JOIN, joins)
+        self._send(TIPS, tips)
+
+    async def run(self, host="127.0.0.1", port=9999, duration=30.0):
+        """
+        Play for duration seconds against the server at host:port.
+
+        Returns:
+            dict: The counters, per second rates and the mean score.
+        """
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, remote_addr=(host, port)
+        )
+        period = 1.0 / self.tip_rate
+        start = time.perf_counter()
+        next_send = start
+        try:
+            while time.perf_counter() - start < duration:
+                self.send_updates(time.perf_counter())
+                next_send = max(next_send + period, time.perf_counter())
+                await asyncio.sleep(next_send - time.perf_counter())
+        finally:
+            transport.close()
+            self.transport = None
+        return self.stats(time.perf_counter() - start)
+
+    def stats(self, elapsed):
+        """
+        Args:
+            elapsed (float): Seconds played.
+
+        Returns:
+            dict: Counters, bytes per second and room, and the mean score.
+        """
+        rooms = len(self.room_ids)
+        scores = [score for mirror in self._mirrors.values() for score in mirror.scores]
+        return {
+            "rooms": rooms,
+            **self.counters,
+            "states_per_s": round(self.counters["states"] / elapsed, 1),
+            "bytes_in_per_room_s": round(self.counters["bytes_in"] / elapsed / rooms, 1),
+            "bytes_out_per_room_s": round(self.counters["bytes_out"] / elapsed / rooms, 1),
+            "mean_score": round(sum(scores) / len(scores), 2) if scores else None,
+        }
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,309 @@
+import math
+import multiprocessing
+import queue
+import time
+
+import cv2
+import numpy as np
+
+from src.frame_source import open_capture
+from src.hand_tracker import HandTracker
+
+
+def tile_layout(count, screen_size):
+    """
+    Split the screen into a grid of equally sized tiles, one per source.
+
+    Args:
+        count (int): Number of tiles.
+        screen_size (tuple): (width, height) of the screen.
+
+    Returns:
+        List[tuple]: (x, y, width, height) of each tile, row by row.
+    """
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    width, height = screen_size[0] // columns, screen_size[1] // rows
+    return [((i % columns) * width, (i // columns) * height, width, height) for i in range(count)]
+
+
+def uncovered_areas(count, screen_size):
+    """
+    Find the parts of the screen that no tile of tile_layout covers: the
+    empty cells of a partly filled last row and the strips left over when
+    the screen size does not divide evenly into the grid.
+
+    Args:
+        count (int): Number of tiles.
+        screen_size (tuple): (width, height) of the screen.
+
+    Returns:
+        List[tuple]: (x1, y1, x2, y2) of each uncovered area.
+    """
+    screen_w, screen_h = screen_size
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    width, height = screen_w // columns, screen_h // rows
+    grid_w, grid_h = columns * width, rows * height
+    last_row = count - (rows - 1) * columns
+    areas = [
+        (last_row * width, (rows - 1) * height, grid_w, grid_h),
+        (grid_w, 0, screen_w, screen_h),
+        (0, grid_h, grid_w, screen_h),
+    ]
+    return [(x1, y1, x2, y2) for x1, y1, x2, y2 in areas if x2 > x1 and y2 > y1]
+
+
+def _camera_worker(index, source, hands, tile_size, mirror, realtime, tracker_options,
+                   tile_buffer, tile_lock, results, stop):
+    """Capture and track one source, publishing tips and a preview tile."""
+    # one OpenCV thread per process; the processes provide the parallelism
+    cv2.setNumThreads(1)
+    # exit without waiting for the main process to take the last messages
+    results.cancel_join_thread()
+    cap = open_capture(source)
+    if not cap.isOpened():
+        results.put((index, "error", f"Could not open source: {source}", time.perf_counter()))
+        return
+    # video files are played at their own frame rate, like a camera
+    fps = cap.get(cv2.CAP_PROP_FPS) if realtime and not isinstance(source, int) else 0.0
+    period = 1.0 / fps if fps and fps > 0 else 0.0
+    tracker = HandTracker(
+        mode=False, maxHands=hands, detectionCon=0.7, trackCon=0.7, mirror=mirror,
+        **(tracker_options or {}),
+    )
+    width, height = tile_size
+    tile = np.frombuffer(tile_buffer, dtype=np.uint8).reshape(height, width, 3)
+
+    next_frame = time.perf_counter()
+    try:
+        while not stop.is_set():
+            if period:
+                wait = next_frame - time.perf_counter()
+                if wait > 0 and stop.wait(wait):
+                    break
+                next_frame = max(next_frame + period, time.perf_counter() - period)
+            ret, frame = cap.read()
+            if not ret:
+                results.put((index, "end", None, time.perf_counter()))
+                break
+            timestamp = time.perf_counter()
+            tracker.find_hands(frame, draw=False)
+            tips = tracker.get_player_tips(frame, hands)
+            frame_height, frame_width = frame.shape[:2]
+            tips = [
+                (x / frame_width, y / frame_height) if x is not None and y is not None
+                else (None, None)
+                for x, y in tips
+            ]
+            with tile_lock:
+                cv2.resize(frame, tile_size, dst=tile, interpolation=cv2.INTER_AREA)
+                if mirror:  # landmarks are mirrored by the tracker
+                    cv2.flip(tile, 1, dst=tile)
+            results.put((index, "tips", tips, timestamp))
+    except Exception as e:
+        results.put((index, "error", str(e), time.perf_counter()))
+    finally:
+        cap.release()
+        tracker.close()
+
+
+class MultiCamera:
+    """
+    Runs every camera source (webcam index or video file) in a worker
+    process of its own, with its own capture and HandTracker, and merges
+    their fingertip streams into one list of players.
+
+    Each source contributes `hands` players (1, or 2 told apart by
+    handedness like get_player_tips) and is shown in its own screen tile
+    (see tile_layout); its fingertips are mapped into that tile. Workers
+    send fingertips with the time.perf_counter() timestamp of their frame
+    and write a downscaled, mirrored preview straight into shared memory.
+    Since each source is tracked on its own core, players scale with cores
+    instead of sharing one inference call.
+
+    Attributes:
+        sources (list): The sources, in player order.
+        hands (int): Players per source.
+        players (int): Total number of players.
+        tiles (List[tuple]): (x, y, width, height) of each source's tile.
+        uncovered (List[tuple]): (x1, y1, x2, y2) screen areas outside every
+            tile (see uncovered_areas), cleared by render.
+        max_age (float): Seconds after which a source's last fingertips are
+            considered lost.
+        errors (dict): Source index -> error message of failed sources.
+        ended (set): Indices of sources that reached their end.
+    """
+
+    def __init__(self, sources, screen_size, hands=1, mirror=True, realtime=True,
+                 tracker_options=None, max_age=0.25):
+        """
+        Args:
+            sources (list): Webcam indices (int or digit strings) or video
+                file paths.
+            screen_size (tuple): (width, height) of the screen the tiles fill.
+            hands (int): Players per source (1 or 2).
+            mirror (bool): Mirror the previews and fingertips.
+            realtime (bool): Play video files at their frame rate instead of
+                as fast as they decode.
+            tracker_options (dict or None): Extra HandTracker keyword arguments.
+            max_age (float): Seconds before a silent source's tips expire.
+        """
+        self.sources = [int(s) if isinstance(s, str) and s.isdigit() else s for s in sources]
+        self.hands = hands
+        self.players = len(self.sources) * hands
+        self.tiles = tile_layout(len(self.sources), screen_size)
+        self.uncovered = uncovered_areas(len(self.sources), screen_size)
+        self.max_age = max_age
+        self.errors = {}
+        self.ended = set()
+
+        self._results = multiprocessing.Queue()
+        self._stop = multiprocessing.Event()
+        self._tile_buffers = []
+        self._tile_locks = []
+        self._processes = []
+        for index, (source, (_, _, width, height)) in enumerate(zip(self.sources, self.tiles)):
+            tile_buffer = multiprocessing.RawArray("B", width * height * 3)
+            tile_lock = multiprocessing.Lock()
+            self._tile_buffers.append(tile_buffer)
+            self._tile_locks.append(tile_lock)
+            self._processes.append(multiprocessing.Process(
+                target=_camera_worker,
+                args=(index, source, hands, (width, height), mirror, realtime, tracker_options,
+                      tile_buffer, tile_lock, self._results, self._stop),
+                name=f"camera-{index}",
+                daemon=True,
+            ))
+        self._latest = [[(None, None)] * hands for _ in self.sources]
+        self._timestamps = [None] * len(self.sources)
+        self._updates = [0] * len(self.sources)
+        self._latency = [0.0] * len(self.sources)
+        self._start = None
+
+    def start(self):
+        """Launch the worker processes."""
+        self._start = time.perf_counter()
+        for process in self._processes:
+            process.start()
+        return self
+
+    @property
+    def running(self):
+        """True while at least one source still delivers frames."""
+        return len(self.errors) + len(self.ended) < len(self.sources)
+
+    def poll(self, timeout=0.0):
+        """
+        Take the fingertip updates received since the last call.
+
+        Args:
+            timeout (float): Seconds to wait for a first update.
+
+        Returns:
+            List[list]: The merged tips of all players after each update, in
+            timestamp order (see tips()), so every intermediate position
+            can be tested for collisions.
+        """
+        messages = []
+        try:
+            messages.append(self._results.get(timeout=timeout) if timeout else
+                            self._results.get_nowait())
+            while True:
+                messages.append(self._results.get_nowait())
+        except queue.Empty:
+            pass
+
+        merged = []
+        now = time.perf_counter()
+        for index, kind, payload, timestamp in sorted(messages, key=lambda m: m[3]):
+            if kind == "error":
+                self.errors[index] = payload
+            elif kind == "end":
+                self.ended.add(index)
+            else:
+                x0, y0, width, height = self.tiles[index]
+                # clamped, so tips near the frame border stay in their tile
+                self._latest[index] = [
+                    (int(x0 + min(max(u, 0.0), 1.0) * (width - 1)),
+                     int(y0 + min(max(v, 0.0), 1.0) * (height - 1)))
+                    if u is not None else (None, None)
+                    for u, v in payload
+                ]
+                self._timestamps[index] = timestamp
+                self._updates[index] += 1
+                self._latency[index] = now - timestamp
+                merged.append(self.tips(timestamp))
+        return merged
+
+    def tips(self, now=None):
+        """
+        Args:
+            now (float or None): Reference time for expiring old tips;
+                defaults to the current time.
+
+        Returns:
+            List[Tuple[int|None, int|None]]: Screen position of every
+            player's fingertip, source by source, in the format of
+            HandTracker.get_player_tips.
+        """
+        now = time.perf_counter() if now is None else now
+        tips = []
+        for latest, timestamp in zip(self._latest, self._timestamps):
+            if timestamp is None or now - timestamp > self.max_age:
+                tips.extend([(None, None)] * self.hands)
+            else:
+                tips.extend(latest)
+        return tips
+
+    def render(self, screen):
+        """
+        Copy every source's latest preview into its tile of the screen and
+        clear the areas outside the tiles, so nothing drawn there on the
+        previous frame stays behind.
+
+        Args:
+            screen (np.ndarray): BGR screen image, modified in place.
+        """
+        for x1, y1, x2, y2 in self.uncovered:
+            screen[y1:y2, x1:x2] = 0
+        for (x, y, width, height), tile_buffer, tile_lock in zip(
+            self.tiles, self._tile_buffers, self._tile_locks
+        ):
+            tile = np.frombuffer(tile_buffer, dtype=np.uint8).reshape(height, width, 3)
+            with tile_lock:
+                screen[y:y + height, x:x + width] = tile
+
+    def stats(self):
+        """
+        Returns:
+            List[dict]: Per source: updates received, their rate, the latency
+            of the last one in milliseconds and its error if it failed.
+        """
+        elapsed = time.perf_counter() - self._start if self._start else 0.0
+        return [
+            {
+                "source": source,
+                "updates": updates,
+                "fps": round(updates / elapsed, 2) if elapsed > 0 else None,
+                "latency_ms": round(latency * 1000.0, 2),
+                "error": self.errors.get(index),
+            }
+            for index, (source, updates, latency) in enumerate(
+                zip(self.sources, self._updates, self._latency)
+            )
+        ]
+
+    def stop(self):
+        """Stop the workers and wait for them to exit."""
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self._results.close()
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
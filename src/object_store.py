@@ -0,0 +1,197 @@
+import numpy as np
+
+
+OBJECT_TYPES = ("coin", "bomb")
+TYPE_IDS = {name: i for i, name in enumerate(OBJECT_TYPES)}
+
+
+class ObjectStore:
+    """
+    Struct-of-arrays storage for game objects.
+
+    Every object occupies one slot (row) of a set of NumPy columns. Freed
+    slots go to a free list and are reused by the next spawn, so respawning
+    never allocates. Per-type counts are kept up to date on every add and
+    remove, and movement is one vectorized update over all slots.
+
+    Attributes:
+        x, y (np.ndarray): float64 center coordinates.
+        vx, vy (np.ndarray): float64 velocity in pixels per second.
+        type (np.ndarray): int8 index into OBJECT_TYPES.
+        radius (np.ndarray): float64 collision radius.
+        alive (np.ndarray): bool, True for occupied slots.
+        order (np.ndarray): int64 spawn sequence number; ordering live slots
+            by it gives the order objects were spawned in.
+        counts (np.ndarray): Number of live objects of each type.
+        changed (set or None): Slots added, removed or moved since the last
+            take_changes() call; None unless changes are tracked.
+        version (int): Incremented whenever objects are added, removed or
+            moved, so a cache of their positions knows when it is stale.
+    """
+
+    def __init__(self, capacity=16, track_changes=False):
+        """
+        Args:
+            capacity (int): Initial number of slots; grows by doubling.
+            track_changes (bool): Record changed slots in `changed`, e.g. to
+                send state diffs over the network.
+        """
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.type = np.zeros(capacity, dtype=np.int8)
+        self.radius = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.order = np.zeros(capacity, dtype=np.int64)
+        self.counts = np.zeros(len(OBJECT_TYPES), dtype=np.int64)
+        self._free = list(range(capacity - 1, -1, -1))
+        self._next_order = 0
+        self._ordered = None
+        self._moving = 0
+        self.version = 0
+        self.changed = set() if track_changes else None
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def _grow(self):
+        old = self.capacity
+        new = max(1, old * 2)
+        for name in ("x", "y", "vx", "vy", "type", "radius", "alive", "order"):
+            column = getattr(self, name)
+            grown = np.zeros(new, dtype=column.dtype)
+            grown[:old] = column
+            setattr(self, name, grown)
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def add(self, x, y, type_id, radius, vx=0.0, vy=0.0):
+        """
+        Place an object in a free slot.
+
+        Args:
+            x, y (float): Center coordinates.
+            type_id (int): Index into OBJECT_TYPES.
+            radius (float): Collision radius.
+            vx, vy (float): Velocity in pixels per second.
+
+        Returns:
+            int: The slot index.
+        """
+        if not self._free:
+            self._grow()
+        i = self._free.pop()
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.type[i] = type_id
+        self.radius[i] = radius
+        self.alive[i] = True
+        self.order[i] = self._next_order
+        self._next_order += 1
+        self.version += 1
+        self.counts[type_id] += 1
+        if vx or vy:
+            self._moving += 1
+        self._ordered = None
+        if self.changed is not None:
+            self.changed.add(i)
+        return i
+
+    def remove(self, i):
+        """
+        Free a slot so it can be reused.
+
+        Args:
+            i (int): Slot index of a live object.
+        """
+        if not self.alive[i]:
+            return
+        self.alive[i] = False
+        self.version += 1
+        self.counts[self.type[i]] -= 1
+        if self.vx[i] or self.vy[i]:
+            self._moving -= 1
+        self._free.append(i)
+        self._ordered = None
+        if self.changed is not None:
+            self.changed.add(i)
+
+    def clear(self):
+        """Remove every object."""
+        if self.changed is not None:
+            self.changed.update(np.flatnonzero(self.alive).tolist())
+        self.alive[:] = False
+        self.version += 1
+        self.counts[:] = 0
+        self._free = list(range(self.capacity - 1, -1, -1))
+        self._ordered = None
+        self._moving = 0
+
+    def count(self, type_id):
+        """Number of live objects of a type, in O(1)."""
+        return int(self.counts[type_id])
+
+    def take_changes(self):
+        """
+        Returns:
+            set: Slots added, removed or moved since the previous call (the
+            ones still alive need their current state sent, the others
+            their removal); empty unless changes are tracked.
+        """
+        if self.changed is None:
+            return set()
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def indices(self):
+        """
+        Slot indices of all live objects, in spawn order.
+
+        Returns:
+            np.ndarray: int64 slot indices (cached until the next add/remove).
+        """
+        if self._ordered is None:
+            live = np.flatnonzero(self.alive)
+            self._ordered = live[np.argsort(self.order[live], kind="stable")]
+        return self._ordered
+
+    def step(self, dt, width, height):
+        """
+        Move all objects by their velocity and bounce them off the borders
+        of a width x height area, keeping each object's circle inside it.
+
+        Args:
+            dt (float): Elapsed time in seconds.
+            width (int), height (int): Size of the play area.
+        """
+        if self._moving == 0:
+            return
+        self.version += 1
+        if self.changed is not None:
+            moving = self.alive & ((self.vx != 0) | (self.vy != 0))
+            self.changed.update(np.flatnonzero(moving).tolist())
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        for pos, vel, limit in ((self.x, self.vx, width), (self.y, self.vy, height)):
+            low = self.radius
+            high = limit - self.radius
+            under = pos < low
+            over = pos > high
+            pos[under] = 2 * low[under] - pos[under]
+            pos[over] = 2 * high[over] - pos[over]
+            # point the velocity back inside; an object already moving away
+            # from the border (e.g. just spawned across it) keeps its direction
+            vel[under] = np.abs(vel[under])
+            vel[over] = -np.abs(vel[over])
+            np.clip(pos, low, np.maximum(low, high), out=pos)
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,274 @@
+import threading
+import time
+
+import cv2
+
+from src.instrumentation import NULL_PROFILER
+
+
+class LatestSlot:
+    """
+    A single-value, thread-safe hand-off between two pipeline stages.
+
+    Producers overwrite whatever is currently stored, so a slow consumer
+    always receives the newest value and stale values are dropped instead
+    of queued.
+
+    Attributes:
+        dropped (int): Number of values overwritten before being taken.
+        closed (bool): True once close() has been called.
+    """
+
+    def __init__(self, on_drop=None):
+        """
+        Create an empty slot.
+
+        Args:
+            on_drop (callable or None): Called with every value that is
+                overwritten before being taken (e.g. to release its buffer).
+        """
+        self._cond = threading.Condition()
+        self._value = None
+        self._has_value = False
+        self._on_drop = on_drop
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, value):
+        """
+        Store a value, replacing (and dropping) any value not yet taken.
+
+        Args:
+            value: The value to publish.
+        """
+        with self._cond:
+            stale = self._value if self._has_value else None
+            if self._has_value:
+                self.dropped += 1
+            self._value = value
+            self._has_value = True
+            self._cond.notify_all()
+        if stale is not None and self._on_drop is not None:
+            self._on_drop(stale)
+
+    def take(self, timeout=None):
+        """
+        Wait for a value and remove it from the slot.
+
+        Args:
+            timeout (float or None): Maximum seconds to wait.
+
+        Returns:
+            The stored value, or None on timeout or when the slot is closed.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._has_value or self.closed, timeout
+            ):
+                return None
+            if not self._has_value:
+                return None
+            value = self._value
+            self._value = None
+            self._has_value = False
+            return value
+
+    def close(self):
+        """Wake up any waiting consumer and refuse to block from now on."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class FramePipeline:
+    """
+    FramePipeline runs capture and hand inference on background threads
+    so the render loop never waits on the camera or on MediaPipe.
+
+    Stages:
+        capture   -> reads and mirrors frames, keeps only the newest one.
+        inference -> runs HandTracker on the newest frame and extracts tips,
+                     at most once per inference_interval.
+        render    -> the caller, consuming results through read(), or every
+                     captured frame through read_frame() plus poll() when
+                     it renders faster than inference (see TipPredictor).
+
+    Frames and results carry the time.perf_counter() timestamp of their
+    capture.
+
+    With a BufferPool, frames are captured into pooled buffers that are
+    recycled instead of allocated. Frames returned by read() and
+    read_frame() then belong to the caller until it calls release(), and
+    frames dropped by the slots are released automatically.
+
+    Attributes:
+        cap: An opened cv2.VideoCapture (or any object with a read() method).
+        tracker (HandTracker): Tracker used exclusively by the inference stage.
+        players (int): Number of players whose tips are extracted.
+        inference_interval (float): Minimum seconds between inference runs.
+        frames (LatestSlot): Newest (frame, timestamp) for inference.
+        display (LatestSlot): Newest (frame, timestamp) for rendering.
+        results (LatestSlot): Newest (frame, tips, timestamp, hand_results)
+            inference result.
+        buffers (BufferPool or None): Pool the frames are captured into.
+        profiler (Profiler): Records the "capture" and "flip" spans.
+        error (str or None): Set when a stage stopped because of a failure.
+        hand_results: HandTracker.results behind the last result returned by
+            read() or poll() (e.g. to record all landmarks), or None.
+    """
+
+    def __init__(self, cap, tracker, players=1, mirror=True, inference_interval=0.0,
+                 buffers=None, profiler=None):
+        """
+        Prepare the stages; call start() to launch the worker threads.
+
+        Args:
+            cap: An opened capture object.
+            tracker (HandTracker): Hand tracker to run on captured frames.
+            players (int): Number of players (1 or 2).
+            mirror (bool): Flip frames horizontally before inference.
+            inference_interval (float): Minimum seconds between two inference
+                runs (e.g. 1/15 to cap MediaPipe at 15 FPS); 0 runs it as
+                often as possible.
+            buffers (BufferPool or None): Capture into recycled buffers
+                (mirroring is then done in place). Cheaper still is
+                mirror=False with HandTracker(mirror=True), which mirrors
+                in coordinate space, and a mirroring ScreenBuffer.
+            profiler (Profiler or None): Timing spans; disabled by default.
+        """
+        self.cap = cap
+        self.tracker = tracker
+        self.players = players
+        self.mirror = mirror
+        self.inference_interval = inference_interval
+        self.buffers = buffers
+        self.profiler = profiler or NULL_PROFILER
+        self.frames = LatestSlot(on_drop=self._release_item)
+        self.display = LatestSlot(on_drop=self._release_item)
+        self.results = LatestSlot(on_drop=self._release_item)
+        self.error = None
+        self.hand_results = None
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self._inference_loop, name="inference", daemon=True),
+        ]
+
+    def start(self):
+        """Launch the capture and inference threads."""
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def read(self, timeout=1.0):
+        """
+        Get the newest inference result.
+
+        Args:
+            timeout (float): Maximum seconds to wait for a new result.
+
+        Returns:
+            (np.ndarray, list) or None: The mirrored frame and the tips
+            for each player, or None if the pipeline stopped or timed out.
+        """
+        result = self.results.take(timeout)
+        if result is None:
+            return None
+        frame, tips, _, self.hand_results = result
+        return frame, tips
+
+    def read_frame(self, timeout=1.0):
+        """
+        Get the newest captured frame, whether or not it went through
+        inference.
+
+        Args:
+            timeout (float): Maximum seconds to wait for a new frame.
+
+        Returns:
+            (np.ndarray, float) or None: The mirrored frame and its capture
+            timestamp, or None if the pipeline stopped or timed out.
+        """
+        return self.display.take(timeout)
+
+    def poll(self):
+        """
+        Get the newest inference result without waiting.
+
+        Returns:
+            (list, float) or None: The tips for each player and the capture
+            timestamp of their frame, or None if there is no new result.
+        """
+        result = self.results.take(timeout=0)
+        if result is None:
+            return None
+        frame, tips, timestamp, self.hand_results = result
+        self.release(frame)
+        return tips, timestamp
+
+    def release(self, frame):
+        """
+        Give a frame obtained from read() or read_frame() back to the
+        buffer pool; does nothing without one.
+        """
+        if self.buffers is not None:
+            self.buffers.release(frame)
+
+    def _release_item(self, item):
+        self.release(item[0])
+
+    def stop(self):
+        """Stop all stages and wait for the worker threads to exit."""
+        self._stop.set()
+        self.frames.close()
+        self.display.close()
+        self.results.close()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+
+    def _capture_loop(self):
+        while not self._stop.is_set():
+            with self.profiler.span("capture"):
+                if self.buffers is not None:
+                    ret, frame = self.buffers.read(self.cap)
+                else:
+                    ret, frame = self.cap.read()
+            if not ret:
+                self.error = "Could not read frame from webcam."
+                break
+            timestamp = time.perf_counter()
+            if self.mirror:
+                with self.profiler.span("flip"):
+                    frame = cv2.flip(frame, 1, dst=frame if self.buffers is not None else None)
+            # inference does not draw on the frame, so both stages share it
+            # (one buffer reference each)
+            if self.buffers is not None:
+                self.buffers.retain(frame)
+            self.frames.put((frame, timestamp))
+            self.display.put((frame, timestamp))
+        self.frames.close()
+        self.display.close()
+
+    def _inference_loop(self):
+        next_run = 0.0
+        while not self._stop.is_set():
+            wait = next_run - time.perf_counter()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            item = self.frames.take(timeout=0.1)
+            if item is None:
+                if self.frames.closed:
+                    break
+                continue
+            next_run = time.perf_counter() + self.inference_interval
+            frame, timestamp = item
+            frame = self.tracker.find_hands(frame, draw=False)
+            tips = self.tracker.get_player_tips(frame, self.players)
+            self.results.put((frame, tips, timestamp, self.tracker.results))
+        self.results.close()
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
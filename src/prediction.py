@@ -0,0 +1,218 @@
+import math
+from collections import deque
+
+import numpy as np
+
+
+def _smoothing(cutoff, dt):
+    """Exponential smoothing factor of a low-pass filter with this cutoff (Hz)."""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter for a 2D point: a low-pass filter whose cutoff rises
+    with speed, so a still fingertip is smoothed (no jitter) while a fast
+    one follows with little lag. It also keeps a smoothed velocity, which
+    is what makes constant-velocity extrapolation possible.
+
+    Attributes:
+        min_cutoff (float): Cutoff in Hz when the point is still.
+        beta (float): How much the cutoff grows per pixel/second of speed.
+        d_cutoff (float): Cutoff in Hz of the velocity estimate.
+        position (np.ndarray or None): Filtered (x, y).
+        velocity (np.ndarray): Filtered (vx, vy) in pixels per second.
+        timestamp (float or None): Time of the last sample.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.5, d_cutoff=10.0):
+        """
+        Args:
+            min_cutoff (float): Cutoff in Hz at rest.
+            beta (float): Speed coefficient of the cutoff.
+            d_cutoff (float): Cutoff in Hz for the velocity.
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget the tracked point."""
+        self.position = None
+        self.velocity = np.zeros(2)
+        self.timestamp = None
+
+    def update(self, point, timestamp):
+        """
+        Add a measurement.
+
+        Args:
+            point (tuple): Measured (x, y).
+            timestamp (float): Time of the measurement in seconds.
+
+        Returns:
+            np.ndarray: The filtered position.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        if self.position is None:
+            self.position = point
+            self.timestamp = timestamp
+            return self.position
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.position
+
+        raw_velocity = (point - self.position) / dt
+        a = _smoothing(self.d_cutoff, dt)
+        self.velocity = self.velocity + a * (raw_velocity - self.velocity)
+        cutoff = self.min_cutoff + self.beta * float(np.hypot(*self.velocity))
+        a = _smoothing(cutoff, dt)
+        self.position = self.position + a * (point - self.position)
+        self.timestamp = timestamp
+        return self.position
+
+    def predict(self, timestamp, max_horizon=0.25):
+        """
+        Extrapolate the filtered position with the filtered velocity.
+
+        Args:
+            timestamp (float): Time to predict for.
+            max_horizon (float): Longest extrapolation in seconds; later
+                times reuse the position at the horizon.
+
+        Returns:
+            np.ndarray or None: Predicted (x, y), None if nothing tracked.
+        """
+        if self.position is None:
+            return None
+        horizon = min(max(timestamp - self.timestamp, 0.0), max_horizon)
+        return self.position + self.velocity * horizon
+
+
+class TipPredictor:
+    """
+    Predicts every player's fingertip between hand-tracking results, so
+    rendering and collisions can run faster than inference.
+
+    Each player slot of get_player_tips (the single hand, or the Left/Right
+    hands of the two-player mode) has its own OneEuroFilter. A slot whose
+    hand is lost is reset and predicts (None, None) until it is seen again.
+
+    Metrics (see stats()):
+        prediction error: distance between the position predicted for a
+            result's timestamp (before the result was known) and the
+            measured position; "hold" is the same for simply reusing the
+            last measurement, as a baseline.
+        inference interval: time between consecutive results.
+
+    Attributes:
+        players (int): Number of player slots.
+        filters (List[OneEuroFilter]): One filter per slot.
+        max_horizon (float): Longest extrapolation in seconds.
+    """
+
+    def __init__(self, players=1, min_cutoff=1.0, beta=0.5, d_cutoff=10.0,
+                 max_horizon=0.25, window=300):
+        """
+        Args:
+            players (int): Number of player slots.
+            min_cutoff (float), beta (float), d_cutoff (float): OneEuroFilter
+                parameters.
+            max_horizon (float): Longest extrapolation in seconds.
+            window (int): Number of recent samples kept for the metrics.
+        """
+        self.players = players
+        self.filters = [OneEuroFilter(min_cutoff, beta, d_cutoff) for _ in range(players)]
+        self.max_horizon = max_horizon
+        self._last_measured = [None] * players
+        self._last_timestamp = None
+        self._errors = deque(maxlen=window)
+        self._hold_errors = deque(maxlen=window)
+        self._intervals = deque(maxlen=window)
+
+    def update(self, tips, timestamp):
+        """
+        Feed a hand-tracking result.
+
+        Args:
+            tips (List[Tuple[int|None, int|None]]): Tip of each player slot,
+                as returned by HandTracker.get_player_tips.
+            timestamp (float): Capture time of the frame the tips come from.
+        """
+        if self._last_timestamp is not None and timestamp > self._last_timestamp:
+            self._intervals.append(timestamp - self._last_timestamp)
+        self._last_timestamp = timestamp
+
+        for i, tip in enumerate(tips[:self.players]):
+            filt = self.filters[i]
+            if tip[0] is None or tip[1] is None:
+                filt.reset()
+                self._last_measured[i] = None
+                continue
+            predicted = filt.predict(timestamp, self.max_horizon)
+            if predicted is not None:
+                self._errors.append(math.hypot(predicted[0] - tip[0], predicted[1] - tip[1]))
+                last = self._last_measured[i]
+                self._hold_errors.append(math.hypot(last[0] - tip[0], last[1] - tip[1]))
+            filt.update(tip, timestamp)
+            self._last_measured[i] = tip
+
+    def predict(self, timestamp):
+        """
+        Args:
+            timestamp (float): Time to predict for (e.g. capture time of
+                the frame being displayed).
+
+        Returns:
+            List[Tuple[int|None, int|None]]: Predicted tip of each player,
+            in the format of HandTracker.get_player_tips.
+        """
+        tips = []
+        for filt in self.filters:
+            point = filt.predict(timestamp, self.max_horizon)
+            if point is None:
+                tips.append((None, None))
+            else:
+                tips.append((int(round(point[0])), int(round(point[1]))))
+        return tips
+
+    def reset(self):
+        """Forget all tracked hands and metrics."""
+        for filt in self.filters:
+            filt.reset()
+        self._last_measured = [None] * self.players
+        self._last_timestamp = None
+        self._errors.clear()
+        self._hold_errors.clear()
+        self._intervals.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Prediction and hold errors in pixels (mean/p95/max) and the
+            inference interval in milliseconds with its rate.
+        """
+        def summary(values, scale=1.0):
+            if not values:
+                return None
+            values = np.asarray(values) * scale
+            return {
+                "mean": round(float(values.mean()), 2),
+                "p95": round(float(np.percentile(values, 95)), 2),
+                "max": round(float(values.max()), 2),
+            }
+
+        interval = summary(self._intervals, 1000.0)
+        return {
+            "prediction_error_px": summary(self._errors),
+            "hold_error_px": summary(self._hold_errors),
+            "inference_interval_ms": interval,
+            "inference_fps": round(1000.0 / interval["mean"], 2) if interval else None,
+        }
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,208 @@
+import time
+from collections import deque
+
+
+def _scale_steps(best, minimum, step=0.25):
+    """best, best - step, ... down to minimum (included)."""
+    steps = [best]
+    while steps[-1] - step >= minimum - 1e-9:
+        steps.append(round(steps[-1] - step, 2))
+    if steps[-1] > minimum:
+        steps.append(minimum)
+    return tuple(steps)
+
+
+def quality_knobs(inference_scale=1.0, min_inference_scale=0.5, min_render_scale=0.5,
+                  inference_interval=0.0, max_inference_interval=None, min_model_complexity=0):
+    """
+    The settings a QualityController may change, with their allowed values.
+
+    Args:
+        inference_scale (float): Best (starting) inference scale.
+        min_inference_scale (float): Lowest inference scale.
+        min_render_scale (float): Lowest render scale (frames are rendered
+            at this fraction of the screen resolution and scaled up by the
+            window).
+        inference_interval (float): Best (starting) seconds between inference
+            runs.
+        max_inference_interval (float or None): Longest interval; None keeps
+            the interval fixed (it only helps when fingertips are predicted
+            between inference results).
+        min_model_complexity (int): 0 allows the lite hand model, 1 keeps
+            the full one.
+
+    Returns:
+        List[Tuple[str, tuple]]: (setting, values from best to cheapest), in
+        the order they are given up.
+    """
+    knobs = []
+    if max_inference_interval is not None and max_inference_interval > inference_interval:
+        middle = (inference_interval + max_inference_interval) / 2
+        knobs.append(("inference_interval", (inference_interval, middle, max_inference_interval)))
+    knobs.append(("inference_scale", _scale_steps(inference_scale, min_inference_scale)))
+    knobs.append(("render_scale", _scale_steps(1.0, min_render_scale)))
+    knobs.append(("model_complexity", tuple(range(1, min_model_complexity - 1, -1))))
+    return [(name, values) for name, values in knobs if len(values) > 1]
+
+
+def quality_levels(knobs):
+    """
+    Order the combinations of knob values from best to cheapest, lowering
+    one knob by one step at a time, taking turns.
+
+    Args:
+        knobs (List[Tuple[str, tuple]]): See quality_knobs.
+
+    Returns:
+        List[dict]: Settings of every level; level 0 is the best.
+    """
+    steps = {name: 0 for name, _ in knobs}
+    levels = [{name: values[0] for name, values in knobs}]
+    lowered = True
+    while lowered:
+        lowered = False
+        for name, values in knobs:
+            if steps[name] + 1 < len(values):
+                steps[name] += 1
+                levels.append({n: v[steps[n]] for n, v in knobs})
+                lowered = True
+    return levels
+
+
+class QualityController:
+    """
+    Holds a target frame rate by stepping through quality levels (see
+    quality_levels): it lowers the quality when the frame rate stays below
+    the target and raises it again when it stays at the target.
+
+    Hysteresis keeps it from oscillating:
+        - the frame rate is averaged over `window` seconds, and no decision
+          is made until a full window was measured at the current level;
+        - quality is lowered below low * target but only raised at or
+          above high * target, after `raise_after` seconds;
+        - raising to a level that has to be left again within
+          `raise_after` seconds doubles the wait before that level is
+          tried again (up to max_backoff times).
+
+    Every change is logged.
+
+    Attributes:
+        target_fps (float): Frame rate to hold.
+        levels (List[dict]): Settings of every level, best first.
+        level (int): Current level.
+        changes (int): Number of level changes so far.
+    """
+
+    def __init__(self, target_fps, levels, level=0, window=1.0, low=0.9, high=0.97,
+                 raise_after=3.0, max_backoff=64, log=print):
+        """
+        Args:
+            target_fps (float): Frame rate to hold.
+            levels (List[dict]): Settings of every level, best first.
+            level (int): Starting level.
+            window (float): Seconds the frame rate is averaged over.
+            low (float): Lower quality below this fraction of the target.
+            high (float): Raise quality at or above this fraction of the target.
+            raise_after (float): Seconds at or above the target before the
+                quality is raised.
+            max_backoff (int): Largest multiple of raise_after waited before
+                retrying a level that failed.
+            log (callable or None): Called with a message on every change.
+        """
+        self.target_fps = target_fps
+        self.levels = levels
+        self.level = level
+        self.window = window
+        self.low = low
+        self.high = high
+        self.raise_after = raise_after
+        self.max_backoff = max_backoff
+        self.log = log
+        self.changes = 0
+        self._backoff = [1] * len(levels)
+        self._samples = deque()
+        self._total = 0.0
+        self._changed_at = None
+        self._good_since = None
+        self._raised_from = None
+
+    @property
+    def settings(self):
+        """Settings of the current level."""
+        return self.levels[self.level]
+
+    def fps(self):
+        """Average frame rate over the current window (None without samples)."""
+        return len(self._samples) / self._total if self._total > 0 else None
+
+    def reset(self):
+        """Forget the measurements (e.g. between rounds), keeping the level."""
+        self._samples.clear()
+        self._total = 0.0
+        self._changed_at = None
+        self._good_since = None
+
+    def update(self, frame_time, now=None):
+        """
+        Add the duration of a frame and decide whether to change level.
+
+        Args:
+            frame_time (float): Seconds the frame took.
+            now (float or None): Current time.perf_counter().
+
+        Returns:
+            dict or None: The new settings if the level changed.
+        """
+        now = time.perf_counter() if now is None else now
+        if self._changed_at is None:
+            self._changed_at = now
+        self._samples.append((now, frame_time))
+        self._total += frame_time
+        while self._samples and self._samples[0][0] < now - self.window:
+            self._total -= self._samples.popleft()[1]
+        if now - self._changed_at < self.window:
+            return None  # not a full window at this level yet
+
+        fps = self.fps()
+        if fps < self.low * self.target_fps:
+            self._good_since = None
+            if self.level + 1 < len(self.levels):
+                if self._raised_from is not None and now - self._changed_at < self.raise_after:
+                    # this level did not hold: wait longer before retrying it
+                    self._backoff[self.level] = min(self._backoff[self.level] * 2, self.max_backoff)
+                return self._change(self.level + 1, fps, now)
+        elif fps >= self.high * self.target_fps:
+            if self._good_since is None:
+                self._good_since = now
+            wait = self.raise_after * self._backoff[self.level - 1] if self.level > 0 else None
+            if wait is not None and now - self._good_since >= wait:
+                return self._change(self.level - 1, fps, now)
+        else:
+            self._good_since = None
+        return None
+
+    def _change(self, level, fps, now):
+        old = self.levels[self.level]
+        self._raised_from = self.level if level < self.level else None
+        self.level = level
+        self.changes += 1
+        self._samples.clear()
+        self._total = 0.0
+        self._changed_at = now
+        self._good_since = None
+        if self.log is not None:
+            diff = ", ".join(
+                f"{name} {old[name]:g} -> {value:g}"
+                for name, value in self.settings.items() if value != old[name]
+            )
+            direction = "up" if self._raised_from is not None else "down"
+            self.log(
+                f"Quality {direction} to level {level}/{len(self.levels) - 1}: {diff} "
+                f"({fps:.1f} FPS, target {self.target_fps:g})"
+            )
+        return self.settings
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
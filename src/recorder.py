@@ -0,0 +1,399 @@
+import json
+import os
+import queue
+import random
+import struct
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+from src.dot_game import CollectibleGame
+from src.landmark_cache import CachedResults, results_to_arrays
+
+
+MAX_HANDS = 2
+MAX_PLAYERS = 2
+MAX_CATCHES = 8
+NUM_LANDMARKS = 21
+HANDEDNESS = ("Left", "Right")
+# tip coordinate of a player whose hand was not detected
+NO_TIP = np.iinfo(np.int32).min
+
+_MAGIC = b"DHREC1\0\0"
+_HEADER = struct.Struct("<8sII")  # magic, offset of the first frame, frame size
+_ALIGN = 64
+
+CATCH_DTYPE = np.dtype([("player", "u1"), ("type", "u1"), ("x", "<i2"), ("y", "<i2")])
+FRAME_DTYPE = np.dtype([
+    ("time", "<f8"),                    # seconds since the round started
+    ("dt", "<f8"),                      # seconds the game was advanced by
+    ("remaining", "<i2"),               # seconds left on the timer
+    ("hands", "u1"),
+    ("handedness", "u1", (MAX_HANDS,)),  # index into HANDEDNESS
+    ("hand_scores", "<f4", (MAX_HANDS,)),
+    ("landmarks", "<f4", (MAX_HANDS, NUM_LANDMARKS, 3)),  # normalized x, y, z
+    ("tips", "<i4", (MAX_PLAYERS, 2)),  # as given to check_collisions
+    ("scores", "<i4", (MAX_PLAYERS,)),
+    ("catches", "u1"),                  # may exceed MAX_CATCHES; the rest are dropped
+    ("catch", CATCH_DTYPE, (MAX_CATCHES,)),
+])
+
+# landmark pairs drawn as the hand skeleton (mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (5, 9), (9, 10),
+    (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16), (13, 17), (0, 17),
+    (17, 18), (18, 19), (19, 20),
+)
+
+
+def snapshot_game(game):
+    """
+    Everything needed to rebuild a CollectibleGame in its current state:
+    its settings, objects, fingertip history and random generator states.
+
+    Args:
+        game (CollectibleGame): The game, e.g. at the start of a round.
+
+    Returns:
+        dict: JSON-serializable snapshot for game_from_snapshot.
+    """
+    store = game.store
+    indices = store.indices()
+    objects = np.column_stack([
+        store.x[indices], store.y[indices], store.type[indices], store.radius[indices],
+        store.vx[indices], store.vy[indices],
+    ])
+    return {
+        "frame_size": [game.frame_width, game.frame_height],
+        "players": game.players,
+        "max_coins": game.max_coins,
+        "max_bombs": game.max_bombs,
+        "object_size": list(game.object_size),
+        "object_speed": game.object_speed,
+        "spawn_spacing": game.spawner.min_distance,
+        "avoid_rects": [list(rect) for rect in game.avoid_rects],
+        "fingertip_clearance": game.fingertip_clearance,
+        "swept": game.swept,
+        "max_sweep": game.max_sweep,
+        "scores": list(game.scores),
+        "objects": objects.tolist(),
+        "tips": [list(tip) for tip in game._tips],
+        "previous_tips": [None if tip is None else list(tip) for tip in game._previous_tips],
+        "rng": game.rng.getstate(),
+        "spawner": game.spawner.rng.bit_generator.state,
+    }
+
+
+def game_from_snapshot(snapshot, profiler=None):
+    """
+    Rebuild a game from snapshot_game. Given the same fingertips and time
+    steps, it plays exactly like the original from that point on.
+
+    Args:
+        snapshot (dict): From snapshot_game (possibly through JSON).
+        profiler (Profiler or None): Timing spans of the new game.
+
+    Returns:
+        CollectibleGame: The game.
+    """
+    game = CollectibleGame(
+        *snapshot["frame_size"], players=snapshot["players"],
+        max_coins=snapshot["max_coins"], max_bombs=snapshot["max_bombs"],
+        object_size=tuple(snapshot["object_size"]), object_speed=snapshot["object_speed"],
+        spawn_spacing=snapshot["spawn_spacing"],
+        fingertip_clearance=snapshot["fingertip_clearance"], swept=snapshot["swept"],
+        max_sweep=snapshot["max_sweep"], profiler=profiler, rng=0,
+    )
+    # stored already expanded by half an object
+    game.avoid_rects = [tuple(rect) for rect in snapshot["avoid_rects"]]
+    game.scores = list(snapshot["scores"])
+    game.store.clear()
+    for x, y, type_id, radius, vx, vy in snapshot["objects"]:
+        game.store.add(x, y, int(type_id), radius, vx, vy)
+    game._tips = [tuple(tip) for tip in snapshot["tips"]]
+    game._previous_tips = [
+        None if tip is None else tuple(tip) for tip in snapshot["previous_tips"]
+    ]
+    version, state, gauss = snapshot["rng"]
+    game.rng = random.Random()
+    game.rng.setstate((version, tuple(state), gauss))
+    game.spawner.rng.bit_generator.state = snapshot["spawner"]
+    return game
+
+
+class SessionRecorder:
+    """
+    Records the per-frame data of a live session to a binary file that can
+    be memory-mapped (see Recording).
+
+    The file holds a header and then one FRAME_DTYPE record per frame:
+
+        "DHREC1\\0\\0", uint32 offset of the first frame, uint32 frame size,
+        JSON metadata (UTF-8, padded to a multiple of 64 bytes), frames.
+
+    record() only copies the frame's values into a row of a preallocated
+    chunk; full chunks are written by a background thread, so the game loop
+    never waits on the disk. Written chunks are reused, and a new one is
+    only allocated when the disk falls behind. Every chunk is flushed, so
+    a crash loses at most the frames of the current chunk.
+
+    Attributes:
+        path (str): The file written.
+        metadata (dict): Stored in the header.
+        frames (int): Frames recorded.
+        bytes_written (int): Bytes written so far, header included.
+        allocations (int): Chunks allocated.
+        error (str or None): Set when writing failed; later chunks are
+            dropped.
+    """
+
+    def __init__(self, path, metadata, chunk_frames=256):
+        """
+        Args:
+            path (str): File to create (overwritten if it exists).
+            metadata (dict): JSON-serializable session information, e.g.
+                the player count and snapshot_game at the start.
+            chunk_frames (int): Frames per chunk written at once.
+        """
+        self.path = path
+        self.metadata = metadata
+        self.frames = 0
+        self.allocations = 0
+        self.error = None
+        self._chunk_frames = chunk_frames
+        self._blank = np.zeros((), dtype=FRAME_DTYPE)
+        self._free = deque()
+        self._chunk = self._new_chunk()
+        self._used = 0
+        self._hands = (None, (0, [], [], None))  # last hand results and their arrays
+        self._queue = queue.Queue()
+
+        text = json.dumps(metadata).encode()
+        offset = -(-(_HEADER.size + len(text)) // _ALIGN) * _ALIGN
+        header = _HEADER.pack(_MAGIC, offset, FRAME_DTYPE.itemsize) + text
+        self._file = open(path, "wb")
+        self._file.write(header.ljust(offset, b" "))
+        self._file.flush()
+        self.bytes_written = offset
+        self._thread = threading.Thread(target=self._write_loop, name="recorder", daemon=True)
+        self._thread.start()
+
+    def _new_chunk(self):
+        self.allocations += 1
+        return np.zeros(self._chunk_frames, dtype=FRAME_DTYPE)
+
+    def _hand_arrays(self, hand_results):
+        """Hand count, handedness ids, scores and landmarks, converted once per result."""
+        if hand_results is not self._hands[0]:
+            if hand_results is None:
+                arrays = (0, [], [], None)
+            else:
+                landmarks, labels, scores = results_to_arrays(hand_results)
+                hands = min(len(landmarks), MAX_HANDS)
+                arrays = (hands, [HANDEDNESS.index(label) for label in labels[:hands]],
+                          scores[:hands], landmarks[:hands])
+            self._hands = (hand_results, arrays)
+        return self._hands[1]
+
+    def record(self, timestamp, dt, remaining, hand_results, tips, scores, catches=()):
+        """
+        Record one frame.
+
+        Args:
+            timestamp (float): Seconds since the round started.
+            dt (float): Seconds the game was advanced by (CollectibleGame.update).
+            remaining (int): Seconds left on the timer.
+            hand_results: HandTracker.results of the frame (MediaPipe results
+                or CachedResults), or None.
+            tips (List[tuple]): Fingertips given to check_collisions.
+            scores (List[int]): Scores after check_collisions.
+            catches (Iterable[tuple]): CollectibleGame.last_catches.
+        """
+        self._chunk[self._used] = self._blank
+        row = self._chunk[self._used]
+        row["time"] = timestamp
+        row["dt"] = dt
+        row["remaining"] = remaining
+        hands, handedness, hand_scores, landmarks = self._hand_arrays(hand_results)
+        if hands:
+            row["hands"] = hands
+            row["handedness"][:hands] = handedness
+            row["hand_scores"][:hands] = hand_scores
+            row["landmarks"][:hands] = landmarks
+        row["tips"][:len(tips)] = [
+            (NO_TIP, NO_TIP) if x is None or y is None else (x, y) for x, y in tips
+        ]
+        row["scores"][:len(scores)] = scores
+        catches = list(catches)
+        row["catches"] = min(len(catches), 255)
+        for i, (player, type_id, x, y) in enumerate(catches[:MAX_CATCHES]):
+            row["catch"][i] = (player, type_id, int(x), int(y))
+
+        self.frames += 1
+        self._used += 1
+        if self._used == self._chunk_frames:
+            self._submit()
+
+    def _submit(self):
+        self._queue.put((self._chunk, self._used))
+        self._chunk = self._free.pop() if self._free else self._new_chunk()
+        self._used = 0
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            chunk, used = item
+            if self.error is None:
+                try:
+                    self._file.write(chunk[:used].view(np.uint8))
+                    self._file.flush()
+                    self.bytes_written += used * FRAME_DTYPE.itemsize
+                except OSError as e:
+                    self.error = str(e)
+            self._free.append(chunk)
+
+    def close(self):
+        """
+        Write the remaining frames and close the file.
+
+        Returns:
+            dict: See stats().
+        """
+        if self._used:
+            self._submit()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        return self.stats()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Path, frames and bytes recorded, chunks allocated and the
+            write error, if any.
+        """
+        return {
+            "path": self.path,
+            "frames": self.frames,
+            "bytes": self.bytes_written,
+            "chunks_allocated": self.allocations,
+            "error": self.error,
+        }
+
+
+class Recording:
+    """
+    A session recorded by SessionRecorder, memory-mapped: frames are only
+    read from disk when accessed. A truncated last frame (e.g. after a
+    crash) is ignored.
+
+    Attributes:
+        path (str): The file.
+        metadata (dict): The header metadata.
+        frames (np.ndarray): FRAME_DTYPE records, one per frame (a read-only
+            memory map).
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): A file written by SessionRecorder.
+
+        Raises:
+            ValueError: If the file is not a recording of this format.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"Not a session recording: {path}")
+            magic, offset, frame_size = _HEADER.unpack(header)
+            if magic != _MAGIC or frame_size != FRAME_DTYPE.itemsize:
+                raise ValueError(f"Not a session recording of this version: {path}")
+            self.metadata = json.loads(f.read(offset - _HEADER.size))
+        count = (os.path.getsize(path) - offset) // frame_size
+        if count:
+            self.frames = np.memmap(path, dtype=FRAME_DTYPE, mode="r", offset=offset,
+                                    shape=(count,))
+        else:
+            self.frames = np.zeros(0, dtype=FRAME_DTYPE)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def tips(self, i):
+        """
+        Returns:
+            List[Tuple[int|None, int|None]]: Fingertips of frame i, in the
+            format of HandTracker.get_player_tips.
+        """
+        players = self.metadata["players"]
+        return [
+            (None, None) if x == NO_TIP else (x, y)
+            for x, y in self.frames[i]["tips"][:players].tolist()
+        ]
+
+    def scores(self, i):
+        """Scores after frame i."""
+        return self.frames[i]["scores"][:self.metadata["players"]].tolist()
+
+    def catches(self, i):
+        """
+        Returns:
+            List[tuple]: (player, type id, x, y) of the objects collected in
+            frame i, at most MAX_CATCHES.
+        """
+        frame = self.frames[i]
+        return [tuple(catch) for catch in frame["catch"][:frame["catches"]].tolist()]
+
+    def landmarks(self, i):
+        """
+        Returns:
+            np.ndarray: float32 (hands, 21, 3) normalized landmarks of frame i.
+        """
+        frame = self.frames[i]
+        return frame["landmarks"][:frame["hands"]]
+
+    def hand_results(self, i):
+        """
+        Returns:
+            CachedResults: The hand landmarks of frame i, usable as
+            HandTracker.results without MediaPipe.
+        """
+        frame = self.frames[i]
+        hands = int(frame["hands"])
+        return CachedResults(
+            np.array(frame["landmarks"][:hands]),
+            [HANDEDNESS[side] for side in frame["handedness"][:hands].tolist()],
+            frame["hand_scores"][:hands].tolist(),
+        )
+
+
+def draw_landmarks(frame, landmarks, color=(255, 255, 255), radius=3):
+    """
+    Draw hand skeletons from normalized landmarks, without MediaPipe.
+
+    Args:
+        frame (np.ndarray): BGR image, modified in place.
+        landmarks (np.ndarray): (hands, 21, 3) landmarks normalized to frame.
+        color (tuple): BGR color.
+        radius (int): Radius of the landmark dots.
+    """
+    if not len(landmarks):
+        return
+    h, w = frame.shape[:2]
+    points = (np.asarray(landmarks)[:, :, :2] * (w, h)).astype(np.int32)
+    pairs = np.array(HAND_CONNECTIONS)
+    segments = points[:, pairs].reshape(-1, 2, 2)
+    cv2.polylines(frame, list(segments), False, color, 2)
+    for x, y in points.reshape(-1, 2).tolist():
+        cv2.circle(frame, (x, y), radius, color, -1)
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,193 @@
+import time
+
+import cv2
+
+from src.hud import Hud, update_game_hud
+from src.instrumentation import NULL_PROFILER
+
+
+# fingertip and score color of each player (BGR)
+PLAYER_COLORS = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255), (0, 255, 255), (255, 0, 255), (255, 255, 0),
+]
+
+
+def open_game_window():
+    """
+    Create the fullscreen game window.
+
+    Returns:
+        str: Its name, unique to ensure fresh window creation.
+    """
+    window_name = f"Dot Hunter {int(time.time() * 1000)}"
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    # allow the window to initialize before setting fullscreen
+    cv2.waitKey(1)
+    cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+    return window_name
+
+
+def play_frame(frame, game, tips, dt, remaining_time, huds, render_scale=1.0, profiler=None):
+    """
+    Advance the game by one frame and draw it: the fingertips, the objects,
+    the collisions of the fingertips with them, then the timer and scores.
+
+    Args:
+        frame (np.ndarray): Frame to draw on, at render_scale of the game area.
+        game (CollectibleGame): The game.
+        tips (List[tuple]): Fingertip of each player in game coordinates,
+            (None, None) if not detected.
+        dt (float): Seconds since the previous frame.
+        remaining_time (int): Seconds left on the timer.
+        huds (dict): Hud per render scale, filled on first use.
+        render_scale (float): Size of the frame relative to the game area.
+        profiler (Profiler or None): Records the "hud" span.
+    """
+    profiler = profiler or NULL_PROFILER
+    colors = PLAYER_COLORS
+    for i, (x, y) in enumerate(tips):
+        if x is not None and y is not None:
+            center = (int(x * render_scale), int(y * render_scale))
+            cv2.circle(frame, center, max(2, int(7 * render_scale)), colors[i], -1)
+
+    game.update(dt)
+    game.draw_objects(frame, batch=True, scale=render_scale)
+    game.check_collisions(tips)
+
+    # Timer and scores are cached sprites, only re-rendered on change
+    with profiler.span("hud"):
+        hud = huds.get(render_scale)
+        if hud is None:
+            hud = huds[render_scale] = Hud(
+                scale=render_scale, thickness=max(1, round(2 * render_scale))
+            )
+        update_game_hud(
+            hud, frame.shape[1], game.scores, remaining_time, colors, scale=render_scale
+        )
+        hud.draw(frame)
+        profiler.draw_overlay(frame)
+
+
+class SessionResources:
+    """
+    The camera, hand trackers, display window and games of the real-time
+    game, kept alive across rounds.
+
+    Everything is created on first use: the camera and window once, a
+    tracker and a game per player count. Later rounds get the same objects
+    back, reset in place (see HandTracker.reset and CollectibleGame.reset),
+    so a new round starts without reopening the camera, reloading the
+    model or decoding assets. A window closed by the user is recreated.
+
+    Attributes:
+        window_name (str or None): Name of the current window.
+    """
+
+    def __init__(self, open_camera, make_tracker, make_game, warmup=None):
+        """
+        Args:
+            open_camera (callable): Opens and configures the capture.
+            make_tracker (callable): Creates a HandTracker for a player count.
+            make_game (callable): Creates a CollectibleGame for a player count.
+            warmup (Warmup or None): Background warm-up to take the camera
+                and the first trackers from.
+        """
+        self._open_camera = open_camera
+        self._make_tracker = make_tracker
+        self._make_game = make_game
+        self._warmup = warmup
+        self._cap = None
+        self._trackers = {}
+        self._games = {}
+        self.window_name = None
+
+    def ready(self, players):
+        """
+        True if a round with this many players needs no cold loading: the
+        camera is open and the tracker's model loaded, here or in the
+        warm-up (waiting for its background steps; a failed step is cold).
+        """
+        camera = self._cap is not None and self._cap.isOpened()
+        if not camera and self._warmup is not None:
+            camera = self._warmup.camera_ready()
+        tracker = self._trackers.get(players)
+        if tracker is not None:
+            warm = tracker.loaded
+        else:
+            warm = self._warmup is not None and self._warmup.tracker_ready(players)
+        return camera and warm
+
+    def capture(self):
+        """
+        Returns:
+            The opened capture (check isOpened()).
+        """
+        if self._cap is None or not self._cap.isOpened():
+            if self._cap is not None:
+                self._cap.release()
+            self._cap = self._warmup.capture() if self._warmup is not None else self._open_camera()
+        return self._cap
+
+    def tracker(self, players):
+        """
+        Returns:
+            HandTracker: The tracker for this player count, reset.
+        """
+        tracker = self._trackers.get(players)
+        if tracker is None:
+            if self._warmup is not None:
+                tracker = self._warmup.tracker(players)
+            else:
+                tracker = self._make_tracker(players)
+            self._trackers[players] = tracker
+        else:
+            tracker.reset()
+        return tracker
+
+    def game(self, players):
+        """
+        Returns:
+            CollectibleGame: The game for this player count, reset.
+        """
+        game = self._games.get(players)
+        if game is None:
+            game = self._games[players] = self._make_game(players)
+        else:
+            game.reset()
+        return game
+
+    def window(self):
+        """
+        Returns:
+            str: Name of the fullscreen window, created if it does not exist.
+        """
+        if self.window_name is not None:
+            try:
+                if cv2.getWindowProperty(self.window_name, cv2.WND_PROP_VISIBLE) >= 1:
+                    return self.window_name
+                cv2.destroyWindow(self.window_name)
+            except cv2.error:
+                pass  # already destroyed
+
+        self.window_name = open_game_window()
+        return self.window_name
+
+    def close(self):
+        """Release the camera, trackers and window."""
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        for tracker in self._trackers.values():
+            tracker.close()
+        self._trackers = {}
+        self._games = {}
+        if self._warmup is not None:
+            self._warmup.close()
+        self.window_name = None
+        cv2.destroyAllWindows()
+        cv2.waitKey(1)
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,309 @@
+import math
+
+import numpy as np
+
+
+# offsets of the grid cells that can hold a point closer than min_distance
+# when the cell size is min_distance / sqrt(2): the 5x5 block minus corners
+_NEIGHBORS = [
+    (dy, dx) for dy in range(-2, 3) for dx in range(-2, 3) if abs(dy) + abs(dx) < 4
+]
+
+
+class PoissonSpawner:
+    """
+    Places points in bulk with a guaranteed minimum spacing (Poisson-disk
+    sampling accelerated by a background grid).
+
+    The grid persists between calls: points placed by sample() stay in it,
+    and callers report the others with insert() and remove(), so a call
+    costs the same whatever the number of points already placed. Passing
+    `existing` to sample() rebuilds the grid from scratch instead.
+
+    Each round draws a batch of candidates, one in each of randomly chosen
+    grid cells that hold no point yet (uniform over the area not already
+    taken), snapped to whole pixels, and, fully vectorized:
+      1. drops candidates inside exclusion zones (circles and rectangles),
+      2. drops candidates closer than min_distance to an accepted point,
+         by looking up the 21 neighboring cells of the grid,
+      3. resolves conflicts between the surviving candidates themselves,
+         keeping a candidate only if no earlier candidate is too close.
+    Accepted candidates are written to the grid and the next round starts,
+    until enough points are placed or the rounds run out.
+
+    A round costs about 0.1-0.3 ms, so the cost depends on how close the
+    request comes to filling the area. Measured on 1920x1080 with 80 px
+    padding and 60 px spacing, where random placement saturates around
+    300 points: 100 points take about 0.35 ms and 150 about 0.45 ms, but
+    200 take about 1.6 ms, and 300 take about 3 ms and only about 250
+    are placed. At 40 px spacing, 300 points take about 1 ms. Adding one
+    point to a full area takes about 0.2 ms, and 100 at once about 3 ms,
+    at 10,000 points; what still grows with the area is the scan for
+    empty cells, once per round.
+
+    Attributes:
+        width (int), height (int): Size of the area.
+        min_distance (float): Minimum distance between any two points.
+        padding (int): Margin kept free along every edge.
+        rng (np.random.Generator): Source of randomness.
+        shortfall (int): Points requested by sample() calls but not placed
+            because the free area ran out, summed over all calls.
+        count (int): Number of points in the grid.
+    """
+
+    def __init__(self, width, height, min_distance, padding=0, rng=None):
+        """
+        Args:
+            width (int), height (int): Size of the area.
+            min_distance (float): Minimum distance between points.
+            padding (int): Margin kept free along every edge.
+            rng (np.random.Generator, int or None): Generator or seed.
+        """
+        self.width = width
+        self.height = height
+        self.min_distance = float(min_distance)
+        self.padding = padding
+        self.rng = np.random.default_rng(rng)
+
+        self._cell = self.min_distance / math.sqrt(2)
+        # grid cells cover [padding, size - padding]; two extra cells on every
+        # side make neighbor lookups free of bounds checks
+        self._cols = int(math.ceil(max(1, width - 2 * padding) / self._cell)) + 1
+        self._rows = int(math.ceil(max(1, height - 2 * padding) / self._cell)) + 1
+        self._stride = self._cols + 4
+        # a cell holds -1 or, for a placed point, its own index; the point's
+        # coordinates are kept per cell in _px and _py, followed by those of
+        # the candidates of the current round
+        size = (self._rows + 4) * self._stride
+        self._grid = np.full(size, -1, dtype=np.int64)
+        self._px = np.zeros(2 * size)
+        self._py = np.zeros(2 * size)
+        # points sharing a cell with another one (inserted without spacing)
+        self._overflow = np.empty((0, 2))
+        self._offsets = np.array([dy * self._stride + dx for dy, dx in _NEIGHBORS])
+        rows, cols = np.mgrid[0:self._rows, 0:self._cols]
+        self._cells = ((rows + 2) * self._stride + cols + 2).ravel()
+        self._origins = np.column_stack([cols.ravel(), rows.ravel()]) * self._cell + padding
+        self.shortfall = 0
+        self.count = 0
+
+    def _keys(self, points):
+        """Flat grid index of the cell holding each point."""
+        cells = ((points - self.padding) / self._cell).astype(np.int64) + 2
+        np.clip(cells[:, 0], 2, self._cols + 1, out=cells[:, 0])
+        np.clip(cells[:, 1], 2, self._rows + 1, out=cells[:, 1])
+        return cells[:, 1] * self._stride + cells[:, 0]
+
+    def _too_close(self, candidates, keys):
+        """
+        For every candidate, which of the 21 neighboring grid entries hold a
+        point closer than min_distance.
+
+        Returns:
+            (np.ndarray, np.ndarray): (candidates, 21) boolean mask and the
+            entries found in the neighboring cells (-1 for empty).
+        """
+        neighbors = self._grid.take(keys[:, None] + self._offsets)
+        present = neighbors >= 0
+        safe = np.where(present, neighbors, 0)
+        dx = self._px.take(safe) - candidates[:, 0, None]
+        dy = self._py.take(safe) - candidates[:, 1, None]
+        close = present & (dx * dx + dy * dy < self.min_distance ** 2)
+        return close, neighbors
+
+    def _greedy_reject(self, close, neighbors, ids, base, iterations=4):
+        """
+        Decide which candidates to reject so that, like sequential dart
+        throwing, a candidate is kept unless it is too close to a placed
+        point or to an earlier *kept* candidate.
+
+        Rejecting every candidate near any earlier candidate is always valid
+        but wasteful; a few Jacobi iterations refine it towards the
+        sequential result, which is used only once it is a fixed point.
+        """
+        earlier = close & (neighbors < ids[:, None])
+        near_placed = (earlier & (neighbors < base)).any(axis=1)
+        near_candidate = earlier & (neighbors >= base)
+        reject = near_placed | near_candidate.any(axis=1)
+        if not near_candidate.any():
+            return reject
+
+        rows, cols = np.nonzero(near_candidate)
+        other = neighbors[rows, cols] - base
+        for _ in range(iterations):
+            blocked = np.zeros(len(reject), dtype=bool)
+            blocked[rows[~reject[other]]] = True
+            refined = near_placed | blocked
+            if np.array_equal(refined, reject):
+                return refined
+            reject = refined
+        # not converged: fall back to the conservative answer
+        return near_placed | near_candidate.any(axis=1)
+
+    def clear(self):
+        """Remove every point from the grid."""
+        self._grid.fill(-1)
+        self._overflow = np.empty((0, 2))
+        self.count = 0
+
+    def insert(self, points):
+        """
+        Add points placed by other means, e.g. objects added directly, so
+        new points keep min_distance from them. They are not checked
+        against each other; points that share a grid cell are kept aside
+        and checked one by one.
+
+        Args:
+            points (array-like): (k, 2) points.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not len(points):
+            return
+        keys = self._keys(points)
+        _, first = np.unique(keys, return_index=True)
+        free = first[self._grid[keys[first]] < 0]
+        self._grid[keys[free]] = keys[free]
+        self._px[keys[free]] = points[free, 0]
+        self._py[keys[free]] = points[free, 1]
+        rest = np.ones(len(points), dtype=bool)
+        rest[free] = False
+        if rest.any():
+            self._overflow = np.concatenate([self._overflow, points[rest]])
+        self.count += len(points)
+
+    def remove(self, points):
+        """
+        Remove points from the grid, e.g. objects that were caught. Each
+        point must be given with the exact coordinates it was placed or
+        inserted with; unknown points are ignored.
+
+        Args:
+            points (array-like): (k, 2) points.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not len(points):
+            return
+        keys = self._keys(points)
+        found = (
+            (self._grid[keys] == keys)
+            & (self._px[keys] == points[:, 0])
+            & (self._py[keys] == points[:, 1])
+        )
+        self._grid[keys[found]] = -1
+        self.count -= int(found.sum())
+        for point in points[~found]:
+            match = np.flatnonzero((self._overflow == point).all(axis=1))
+            if len(match):
+                self._overflow = np.delete(self._overflow, match[0], axis=0)
+                self.count -= 1
+
+    def sample(self, n, existing=None, avoid_circles=(), avoid_rects=(), rounds=8,
+               oversample=2):
+        """
+        Place up to n new points.
+
+        Args:
+            n (int): Number of points wanted.
+            existing (array-like or None): (k, 2) points already placed,
+                replacing the grid's points; None keeps the points placed and
+                inserted so far. New points keep min_distance from them.
+            avoid_circles (Iterable[tuple]): (x, y, radius) zones to keep free,
+                e.g. around fingertips.
+            avoid_rects (Iterable[tuple]): (x1, y1, x2, y2) zones to keep free,
+                e.g. the HUD.
+            rounds (int): Maximum number of candidate batches.
+            oversample (int): Candidates drawn per missing point in each round.
+
+        Returns:
+            np.ndarray: float64 array of shape (m, 2), m <= n, of new points
+            in placement order, with whole-pixel coordinates; they are added
+            to the grid. m < n when the free area is exhausted within the
+            rounds; the n - m missing points are added to shortfall. Callers
+            must not place them somewhere else, which would break the
+            spacing.
+        """
+        lo = np.array([self.padding, self.padding], dtype=np.float64)
+        hi = np.array([self.width - self.padding, self.height - self.padding], dtype=np.float64)
+        hi = np.maximum(hi, lo)
+
+        circles = np.asarray(list(avoid_circles), dtype=np.float64).reshape(-1, 3)
+        rects = np.asarray(list(avoid_rects), dtype=np.float64).reshape(-1, 4)
+
+        if existing is not None:
+            self.clear()
+            self.insert(existing)
+        overflow = self._overflow
+
+        placed = []
+        missing = n
+        min_d2 = self.min_distance ** 2
+        for _ in range(rounds):
+            if missing <= 0:
+                break
+            # draw candidates only in cells without a point: uniform over the
+            # area that is still free, so a crowded area does not waste them
+            empty = np.flatnonzero(self._grid.take(self._cells) < 0)
+            if not len(empty):
+                break
+            picks = empty[self.rng.choice(
+                len(empty), size=min(len(empty), missing * oversample + 8), replace=False
+            )]
+            candidates = np.rint(self._origins[picks] + self.rng.uniform(
+                0, self._cell, size=(len(picks), 2)
+            ))
+            # snapping may move a candidate into another cell, which must
+            # still be empty and not taken by another candidate
+            keys = self._keys(candidates)
+            keep = (candidates[:, 0] <= hi[0]) & (candidates[:, 1] <= hi[1])
+            if (keys != self._cells[picks]).any():
+                keep &= self._grid.take(keys) < 0
+                _, first = np.unique(keys, return_index=True)
+                unique = np.zeros(len(keys), dtype=bool)
+                unique[first] = True
+                keep &= unique
+
+            if len(circles) or len(rects) or len(overflow):
+                for x, y, r in circles:
+                    d = candidates - (x, y)
+                    keep &= np.einsum("ij,ij->i", d, d) >= r * r
+                for x1, y1, x2, y2 in rects:
+                    keep &= ~(
+                        (candidates[:, 0] >= x1) & (candidates[:, 0] <= x2)
+                        & (candidates[:, 1] >= y1) & (candidates[:, 1] <= y2)
+                    )
+                for p in overflow:
+                    d = candidates - p
+                    keep &= np.einsum("ij,ij->i", d, d) >= min_d2
+            candidates, keys = candidates[keep], keys[keep]
+            if not len(candidates):
+                continue
+
+            # index candidates after every cell, then reject those too close
+            # to a placed point or to an earlier candidate
+            base = len(self._grid)
+            ids = base + np.arange(len(candidates))
+            self._grid[keys] = ids
+            self._px[ids] = candidates[:, 0]
+            self._py[ids] = candidates[:, 1]
+            close, neighbors = self._too_close(candidates, keys)
+            reject = self._greedy_reject(close, neighbors, ids, base)
+
+            accepted = np.flatnonzero(~reject)[:missing]
+            self._grid[keys] = -1
+            accepted_keys = keys[accepted]
+            self._grid[accepted_keys] = accepted_keys
+            self._px[accepted_keys] = candidates[accepted, 0]
+            self._py[accepted_keys] = candidates[accepted, 1]
+            self.count += len(accepted)
+            placed.append(candidates[accepted])
+            missing -= len(accepted)
+
+        self.shortfall += max(0, missing)
+        if not placed:
+            return np.empty((0, 2))
+        return np.concatenate(placed)
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
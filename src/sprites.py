@@ -0,0 +1,274 @@
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def prepare_bgra(img, size):
+    """
+    Resize a decoded image and make sure it has an alpha channel.
+
+    Args:
+        img (np.ndarray): Decoded BGR or BGRA image.
+        size (tuple): Target size (width, height).
+
+    Returns:
+        np.ndarray: Image with alpha channel (BGRA format).
+    """
+    # Resize with high-quality interpolation
+    img = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+
+    # Ensure image has alpha channel
+    if img.shape[2] == 3:
+        # Add alpha channel if missing
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+
+    return img
+
+
+class Sprite:
+    """
+    A BGRA image prepared once for fast alpha compositing.
+
+    Colors are stored premultiplied by alpha and the inverse alpha is
+    expanded to three channels, both as uint8, so blending is two
+    saturating OpenCV operations over all channels at once, in place:
+
+        frame = frame * (255 - alpha) / 255 + premultiplied
+
+    Attributes:
+        image (np.ndarray): The source image (BGR or BGRA, uint8).
+        premultiplied (np.ndarray): uint8 (h, w, 3) color * alpha / 255.
+        inv_alpha (np.ndarray): uint8 (h, w, 3) equal to 255 - alpha.
+        opaque (bool): True if every pixel is fully opaque (plain copy).
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+    """
+
+    def __init__(self, image):
+        """
+        Precompute the blending planes of an image.
+
+        Args:
+            image (np.ndarray): BGR or BGRA uint8 image.
+        """
+        self.image = image
+        self.height, self.width = image.shape[:2]
+        bgr = np.ascontiguousarray(image[:, :, :3])
+        if image.shape[2] == 4:
+            alpha = image[:, :, 3]
+        else:
+            alpha = np.full((self.height, self.width), 255, dtype=np.uint8)
+        self.opaque = bool(np.all(alpha == 255))
+        self.premultiplied = cv2.multiply(bgr, cv2.merge([alpha] * 3), scale=1 / 255)
+        self.inv_alpha = cv2.merge([255 - alpha] * 3)
+
+    @property
+    def nbytes(self):
+        """Memory held by the blending planes, in bytes (image is shared)."""
+        return self.premultiplied.nbytes + self.inv_alpha.nbytes
+
+
+def _blend(frame, sprite, fx1, fy1, fx2, fy2, sx1, sy1):
+    """Blend the sprite region starting at (sx1, sy1) into frame[fy1:fy2, fx1:fx2]."""
+    sx2, sy2 = sx1 + (fx2 - fx1), sy1 + (fy2 - fy1)
+    roi = frame[fy1:fy2, fx1:fx2]
+    if sprite.opaque:
+        roi[...] = sprite.premultiplied[sy1:sy2, sx1:sx2]
+        return
+    cv2.multiply(roi, sprite.inv_alpha[sy1:sy2, sx1:sx2], dst=roi, scale=1 / 255)
+    cv2.add(roi, sprite.premultiplied[sy1:sy2, sx1:sx2], dst=roi)
+
+
+def composite(frame, sprite, cx, cy):
+    """
+    Alpha-blend a sprite centered on (cx, cy) into a frame, in place.
+
+    Sprites that are partly outside the frame are clipped.
+
+    Args:
+        frame (np.ndarray): BGR uint8 frame to draw on.
+        sprite (Sprite): The prepared sprite.
+        cx (int), cy (int): Center of the sprite in frame pixels.
+    """
+    x1 = int(cx) - sprite.width // 2
+    y1 = int(cy) - sprite.height // 2
+    fh, fw = frame.shape[:2]
+
+    # clip the sprite rectangle against the frame
+    fx1, fy1 = max(x1, 0), max(y1, 0)
+    fx2 = min(x1 + sprite.width, fw)
+    fy2 = min(y1 + sprite.height, fh)
+    if fx1 >= fx2 or fy1 >= fy2:
+        return
+    _blend(frame, sprite, fx1, fy1, fx2, fy2, fx1 - x1, fy1 - y1)
+
+
+def composite_many(frame, sprites, xs, ys):
+    """
+    Draw many sprites in one pass, in order.
+
+    The clipped destination and source rectangles of all sprites are
+    computed in one vectorized step; only the blend itself runs per sprite.
+
+    Args:
+        frame (np.ndarray): BGR uint8 frame to draw on.
+        sprites (List[Sprite]): Sprite of each object.
+        xs, ys (array-like): Integer center of each object.
+    """
+    if len(sprites) == 0:
+        return
+    fh, fw = frame.shape[:2]
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    widths = np.fromiter((s.width for s in sprites), dtype=np.int64, count=len(sprites))
+    heights = np.fromiter((s.height for s in sprites), dtype=np.int64, count=len(sprites))
+
+    x1 = xs - widths // 2
+    y1 = ys - heights // 2
+    fx1 = np.maximum(x1, 0)
+    fy1 = np.maximum(y1, 0)
+    fx2 = np.minimum(x1 + widths, fw)
+    fy2 = np.minimum(y1 + heights, fh)
+    visible = np.flatnonzero((fx1 < fx2) & (fy1 < fy2))
+
+    rects = np.stack([fx1, fy1, fx2, fy2, fx1 - x1, fy1 - y1], axis=1)[visible].tolist()
+    for i, rect in zip(visible.tolist(), rects):
+        _blend(frame, sprites[i], *rect)
+
+
+class SpriteCache:
+    """
+    Process-wide, thread-safe cache of decoded and pre-scaled image assets.
+
+    Entries are keyed by (path, size, format) where format is one of:
+        "source" -> the decoded file, downscaled so its longest side is at
+                    most max_source_side (size is None),
+        "bgra"   -> resized BGRA image (as returned by load_image_with_alpha),
+        "sprite" -> a Sprite built from the "bgra" variant.
+
+    Each file is decoded once; new sizes are derived from the cached source
+    image, so only the first request for a path touches the disk. Entries
+    are evicted least-recently-used first once max_bytes is exceeded.
+
+    Attributes:
+        max_bytes (int): Memory cap for all cached entries.
+        max_source_side (int): Longest side kept for decoded source images
+            (the bundled assets are several thousand pixels wide).
+        nbytes (int): Memory currently held.
+        hits (int), misses (int): Lookup statistics.
+        decodes (int): Number of files read from disk.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_source_side=1024):
+        """
+        Args:
+            max_bytes (int): Memory cap in bytes.
+            max_source_side (int): Longest side of cached source images.
+        """
+        self.max_bytes = max_bytes
+        self.max_source_side = max_source_side
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, path, size=None, fmt="sprite"):
+        """
+        Get an asset variant, creating (and caching) it on first use.
+
+        Args:
+            path (str): Image file path.
+            size (tuple or None): Target (width, height); None for "source".
+            fmt (str): "source", "bgra" or "sprite".
+
+        Returns:
+            np.ndarray or Sprite: The requested variant.
+
+        Raises:
+            FileNotFoundError: If the image cannot be read.
+        """
+        key = (path, tuple(size) if size is not None else None, fmt)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+            if fmt == "source":
+                value = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+                if value is None:
+                    raise FileNotFoundError(f"Could not load image: {path}")
+                self.decodes += 1
+                h, w = value.shape[:2]
+                scale = self.max_source_side / max(h, w)
+                if scale < 1:
+                    value = cv2.resize(
+                        value, (max(1, round(w * scale)), max(1, round(h * scale))),
+                        interpolation=cv2.INTER_AREA,
+                    )
+            elif fmt == "bgra":
+                value = prepare_bgra(self.get(path, None, "source"), key[1])
+            elif fmt == "sprite":
+                value = Sprite(self.get(path, key[1], "bgra"))
+            else:
+                raise ValueError(f"Unknown asset format: {fmt}")
+
+            self._entries[key] = value
+            self.nbytes += value.nbytes
+            self._evict()
+            return value
+
+    def prewarm(self, paths, sizes):
+        """
+        Decode and prepare every (path, size) sprite ahead of time.
+
+        Args:
+            paths (Iterable[str]): Image file paths.
+            sizes (Iterable[tuple]): (width, height) variants to build.
+        """
+        sizes = list(sizes)
+        for path in paths:
+            for size in sizes:
+                self.get(path, size, "sprite")
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: Entry count, memory use and hit/miss counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "decodes": self.decodes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _evict(self):
+        # the newest entry always stays, even if it alone exceeds the cap
+        while self.nbytes > self.max_bytes and len(self._entries) > 1:
+            _, value = self._entries.popitem(last=False)
+            self.nbytes -= value.nbytes
+
+
+ASSET_CACHE = SpriteCache()
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
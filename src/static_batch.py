@@ -0,0 +1,296 @@
+import csv
+import glob
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import cv2
+
+from src.dot_game import DotGame
+from src.frame_source import IMAGE_EXTENSIONS
+from src.hand_tracker import HandTracker
+from src.landmark_cache import LandmarkCache
+
+
+FIELDS = (
+    "index", "image", "width", "height", "hand_detected",
+    "finger_x", "finger_y", "dot_x", "dot_y", "dot_radius",
+    "distance", "touching", "cached", "error",
+)
+
+
+def collect_images(inputs):
+    """
+    Expand batch inputs into a list of image paths.
+
+    Args:
+        inputs (Iterable[str]): Each one is a directory (its images, sorted
+            by name), a list file (.txt, one path per line, relative to the
+            list file), a glob pattern, or a single image path.
+
+    Returns:
+        List[str]: Image paths in input order.
+    """
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(
+                os.path.join(item, name)
+                for name in os.listdir(item)
+                if name.lower().endswith(IMAGE_EXTENSIONS)
+            ))
+        elif os.path.isfile(item) and item.lower().endswith(".txt"):
+            base = os.path.dirname(item)
+            with open(item) as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        paths.append(os.path.join(base, line))
+        elif glob.has_magic(item):
+            paths.extend(sorted(glob.glob(item, recursive=True)))
+        else:
+            paths.append(item)
+    return paths
+
+
+def check_image(image, tracker, force_detection=False, dot_radius=20, rng=None):
+    """
+    Place a dot on an image and test whether the index fingertip touches it.
+
+    Args:
+        image (np.ndarray): BGR image.
+        tracker (HandTracker): A static-mode tracker.
+        force_detection (bool): Put the dot on the fingertip instead of a
+            random spot.
+        dot_radius (int): Radius of the dot.
+        rng (random.Random, int or None): Source of the dot position; None
+            uses the global random module.
+
+    Returns:
+        (DotGame or None, dict): The game holding the dot (None if no hand
+        was found) and the result fields (see FIELDS).
+    """
+    height, width = image.shape[:2]
+    row = {
+        "width": width, "height": height, "hand_detected": False,
+        "finger_x": None, "finger_y": None, "dot_x": None, "dot_y": None,
+        "dot_radius": None, "distance": None, "touching": False,
+    }
+
+    tracker.find_hands(image, draw=False)
+    fx, fy = tracker.get_index_finger_tip(image)
+    if fx is None or fy is None:
+        return None, row
+
+    game = DotGame(
+        frame_width=width, frame_height=height, dot_radius=dot_radius, players=1, rng=rng
+    )
+    if force_detection:
+        game.dot_x = fx
+        game.dot_y = fy
+
+    dist = math.hypot(fx - game.dot_x, fy - game.dot_y)
+    row.update(
+        hand_detected=True, finger_x=fx, finger_y=fy,
+        dot_x=game.dot_x, dot_y=game.dot_y, dot_radius=game.dot_radius,
+        distance=round(dist, 2), touching=dist <= game.dot_radius,
+    )
+    return game, row
+
+
+# per-process state of the pool workers
+_worker = {}
+
+
+def make_static_tracker(cache_dir=None, cache_bytes=64 * 1024 * 1024, processes=1):
+    """
+    Create the static-mode HandTracker used by static_dot_hunter.
+
+    Args:
+        cache_dir (str or None): Landmark cache directory; None disables it.
+        cache_bytes (int): Size cap of the landmark cache.
+        processes (int): Processes sharing the cache directory.
+
+    Returns:
+        HandTracker: The tracker (its model loads on the first cache miss).
+    """
+    cache = LandmarkCache(cache_dir, cache_bytes, processes) if cache_dir else None
+    return HandTracker(
+        mode=True, maxHands=1, detectionCon=0.7, trackCon=0.7, cache=cache  # static image mode
+    )
+
+
+def _init_worker(options):
+    """
+    Create the worker's static-mode HandTracker once, before any image.
+    Without a cache every image needs the model, so it is loaded and warmed
+    up here; with one it loads on the first miss, so a batch answered from
+    the cache never loads it.
+    """
+    tracker = make_static_tracker(
+        options["cache_dir"], options["cache_bytes"], options["workers"]
+    )
+    if tracker.cache is None:
+        tracker.warm_up()
+    _worker["tracker"] = tracker
+    _worker["options"] = options
+
+
+def _init_pool_worker(options):
+    """Initialize a pool worker process (see _init_worker)."""
+    # one OpenCV thread per process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+    _init_worker(options)
+
+
+def _check_task(task):
+    """Check one (index, path) task in a worker and return its row."""
+    index, path = task
+    options = _worker["options"]
+    tracker = _worker["tracker"]
+    row = {"index": index, "image": path, "cached": False, "error": None}
+    try:
+        image = cv2.imread(path)
+        if image is None:
+            raise ValueError(f"could not read image '{path}'")
+        # seeded per image, so the dot does not depend on the worker layout
+        rng = random.Random(f"{options['seed']}:{index}")
+        hits = tracker.cache.hits if tracker.cache else 0
+        _, result = check_image(image, tracker, options["force_detection"], rng=rng)
+        row.update(result)
+        row["cached"] = tracker.cache is not None and tracker.cache.hits > hits
+    except Exception as e:
+        row["error"] = str(e)
+    return row
+
+
+class RowWriter:
+    """
+    Writes result rows as JSON lines or CSV.
+
+    Attributes:
+        fmt (str): "jsonl" or "csv".
+    """
+
+    def __init__(self, stream, fmt="jsonl"):
+        """
+        Args:
+            stream: Text stream to write to.
+            fmt (str): "jsonl" or "csv".
+        """
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown output format: {fmt}")
+        self.fmt = fmt
+        self._stream = stream
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._stream.write(json.dumps({name: row.get(name) for name in FIELDS}) + "\n")
+
+
+def run_batch(paths, stream, fmt="jsonl", workers=None, ordered=True, seed=0,
+              force_detection=False, chunksize=4, progress=sys.stderr, progress_every=1.0,
+              cache_dir=None, cache_bytes=64 * 1024 * 1024):
+    """
+    Check many images on a pool of worker processes, each with its own
+    static-mode HandTracker (warmed up before the first image when there
+    is no cache), and write one row per image.
+
+    Args:
+        paths (List[str]): Images to check.
+        stream: Text stream the rows are written to.
+        fmt (str): "jsonl" or "csv".
+        workers (int or None): Number of worker processes; defaults to the
+            CPU count. 1 runs everything in this process.
+        ordered (bool): Write rows in input order; otherwise as soon as each
+            image is done (faster when image sizes vary).
+        seed (int): Seed of the random dot placement.
+        force_detection (bool): Put each dot on the fingertip.
+        chunksize (int): Images handed to a worker at a time.
+        progress (file or None): Where progress lines are printed.
+        progress_every (float): Seconds between progress lines.
+        cache_dir (str or None): Landmark cache shared by all workers, so
+            images checked before skip inference; None disables it.
+        cache_bytes (int): Size cap of the landmark cache, for all workers
+            together.
+
+    Returns:
+        dict: Summary with counts, elapsed time and throughput.
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    options = {
+        "seed": seed,
+        "force_detection": force_detection,
+        "cache_dir": cache_dir,
+        "cache_bytes": cache_bytes,
+        "workers": workers,
+    }
+    tasks = list(enumerate(paths))
+    writer = RowWriter(stream, fmt)
+    summary = {"images": 0, "hands": 0, "touching": 0, "errors": 0,
+               "cache_hits": 0, "cache_misses": 0}
+
+    start = time.perf_counter()
+    last_report = start
+    pool = None
+    if workers == 1:
+        _init_worker(options)
+        rows = map(_check_task, tasks)
+    else:
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_pool_worker, initargs=(options,)
+        )
+        imap = pool.imap if ordered else pool.imap_unordered
+        rows = imap(_check_task, tasks, chunksize=chunksize)
+
+    try:
+        for row in rows:
+            writer.write(row)
+            summary["images"] += 1
+            summary["hands"] += bool(row.get("hand_detected"))
+            summary["touching"] += bool(row.get("touching"))
+            summary["errors"] += row["error"] is not None
+            if cache_dir and row["error"] is None:
+                summary["cache_hits" if row["cached"] else "cache_misses"] += 1
+            now = time.perf_counter()
+            if progress is not None and now - last_report >= progress_every:
+                last_report = now
+                rate = summary["images"] / (now - start)
+                print(f"[{summary['images']}/{len(tasks)}] {rate:.1f} images/s",
+                      file=progress, flush=True)
+    except BaseException:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        raise
+    finally:
+        if pool is None:
+            # the in-process tracker is not needed once the batch is done
+            _worker.pop("tracker").close()
+            _worker.pop("options")
+    if pool is not None:
+        pool.close()
+        pool.join()
+
+    elapsed = time.perf_counter() - start
+    summary.update(
+        workers=workers,
+        elapsed_s=round(elapsed, 3),
+        images_per_s=round(summary["images"] / elapsed, 2) if elapsed > 0 else None,
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
@@ -0,0 +1,131 @@
+import numpy as np
+
+
+def random_walk(frames, fingers, frame_size, step=12.0, dropout=0.0, rng=None):
+    """
+    Fingertips wandering over the frame, like a hand hovering around.
+
+    Each finger starts at a random point and moves by a normally distributed
+    step every frame, bouncing off the frame edges.
+
+    Args:
+        frames (int): Number of frames.
+        fingers (int): Number of fingertips.
+        frame_size (tuple): (width, height) of the frame.
+        step (float): Standard deviation of a step in pixels.
+        dropout (float): Probability that a fingertip is not detected in a
+            frame.
+        rng (np.random.Generator, int or None): Generator or seed.
+
+    Returns:
+        np.ndarray: (frames, fingers, 2) float64 positions, NaN where a
+        fingertip was not detected.
+    """
+    rng = np.random.default_rng(rng)
+    size = np.asarray(frame_size, dtype=np.float64)
+    start = rng.uniform(0, 1, (fingers, 2)) * size
+    points = start + np.cumsum(rng.normal(0, step, (frames, fingers, 2)), axis=0)
+    # reflect into [0, size] (triangle wave with period 2 * size)
+    points = size - np.abs(np.mod(points, 2 * size) - size)
+    return _drop(points, dropout, rng)
+
+
+def swipes(frames, fingers, frame_size, speed=60.0, dropout=0.0, rng=None):
+    """
+    Fast straight swipes: each finger crosses the frame from one random
+    border point to another at `speed` pixels per frame, then starts a new
+    swipe.
+
+    Args:
+        frames (int): Number of frames.
+        fingers (int): Number of fingertips.
+        frame_size (tuple): (width, height) of the frame.
+        speed (float): Pixels travelled per frame.
+        dropout (float): Probability that a fingertip is not detected.
+        rng (np.random.Generator, int or None): Generator or seed.
+
+    Returns:
+        np.ndarray: (frames, fingers, 2) float64 positions (see random_walk).
+    """
+    rng = np.random.default_rng(rng)
+    width, height = frame_size
+    points = np.empty((frames, fingers, 2))
+    for finger in range(fingers):
+        frame = 0
+        while frame < frames:
+            start, end = _border_point(rng, width, height), _border_point(rng, width, height)
+            length = max(1, int(np.hypot(*(end - start)) / speed))
+            t = np.linspace(0.0, 1.0, length)[:frames - frame, None]
+            points[frame:frame + len(t), finger] = start + t * (end - start)
+            frame += len(t)
+    return _drop(points, dropout, rng)
+
+
+def multi_finger(frames, fingers, frame_size, dropout=0.05, rng=None):
+    """
+    Many fingers at once: half of them wander and half of them swipe, and
+    each one is sometimes lost by the tracker.
+
+    Args:
+        frames (int): Number of frames.
+        fingers (int): Number of fingertips.
+        frame_size (tuple): (width, height) of the frame.
+        dropout (float): Probability that a fingertip is not detected.
+        rng (np.random.Generator, int or None): Generator or seed.
+
+    Returns:
+        np.ndarray: (frames, fingers, 2) float64 positions (see random_walk).
+    """
+    rng = np.random.default_rng(rng)
+    walking = fingers // 2
+    return np.concatenate([
+        random_walk(frames, walking, frame_size, dropout=dropout, rng=rng),
+        swipes(frames, fingers - walking, frame_size, dropout=dropout, rng=rng),
+    ], axis=1)
+
+
+TRAJECTORIES = {
+    "random_walk": random_walk,
+    "swipes": swipes,
+    "multi_finger": multi_finger,
+}
+
+
+def as_tips(points):
+    """
+    Convert one frame of a trajectory to the fingertip format of
+    HandTracker.get_player_tips.
+
+    Args:
+        points (np.ndarray): (fingers, 2) positions, NaN if not detected.
+
+    Returns:
+        List[Tuple[int|None, int|None]]: (x, y) or (None, None) per finger.
+    """
+    return [
+        (None, None) if x != x else (int(x), int(y))  # NaN: not detected
+        for x, y in points.tolist()
+    ]
+
+
+def _border_point(rng, width, height):
+    """Random point on the border of the frame."""
+    t = rng.uniform(0, 2 * (width + height))
+    if t < width:
+        return np.array([t, 0.0])
+    if t < width + height:
+        return np.array([width, t - width])
+    if t < 2 * width + height:
+        return np.array([t - width - height, height])
+    return np.array([0.0, t - 2 * width - height])
+
+
+def _drop(points, dropout, rng):
+    if dropout > 0:
+        points[rng.uniform(0, 1, points.shape[:2]) < dropout] = np.nan
+    return points
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
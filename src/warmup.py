@@ -0,0 +1,153 @@
+import threading
+import time
+
+from src.hand_tracker import import_mediapipe
+
+
+class Warmup:
+    """
+    Loads and warms up hand trackers and opens the camera on background
+    threads, e.g. while the settings dialog is on screen, so a session can
+    start without waiting for MediaPipe or the camera.
+
+    The number of players is only known once the dialog closes, so a
+    tracker is prepared for the likely player count only (e.g. that of the
+    last session): each one holds its own model and costs a warm-up
+    inference. A tracker for another count is created when it is taken
+    and loads its model on its first frame. Prepared trackers not taken
+    are closed by close().
+
+    Attributes:
+        timings (dict): Seconds spent on each step in the background:
+            "camera", "import" (MediaPipe) and "tracker_<players>" (model
+            load plus one warm-up inference).
+        error (str or None): Set when a background step failed; the step is
+            then redone (cold) when its result is taken.
+    """
+
+    def __init__(self, make_tracker, open_camera, players=(1,), frame_size=(1280, 720)):
+        """
+        Args:
+            make_tracker (callable): Creates a HandTracker for a player count.
+            open_camera (callable): Opens and configures the capture.
+            players (Iterable[int]): Player counts to prepare trackers for,
+                most likely first; usually just one.
+            frame_size (tuple): (width, height) of the camera frames, used for
+                the warm-up inference.
+        """
+        self._make_tracker = make_tracker
+        self._open_camera = open_camera
+        self._players = tuple(players)
+        self._frame_size = frame_size
+        self._trackers = {}
+        self._ready = {players: threading.Event() for players in self._players}
+        self._cap = None
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._camera_loop, name="warmup-camera", daemon=True),
+            threading.Thread(target=self._tracker_loop, name="warmup-tracker", daemon=True),
+        ]
+        self.timings = {}
+        self.error = None
+
+    def start(self):
+        """Start opening the camera and loading the trackers."""
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _camera_loop(self):
+        start = time.perf_counter()
+        try:
+            cap = self._open_camera()
+        except Exception as e:
+            self.error = f"camera: {e}"
+            return
+        with self._lock:
+            self._cap = cap
+            self.timings["camera"] = round(time.perf_counter() - start, 3)
+
+    def _tracker_loop(self):
+        try:
+            for players in self._players:
+                start = time.perf_counter()
+                if "import" not in self.timings:
+                    import_mediapipe()
+                    self.timings["import"] = round(time.perf_counter() - start, 3)
+                tracker = self._make_tracker(players)
+                tracker.warm_up(self._frame_size)
+                with self._lock:
+                    self._trackers[players] = tracker
+                    self.timings[f"tracker_{players}"] = round(time.perf_counter() - start, 3)
+                self._ready[players].set()
+        except Exception as e:
+            self.error = f"tracker: {e}"
+        finally:
+            # never leave tracker() waiting, even after a failure
+            for ready in self._ready.values():
+                ready.set()
+
+    def camera_ready(self):
+        """
+        Wait for the camera step and tell whether capture() will return
+        the camera it opened.
+        """
+        self._threads[0].join()
+        with self._lock:
+            return self._cap is not None and self._cap.isOpened()
+
+    def tracker_ready(self, players):
+        """
+        Wait for the tracker of this player count and tell whether
+        tracker(players) will return it warm: False if it was not
+        prepared, or its warm-up failed (see error).
+        """
+        if players not in self._ready:
+            return False
+        self._ready[players].wait()
+        with self._lock:
+            tracker = self._trackers.get(players)
+            return tracker is not None and tracker.loaded
+
+    def tracker(self, players):
+        """
+        Take the warm tracker for this player count, waiting for it if it is
+        still loading (or creating one if it was not prepared).
+
+        Returns:
+            HandTracker: The tracker.
+        """
+        if players in self._ready:
+            self._ready[players].wait()
+        with self._lock:
+            tracker = self._trackers.pop(players, None)
+        return tracker if tracker is not None else self._make_tracker(players)
+
+    def capture(self):
+        """
+        Take the opened camera, waiting for it if it is still opening.
+
+        Returns:
+            The capture object (check isOpened()).
+        """
+        self._threads[0].join()
+        with self._lock:
+            cap, self._cap = self._cap, None
+        return cap if cap is not None else self._open_camera()
+
+    def close(self):
+        """Wait for the background steps and release what was not taken."""
+        for thread in self._threads:
+            thread.join()
+        with self._lock:
+            trackers, self._trackers = self._trackers, {}
+            cap, self._cap = self._cap, None
+        for tracker in trackers.values():
+            tracker.close()
+        if cap is not None:
+            cap.release()
+
+
+if __name__ == "__main__":
+    print("This module is not meant to be run directly.")
+    exit(1)
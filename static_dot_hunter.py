@@ -4,15 +4,53 @@ static_dot_hunter.py
 Static‑image checker: overlays a randomly placed dot onto the input image,
 then prints & visualizes whether the index‑finger tip touches that dot.
 
+Batch mode checks many images headlessly on a pool of worker processes
+and writes one JSONL or CSV row per image.
+
 Usage:
     python static_dot_hunter.py --image path/to/hand_image.png
+    python static_dot_hunter.py --batch frames/ --output results.jsonl
+    python static_dot_hunter.py --batch "captures/**/*.png" list.txt -o results.csv --workers 8
 """
 
 import cv2
 import argparse
-import math
-from src.hand_tracker import HandTracker
-from src.dot_game import DotGame
+import json
+import os
+import sys
+from src.static_batch import check_image, collect_images, make_static_tracker, run_batch
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dot_hunter", "landmarks")
+
+
+def run_batch_mode(args):
+    """Run the headless batch check and print its summary."""
+    paths = collect_images(args.batch)
+    if not paths:
+        print("Error: no images found for --batch")
+        return
+
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.output and args.output.lower().endswith(".csv") else "jsonl"
+
+    stream = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        summary = run_batch(
+            paths,
+            stream,
+            fmt=fmt,
+            workers=args.workers,
+            ordered=not args.unordered,
+            seed=args.seed,
+            force_detection=args.force_detection,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            cache_bytes=args.cache_size_mb * 1024 * 1024,
+        )
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    print(json.dumps(summary), file=sys.stderr)
 
 
 def main():
@@ -20,8 +58,17 @@ def main():
         description="Overlay a random dot on a static hand image, "
         "then check if the index fingertip touches it."
     )
-    parser.add_argument(
-        "--image", "-i", required=True, help="Path to the input image containing a hand"
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--image", "-i", help="Path to the input image containing a hand"
+    )
+    source.add_argument(
+        "--batch",
+        "-b",
+        nargs="+",
+        metavar="INPUT",
+        help="Check many images headlessly: directories, glob patterns "
+        "or .txt files listing one image per line",
     )
 
     parser.add_argument(
@@ -32,35 +79,66 @@ def main():
         help="Force the dot to appear on your index-finger tip rather than at a random spot",
     )
 
+    parser.add_argument(
+        "--output", "-o", help="Batch results file (default: stdout)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=("jsonl", "csv"),
+        default=None,
+        help="Batch results format (default: from the --output extension, else jsonl)",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes for --batch",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write batch rows as soon as they are ready instead of in input order",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the random dots in batch mode"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Landmark cache: images checked before skip hand tracking",
+    )
+    parser.add_argument(
+        "--cache-size-mb", type=int, default=64, help="Size cap of the landmark cache"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always run hand tracking"
+    )
+
     args = parser.parse_args()
 
+    if args.batch:
+        run_batch_mode(args)
+        return
+
     # 1) Load image
     image = cv2.imread(args.image)
     if image is None:
         print(f"Error: could not read image '{args.image}'")
         return
 
-    height, width = image.shape[:2]
-
-    # 2) Detect the index-finger tip in static mode
-    tracker = HandTracker(
-        mode=True, maxHands=1, detectionCon=0.7, trackCon=0.7  # static image mode
+    # 2) Detect the index-finger tip in static mode, then
+    # 3) spawn a dot (random, or on the fingertip with --force-detection)
+    tracker = make_static_tracker(
+        None if args.no_cache else args.cache_dir, args.cache_size_mb * 1024 * 1024
     )
-    _ = tracker.find_hands(image, draw=False)
-    fx, fy = tracker.get_index_finger_tip(image)
-    if fx is None or fy is None:
+    game, result = check_image(image, tracker, force_detection=args.force_detection)
+    if tracker.cache is not None:
+        print("Landmark cache:", "hit" if tracker.cache.hits else "miss")
+    if game is None:
         print("No hand (or index finger) detected in the image.")
         return
-    
-    if not args.force_detection:
-        # 3) Spawn a random dot using your DotGame logic
-        game = DotGame(frame_width=width, frame_height=height, dot_radius=20, players=1)
-    else:
-        # 3) Spawn a dot at the fingertip position
-        game = DotGame(frame_width=width, frame_height=height, dot_radius=20, players=1)
-        game.dot_x = fx
-        game.dot_y = fy
-        game.dot_radius = 20
+    fx, fy = result["finger_x"], result["finger_y"]
 
     # 4) Draw dot + fingertip onto a copy of the image
     out = image.copy()
@@ -69,9 +147,9 @@ def main():
         out, (fx, fy), 8, (255, 0, 0), -1
     )  # draw the detected fingertip as a blue dot
 
-    # 5) Compute distance & decide “touch”
-    dist = math.hypot(fx - game.dot_x, fy - game.dot_y)
-    touching = dist <= game.dot_radius
+    # 5) Distance & “touch” decision
+    dist = result["distance"]
+    touching = result["touching"]
 
     # 6) Print results
     print(f"Dot center:    ({game.dot_x}, {game.dot_y}), radius = {game.dot_radius}")
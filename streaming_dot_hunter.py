@@ -3,66 +3,127 @@ streaming_dot_hunter.py
 
 Real‑time “catch the dot” game using your webcam and MediaPipe.
 Run with: python streaming_dot_hunter.py
+Use --serial to run capture, inference and rendering on a single thread.
+Use --profile to time every stage (press 'p' in game for the overlay).
+Use --record FILE to record a round, and --replay FILE to play it back
+through the game and rendering without a camera or MediaPipe.
 """
 
 import cv2
+import numpy as np
+import os
+import random
+import sqlite3
 import time
+import argparse
 import json
-import os
 import tkinter as tk
 from tkinter import ttk
 from src.hand_tracker import HandTracker
-from src.dot_game import CollectibleGame
+from src.dot_game import CollectibleGame, prewarm_assets
+from src.buffers import BufferPool, ScreenBuffer
+from src.pipeline import FramePipeline
+from src.prediction import TipPredictor
+from src.quality import QualityController, quality_knobs, quality_levels
+from src.hud import Hud, game_hud_rect, update_game_hud
+from src.instrumentation import Profiler
+from src.highscores import HighscoreStore, mode_name
+from src.multicam import MultiCamera
+from src.recorder import (
+    MAX_CATCHES, Recording, SessionRecorder, draw_landmarks, game_from_snapshot, snapshot_game,
+)
+from src.session import PLAYER_COLORS, SessionResources, open_game_window, play_frame
+from src.warmup import Warmup
 
 
+HIGHSCORE_DB = "highscores.db"
+# scores of older versions, imported into the database on first use
 HIGHSCORE_FILE = "highscores.json"
 
 
-def load_highscores():
-    """Load high scores from JSON file."""
-    if os.path.exists(HIGHSCORE_FILE):
-        try:
-            with open(HIGHSCORE_FILE, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
-    return []
+def open_highscores():
+    """
+    Open the high score database, or return None (and print why) if it
+    cannot be used, e.g. because it is locked or corrupt.
+    """
+    try:
+        return HighscoreStore(HIGHSCORE_DB, legacy_json=HIGHSCORE_FILE)
+    except sqlite3.Error as e:
+        print(f"Error opening high scores: {e}")
+        return None
 
 
-def save_highscores(highscores):
-    """Save high scores to JSON file."""
+def load_highscores(n=10, mode=None):
+    """Load the top n high scores (of one mode, or of all modes); [] on errors."""
+    store = open_highscores()
+    if store is None:
+        return []
     try:
-        with open(HIGHSCORE_FILE, 'w') as f:
-            json.dump(highscores, f, indent=2)
-    except IOError as e:
-        print(f"Error saving high scores: {e}")
+        return store.top(n, mode=mode)
+    except sqlite3.Error as e:
+        print(f"Error loading high scores: {e}")
+        return []
+    finally:
+        store.close()
 
 
 def add_highscore(name, score, players):
-    """Add a new high score and return updated list (top 10)."""
-    mode = "Solo" if players == 1 else "Two Players"
-    highscores = load_highscores()
-    
-    # Always add score entry (allow duplicates and all scores)
-    highscores.append({
-        "name": name,
-        "score": score,
-        "mode": mode,
-        "date": time.strftime("%Y-%m-%d %H:%M")
-    })
-    
-    # Sort by score (descending) and keep top 10
-    highscores.sort(key=lambda x: x['score'], reverse=True)
-    highscores = highscores[:10]
-    save_highscores(highscores)
-    return highscores
+    """Add a new high score and return the updated top 10 ([] on errors)."""
+    store = open_highscores()
+    if store is None:
+        return []
+    try:
+        store.add(name, score, mode_name(players))
+        return store.top(10)
+    except sqlite3.Error as e:
+        print(f"Error saving high scores: {e}")
+        return []
+    finally:
+        store.close()
 
 
-def show_game_over_screen(final_scores, players, timer_duration):
-    """Show game over screen and get player name(s), return play_again boolean."""
-    root = tk.Tk()
-    root.title("Game Over!")
+def last_session_players():
+    """Player count of the last saved score; 1 without one (or without a database)."""
+    store = open_highscores()
+    if store is None:
+        return 1
+    try:
+        latest = store.history(limit=1)
+    except sqlite3.Error:
+        return 1
+    finally:
+        store.close()
+    return 2 if latest and latest[0]["mode"] == mode_name(2) else 1
+
+
+def open_dialog(title, parent=None):
+    """A dialog window: its own Tk root, or a topmost Toplevel of parent."""
+    if parent is None:
+        root = tk.Tk()
+    else:
+        root = tk.Toplevel(parent)
+        root.attributes("-topmost", True)  # above the fullscreen game window
+    root.title(title)
     root.resizable(False, False)
+    return root
+
+
+def run_dialog(root, parent=None):
+    """Show a dialog from open_dialog until it is destroyed."""
+    if parent is None:
+        root.mainloop()
+    else:
+        root.focus_force()
+        root.grab_set()
+        parent.wait_window(root)
+
+
+def show_game_over_screen(final_scores, players, timer_duration, parent=None):
+    """
+    Show game over screen and get player name(s), return play_again boolean.
+    With a parent Tk root (kiosk mode) the dialog is a Toplevel of it.
+    """
+    root = open_dialog("Game Over!", parent)
     
     player_names = []
     
@@ -105,7 +166,13 @@ def show_game_over_screen(final_scores, players, timer_duration):
         row=5 if players == 1 else 5, column=0, columnspan=2, pady=(20, 5)
     )
     
-    highscores = load_highscores()
+    store = open_highscores()
+    highscores = []
+    if store is not None:
+        try:
+            highscores = store.top(10)
+        except sqlite3.Error as e:
+            print(f"Error loading high scores: {e}")
     scores_text = tk.Text(root, height=8, width=50, state='disabled', font=('Courier', 10))
     scores_text.grid(row=6 if players == 1 else 6, column=0, columnspan=2, padx=20, pady=5)
     
@@ -120,12 +187,21 @@ def show_game_over_screen(final_scores, players, timer_duration):
     
     def on_submit():
         # Get names and save high scores only if name is provided
+        entries = []
         for i, entry in enumerate(name_entries):
             name = entry.get().strip()
             if name:  # Only add to high scores if name is not empty
                 player_names.append(name)
-                add_highscore(name, final_scores[i], players)
-        
+                entries.append((name, final_scores[i], mode_name(players)))
+        # both players in one transaction
+        if store is not None:
+            try:
+                if entries:
+                    store.add_many(entries)
+            except sqlite3.Error as e:
+                print(f"Error saving high scores: {e}")
+            finally:
+                store.close()
         root.destroy()
     
     # Buttons (only Quit)
@@ -140,15 +216,27 @@ def show_game_over_screen(final_scores, players, timer_duration):
     root.bind('<Return>', on_enter)
     root.protocol("WM_DELETE_WINDOW", on_submit)
 
-    root.mainloop()
+    run_dialog(root, parent)
 
     return False
 
 
-def get_user_settings():
-    root = tk.Tk()
-    root.title("Dot Hunter — Settings")
-    root.resizable(False, False)
+def get_user_settings(parent=None, players=1):
+    """
+    Show the settings dialog.
+
+    Args:
+        parent (tk.Tk or None): Root to open the dialog on (kiosk mode);
+            None gives the dialog a Tk root of its own.
+        players (int): Player count selected initially.
+
+    Returns:
+        (int, int, tuple) or (None, None, None): Players, timer duration and
+        the (width, height) of the screen, read from the dialog's Tk root;
+        all None if the dialog was closed without starting.
+    """
+    root = open_dialog("Dot Hunter — Settings", parent)
+    screen_size = (root.winfo_screenwidth(), root.winfo_screenheight())
 
     # this dict lets us detect if Start Game was clicked
     cancelled = {"value": True}
@@ -164,7 +252,7 @@ def get_user_settings():
     ttk.Label(root, text="Select mode:").grid(
         row=0, column=0, columnspan=2, pady=(10, 0)
     )
-    mode_var = tk.StringVar(value="Solo")
+    mode_var = tk.StringVar(value="Solo" if players == 1 else "Two")
     ttk.Radiobutton(root, text="Solo", variable=mode_var, value="Solo").grid(
         row=1, column=0, padx=20, sticky="w"
     )
@@ -186,202 +274,803 @@ def get_user_settings():
         row=4, column=0, columnspan=2, pady=(15, 10)
     )
 
-    root.mainloop()
+    run_dialog(root, parent)
 
     # if they closed without clicking Start, abort
     if cancelled["value"]:
-        return None, None
+        return None, None, None
 
     return (
         (1 if mode_var.get() == "Solo" else 2),
         timer_var.get(),
+        screen_size,
     )
 
 
-def run_game_session(settings):
-    """Run a single game session with the given settings."""
-    players, timer_duration = settings
+# Webcam resolution: 1280x720 is a good balance between hand tracking
+# quality and performance
+WEBCAM_SIZE = (1280, 720)
+
 
+def open_camera():
+    """Open the webcam at WEBCAM_SIZE."""
     cap = cv2.VideoCapture(0)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, WEBCAM_SIZE[0])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, WEBCAM_SIZE[1])
+    return cap
+
+
+def make_tracker(players, buffered=False, profiler=None, tracker_options=None):
+    """Create the video-mode HandTracker of a session."""
+    return HandTracker(
+        mode=False, maxHands=players, detectionCon=0.7, trackCon=0.7, mirror=buffered,
+        profiler=profiler, **(tracker_options or {}),
+    )
+
+
+def make_game(players, screen_size, profiler=None, game_options=None, avoid_rects=()):
+    """Create the CollectibleGame of a session; objects avoid the HUD and avoid_rects."""
+    screen_width, screen_height = screen_size
+    return CollectibleGame(
+        screen_width, screen_height, players=players, max_coins=5, max_bombs=1,
+        avoid_rects=[game_hud_rect(screen_width, players), *avoid_rects], profiler=profiler,
+        **(game_options or {}),
+    )
+
+
+def run_game_session(settings, pipelined=True, tracker_options=None, game_options=None,
+                     predict=False, inference_fps=None, buffered=False, profiler=None,
+                     screen_size=None, warmup=None, resources=None, parent=None, quality=None,
+                     record=None):
+    """
+    Run a single game session with the given settings.
+
+    With pipelined=True, capture and hand inference run on background
+    threads (see FramePipeline) and the loop below renders every captured
+    frame with the newest fingertips, so it runs at the camera rate however
+    slow inference is; the timer and window events are handled even when
+    no frame arrives. With pipelined=False everything runs serially on
+    this thread.
+    With predict=True (pipelined only) fingertips between inference results
+    come from a TipPredictor instead of staying at the last result, and
+    inference is capped at inference_fps (None for no cap).
+    With buffered=True camera frames are captured into recycled buffers
+    (BufferPool), hand tracking mirrors landmarks instead of pixels and the
+    screen image is scaled and mirrored into one preallocated buffer
+    (ScreenBuffer); the allocations per frame are printed at the end.
+    tracker_options are extra keyword arguments for HandTracker
+    (e.g. inference_scale, roi) and game_options for CollectibleGame
+    (e.g. object_speed).
+    With a profiler, every stage of the frame is timed as a span; 'p'
+    toggles its overlay (and enables it if it was off).
+    screen_size is the (width, height) of the screen, read from a temporary
+    Tk root if None. With a Warmup (started before the settings dialog),
+    the camera and the tracker it prepared are used instead of being
+    opened and loaded here; the time from the call to the first frame on
+    screen is printed either way.
+    With SessionResources (kiosk mode), the camera, window, tracker and game
+    come from it, already created by previous rounds, and stay open after
+    this round (its factories then replace tracker_options, game_options,
+    buffered and warmup); the game over dialog is opened on parent.
+    With a QualityController, the inference scale, hand model, inference
+    interval and render scale (the frame is rendered below the screen
+    resolution and scaled up by the window) follow its level, which it
+    adapts to hold its target frame rate.
+    With a record path, every frame's timestamp, hand landmarks, fingertips,
+    scores and caught objects are written there by a SessionRecorder,
+    together with a snapshot of the game at the start (see run_replay).
+    """
+    players, timer_duration = settings
+    profiler = profiler or Profiler(enabled=False)
+    session_start = time.perf_counter()
+
+    # Get screen resolution for fullscreen mode
+    if screen_size is None:
+        temp_root = tk.Tk()
+        screen_size = (temp_root.winfo_screenwidth(), temp_root.winfo_screenheight())
+        temp_root.destroy()
+    screen_width, screen_height = screen_size
+    webcam_width, webcam_height = WEBCAM_SIZE
+
+    owns_resources = resources is None
+    if owns_resources:
+        resources = SessionResources(
+            open_camera,
+            lambda n: make_tracker(n, buffered, profiler, tracker_options),
+            lambda n: make_game(n, screen_size, profiler, game_options),
+            warmup=warmup,
+        )
+    startup = "warm" if resources.ready(players) else "cold"
+
+    cap = resources.capture()
     if not cap.isOpened():
         print("Error: Could not open webcam.")
+        if owns_resources:
+            resources.close()
         return False
-    
-    # Get screen resolution for fullscreen mode
-    temp_root = tk.Tk()
-    screen_width = temp_root.winfo_screenwidth()
-    screen_height = temp_root.winfo_screenheight()
-    temp_root.destroy()
-    
-    # Set webcam to a standard resolution for optimal hand tracking
-    # Use 1280x720 as a good balance between quality and performance
-    webcam_width, webcam_height = 1280, 720
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, webcam_width)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, webcam_height)
-
-    # Create fullscreen window without decorations
-    # Use unique window name to ensure fresh window creation on replay
-    window_name = f"Dot Hunter {int(time.time() * 1000)}"
-    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-    
-    # Allow window to initialize before setting fullscreen
-    cv2.waitKey(1)
-    
-    # Set fullscreen property
-    cv2.setWindowProperty(window_name, cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
 
-    tracker = HandTracker(mode=False, maxHands=players, detectionCon=0.7, trackCon=0.7)
-    game = CollectibleGame(screen_width, screen_height, players=players, max_coins=5, max_bombs=1)
+    # Fullscreen window without decorations
+    window_name = resources.window()
+    tracker = resources.tracker(players)
+    game = resources.game(players)
     
     # Calculate scaling factors for hand tracking
     scale_x = screen_width / webcam_width
     scale_y = screen_height / webcam_height
     
+    huds = {}  # per render scale
+
+    pool = BufferPool() if buffered else None
+    screen = ScreenBuffer((screen_width, screen_height), mirror=True) if buffered else None
+    frames_rendered = 0
+    render_scale = 1.0
+
+    pipeline = None
+    predictor = None
+    if pipelined:
+        pipeline = FramePipeline(
+            cap, tracker, players=players, mirror=not buffered,
+            inference_interval=1.0 / inference_fps if inference_fps else 0.0,
+            buffers=pool, profiler=profiler,
+        ).start()
+        if predict:
+            predictor = TipPredictor(players)
+
+    def apply_quality(settings):
+        nonlocal render_scale
+        tracker.configure(
+            inference_scale=settings.get("inference_scale"),
+            model_complexity=settings.get("model_complexity"),
+        )
+        if pipeline is not None and "inference_interval" in settings:
+            pipeline.inference_interval = settings["inference_interval"]
+        render_scale = settings.get("render_scale", 1.0)
+
+    if quality is not None:
+        quality.reset()
+        apply_quality(quality.settings)
+
+    recorder = None
+    if record is not None:
+        recorder = SessionRecorder(record, {
+            "players": players,
+            "timer_duration": timer_duration,
+            "screen_size": [screen_width, screen_height],
+            "webcam_size": [webcam_width, webcam_height],
+            "pipelined": pipelined,
+            "predict": predict,
+            "game": snapshot_game(game),
+        })
+
     # Start timer (countdown)
     start_time = time.time()
+    last_frame_time = start_time
+    elapsed_time = 0
     game_over = False
 
+    tips = [(None, None)] * players
     while not game_over:
-        ret, frame = cap.read()
-        if not ret:
-            print("Error: Could not read frame from webcam.")
-            break
-        frame = cv2.flip(frame, 1)
-
-        # detect hands on original frame
-        frame = tracker.find_hands(frame, draw=False)
-
-        # get fingertip(s) from original frame
-        if players == 2:
-            by_hand = tracker.get_index_finger_tips_by_handedness(frame)
-            tips = [
-                by_hand.get("Left", (None, None)),
-                by_hand.get("Right", (None, None)),
-            ]
+        frame_start = time.perf_counter()
+        frame = None
+        if pipeline is not None:
+            with profiler.span("wait"):
+                item = pipeline.read_frame(timeout=0.1)
+            if item is not None:
+                frame, timestamp = item
+                result = pipeline.poll()
+                if predictor is not None:
+                    if result is not None:
+                        predictor.update(*result)
+                    tips = predictor.predict(timestamp)
+                elif result is not None:
+                    tips = result[0]
+            elif pipeline.display.closed:
+                print(f"Error: {pipeline.error}")
+                break
         else:
-            x, y = tracker.get_index_finger_tip(frame)
-            tips = [(x, y)]
-        
-        # Resize frame to screen dimensions (stretch to fill entire screen)
-        frame = cv2.resize(frame, (screen_width, screen_height), interpolation=cv2.INTER_LINEAR)
-        
-        # Scale finger positions to match resized frame
-        scaled_tips = []
-        for x, y in tips:
-            if x is not None and y is not None:
-                scaled_tips.append((int(x * scale_x), int(y * scale_y)))
-            else:
-                scaled_tips.append((None, None))
-        tips = scaled_tips
-
-        # draw each fingertip
-        colors = [(255, 0, 0), (0, 255, 0)]
-        for i, (x, y) in enumerate(tips):
-            if x is not None and y is not None:
-                cv2.circle(frame, (x, y), 7, colors[i], -1)
+            with profiler.span("capture"):
+                ret, frame = pool.read(cap) if pool is not None else cap.read()
+            if not ret:
+                print("Error: Could not read frame from webcam.")
+                break
+            if not buffered:
+                with profiler.span("flip"):
+                    frame = cv2.flip(frame, 1)
 
-        # game logic
-        game.draw_objects(frame)
-        game.check_collisions(tips)
-        
-        # Calculate remaining time (countdown)
-        elapsed_time = int(time.time() - start_time)
+            # detect hands on original frame
+            frame = tracker.find_hands(frame, draw=False)
+
+            # get fingertip(s) from original frame
+            tips = tracker.get_player_tips(frame, players)
+
+        # Calculate remaining time (countdown), even while the camera stalls
+        now = time.time()
+        elapsed_time = int(now - start_time)
         remaining_time = max(0, timer_duration - elapsed_time)
-        minutes = remaining_time // 60
-        seconds = remaining_time % 60
-        timer_text = f"Time: {minutes:02d}:{seconds:02d}"
-        
+
         # Check if time is up
         if remaining_time == 0:
             game_over = True
-        
-        # Get text size for centering
-        (text_width, _), _ = cv2.getTextSize(
-            timer_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2
-        )
-        timer_x = (frame.shape[1] - text_width) // 2
-        
-        # Draw timer with background for visibility (red when low)
-        timer_bg_color = (0, 0, 255) if remaining_time <= 10 else (0, 0, 0)
-        cv2.rectangle(
-            frame,
-            (timer_x - 10, 5),
-            (timer_x + text_width + 10, 40),
-            timer_bg_color,
-            -1
-        )
-        cv2.putText(
-            frame,
-            timer_text,
-            (timer_x, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (255, 255, 255),
-            2,
-        )
 
-        # draw scores
-        if players == 1:
-            cv2.putText(
-                frame,
-                f"Score: {game.scores[0]}",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1,
-                (255, 255, 255),
-                2,
-            )
-        else:
-            cv2.putText(
-                frame,
-                f"P1: {game.scores[0]}",
-                (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1,
-                colors[0],
-                2,
-            )
-            cv2.putText(
-                frame,
-                f"P2: {game.scores[1]}",
-                (10, 70),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                1,
-                colors[1],
-                2,
+        if frame is not None:
+            # Resize frame to screen dimensions (stretch to fill entire screen),
+            # or below them at a render scale < 1 (the window scales it up)
+            render_size = (int(screen_width * render_scale), int(screen_height * render_scale))
+            with profiler.span("resize"):
+                if screen is not None:
+                    screen.size = render_size
+                    captured, frame = frame, screen.render(frame)
+                    pool.release(captured)
+                else:
+                    frame = cv2.resize(frame, render_size, interpolation=cv2.INTER_LINEAR)
+            frames_rendered += 1
+
+            # Scale finger positions to match resized frame
+            scaled_tips = []
+            for x, y in tips:
+                if x is not None and y is not None:
+                    scaled_tips.append((int(x * scale_x), int(y * scale_y)))
+                else:
+                    scaled_tips.append((None, None))
+
+            dt = now - last_frame_time
+            last_frame_time = now
+
+            # game logic and drawing
+            play_frame(
+                frame, game, scaled_tips, dt, remaining_time, huds, render_scale, profiler
             )
-            
-        cv2.imshow(window_name, frame)
+            if recorder is not None:
+                hand_results = tracker.results if pipeline is None else pipeline.hand_results
+                recorder.record(
+                    now - start_time, dt, remaining_time, hand_results, scaled_tips,
+                    game.scores, game.last_catches,
+                )
+
+            with profiler.span("imshow"):
+                cv2.imshow(window_name, frame)
+            if frames_rendered == 1:
+                print(
+                    f"Time to first frame ({startup}): "
+                    f"{time.perf_counter() - session_start:.3f} s"
+                )
 
-        key = cv2.waitKey(1) & 0xFF
+        with profiler.span("waitkey"):
+            key = cv2.waitKey(1) & 0xFF
+        if frame is not None:
+            profiler.record("frame", time.perf_counter() - frame_start)
+        profiler.maybe_export()
+        if quality is not None and frame is not None:
+            changed = quality.update(time.perf_counter() - frame_start)
+            if changed is not None:
+                apply_quality(changed)
         if key == ord("q") or key == 27:  # ESC or 'q' to quit
             break
+        if key == ord("p"):
+            profiler.overlay = not profiler.overlay
+            profiler.enabled = profiler.enabled or profiler.overlay
 
         # Stop the game if the window is closed
         if cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1:
             break
 
-    cap.release()
-    cv2.destroyWindow(window_name)
-    cv2.destroyAllWindows()
-    cv2.waitKey(1)
+    if pipeline is not None:
+        pipeline.stop()
+    if recorder is not None:
+        stats = recorder.close()
+        print(f"Recorded {stats['frames']} frames to {stats['path']} ({stats['bytes']} bytes)"
+              + (f", error: {stats['error']}" if stats["error"] else ""))
+    if predictor is not None:
+        print(f"Prediction: {predictor.stats()}")
+    if profiler.enabled:
+        if profiler.export_path:
+            profiler.export()
+        for name, stats in profiler.stats().items():
+            print(f"{name:<11} {stats}")
+    if buffered and frames_rendered:
+        allocations = pool.allocations + tracker.allocations + screen.allocations
+        print(
+            f"Allocations: {allocations / frames_rendered:.3f} per frame "
+            f"(capture {pool.allocations}, tracking {tracker.allocations}, "
+            f"screen {screen.allocations}, {frames_rendered} frames)"
+        )
+    if owns_resources:
+        resources.close()
     
     # Show game over screen (no play again option)
     if game_over or elapsed_time >= timer_duration - 1:  # Only show if game completed
-        show_game_over_screen(game.scores, players, timer_duration)
+        show_game_over_screen(game.scores, players, timer_duration, parent=parent)
         return False
 
     return False  # Don't play again if quit early
 
 
+def run_multicam_session(sources, timer_duration, screen_size, hands=1, tracker_options=None,
+                          game_options=None, profiler=None, realtime=True):
+    """
+    Run a game session where every source (webcam index or video file) has
+    its own capture and hand tracking process (see MultiCamera), so the
+    number of players grows with the number of cores.
+
+    The screen is split into one tile per source, showing its camera; each
+    source's players reach the part of the shared game inside their tile.
+    Objects never spawn in screen areas outside every tile.
+    Fingertip updates of all sources are applied in timestamp order. The
+    session ends when the timer runs out or every source has ended (video
+    files).
+
+    Args:
+        sources (list): Webcam indices or video file paths.
+        timer_duration (int): Round length in seconds.
+        screen_size (tuple): (width, height) of the screen.
+        hands (int): Players per source (1 or 2).
+        tracker_options (dict or None): Extra HandTracker keyword arguments.
+        game_options (dict or None): Extra CollectibleGame keyword arguments.
+        profiler (Profiler or None): Times the stages of the render loop.
+        realtime (bool): Play video files at their frame rate.
+    """
+    profiler = profiler or Profiler(enabled=False)
+    screen_width, screen_height = screen_size
+    cameras = MultiCamera(
+        sources, screen_size, hands=hands, realtime=realtime, tracker_options=tracker_options
+    ).start()
+    players = cameras.players
+    # no player can reach the screen outside the tiles, so nothing spawns there
+    game = make_game(players, screen_size, profiler, game_options, cameras.uncovered)
+    colors = [PLAYER_COLORS[i % len(PLAYER_COLORS)] for i in range(players)]
+    hud = Hud()
+    screen = np.zeros((screen_height, screen_width, 3), dtype=np.uint8)
+    window_name = open_game_window()
+
+    start_time = time.time()
+    last_frame_time = start_time
+    elapsed_time = 0
+    game_over = False
+
+    while not game_over and cameras.running:
+        frame_start = time.perf_counter()
+        with profiler.span("wait"):
+            updates = cameras.poll(timeout=1 / 60)
+        # every update in timestamp order, so no swipe between two renders is lost
+        for tips in updates:
+            game.check_collisions(tips)
+
+        with profiler.span("tiles"):
+            cameras.render(screen)
+        frame = screen
+        for i, (x, y) in enumerate(cameras.tips()):
+            if x is not None and y is not None:
+                cv2.circle(frame, (x, y), 7, colors[i], -1)
+
+        now = time.time()
+        game.update(now - last_frame_time)
+        last_frame_time = now
+        game.draw_objects(frame, batch=True)
+
+        elapsed_time = int(time.time() - start_time)
+        remaining_time = max(0, timer_duration - elapsed_time)
+        if remaining_time == 0:
+            game_over = True
+
+        with profiler.span("hud"):
+            update_game_hud(hud, frame.shape[1], game.scores, remaining_time, colors)
+            hud.draw(frame)
+            profiler.draw_overlay(frame)
+
+        with profiler.span("imshow"):
+            cv2.imshow(window_name, frame)
+
+        with profiler.span("waitkey"):
+            key = cv2.waitKey(1) & 0xFF
+        profiler.record("frame", time.perf_counter() - frame_start)
+        profiler.maybe_export()
+        if key == ord("q") or key == 27:  # ESC or 'q' to quit
+            break
+        if key == ord("p"):
+            profiler.overlay = not profiler.overlay
+            profiler.enabled = profiler.enabled or profiler.overlay
+        if cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1:
+            break
+
+    cameras.stop()
+    for stats in cameras.stats():
+        print(f"Source {stats}")
+    if profiler.enabled:
+        for name, stats in profiler.stats().items():
+            print(f"{name:<11} {stats}")
+    print(f"Final scores: {game.scores}")
+    cv2.destroyWindow(window_name)
+    cv2.destroyAllWindows()
+    cv2.waitKey(1)
+
+    # the game over dialog has room for two players
+    if (game_over or not cameras.running) and players <= 2:
+        show_game_over_screen(game.scores, players, timer_duration)
+
+
+def run_kiosk(session_options, warmup=None, players=1):
+    """
+    Play rounds until the settings dialog is closed. The camera, hand
+    trackers, window, games and one hidden Tk root (the parent of every
+    dialog) stay alive between rounds (see SessionResources).
+
+    Args:
+        session_options (dict): Keyword arguments of run_game_session.
+        warmup (Warmup or None): Background warm-up started before.
+        players (int): Player count selected in the first dialog; later
+            dialogs start with that of the previous round.
+    """
+    root = tk.Tk()
+    root.withdraw()
+    screen_size = (root.winfo_screenwidth(), root.winfo_screenheight())
+    resources = SessionResources(
+        open_camera,
+        lambda players: make_tracker(
+            players, session_options["buffered"], session_options["profiler"],
+            session_options["tracker_options"],
+        ),
+        lambda players: make_game(
+            players, screen_size, session_options["profiler"], session_options["game_options"]
+        ),
+        warmup=warmup,
+    )
+    rounds = 0
+    try:
+        while True:
+            chosen, timer_duration, _ = get_user_settings(parent=root, players=players)
+            if chosen is None:
+                break
+            players = chosen
+            options = session_options
+            if session_options.get("record"):
+                stem, ext = os.path.splitext(session_options["record"])
+                options = {**session_options, "record": f"{stem}-{rounds + 1}{ext}"}
+            run_game_session(
+                (players, timer_duration), screen_size=screen_size, resources=resources,
+                parent=root, **options
+            )
+            rounds += 1
+    finally:
+        resources.close()
+        root.destroy()
+    print(f"Kiosk closed after {rounds} rounds.")
+
+
+def run_replay(path, speed=1.0, display=True, landmarks=False, profiler=None):
+    """
+    Play a recorded round (see SessionRecorder) back through CollectibleGame
+    and the rendering of run_game_session, without a camera or MediaPipe.
+
+    The game is rebuilt from the snapshot taken when the round started and
+    given the recorded fingertips and time steps, so it plays exactly like
+    the original. Frames whose scores or caught objects differ from the
+    recording (e.g. after a change to the game logic) are counted as
+    diverged. The camera image is not recorded: the fingertips, objects
+    and, with landmarks=True, the hand skeletons are drawn on black.
+
+    Args:
+        path (str): Recording file.
+        speed (float): Playback speed relative to the recording; 0 plays as
+            fast as possible (e.g. to benchmark the rendering).
+        display (bool): Show the frames in a fullscreen window; False only
+            renders them.
+        landmarks (bool): Draw the recorded hand landmarks.
+        profiler (Profiler or None): Times every stage of the replayed frames.
+
+    Returns:
+        dict: Frames played, seconds taken, frames per second, number of
+        diverged frames and the index of the first one (None if none).
+    """
+    recording = Recording(path)
+    frames = recording.frames
+    profiler = profiler or Profiler(enabled=False)
+    game = game_from_snapshot(recording.metadata["game"], profiler)
+    screen_width, screen_height = recording.metadata["screen_size"]
+    frame = np.zeros((screen_height, screen_width, 3), dtype=np.uint8)
+    huds = {}
+    window_name = open_game_window() if display else None
+
+    played = diverged = 0
+    first_diverged = None
+    start = time.perf_counter()
+    for i in range(len(recording)):
+        if speed > 0:
+            wait = start + float(frames[i]["time"]) / speed - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        frame_start = time.perf_counter()
+        frame.fill(0)
+        if landmarks:
+            draw_landmarks(frame, recording.landmarks(i))
+        play_frame(
+            frame, game, recording.tips(i), float(frames[i]["dt"]), int(frames[i]["remaining"]),
+            huds, profiler=profiler,
+        )
+        catches = [(p, t, int(x), int(y)) for p, t, x, y in game.last_catches[:MAX_CATCHES]]
+        if game.scores != recording.scores(i) or catches != recording.catches(i):
+            diverged += 1
+            if first_diverged is None:
+                first_diverged = i
+        played += 1
+
+        key = None
+        if display:
+            with profiler.span("imshow"):
+                cv2.imshow(window_name, frame)
+            key = cv2.waitKey(1) & 0xFF
+        profiler.record("frame", time.perf_counter() - frame_start)
+        if display and (key in (ord("q"), 27)
+                        or cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1):
+            break
+
+    elapsed = time.perf_counter() - start
+    if display:
+        cv2.destroyWindow(window_name)
+    return {
+        "frames": played,
+        "seconds": round(elapsed, 3),
+        "fps": round(played / elapsed, 1) if elapsed > 0 else None,
+        "diverged_frames": diverged,
+        "first_diverged": first_diverged,
+        "scores": game.scores,
+    }
+
+
 def main():
     """Main entry point - handles play again loop."""
-    settings = get_user_settings()
-    if settings is None or settings[0] is None:
-        print("Settings canceled. Exiting.")
+    parser = argparse.ArgumentParser(description="Real-time Dot Hunter game.")
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Run capture, inference and rendering serially on one thread "
+        "instead of as a pipeline (for A/B comparison)",
+    )
+    parser.add_argument(
+        "--inference-scale",
+        type=float,
+        default=1.0,
+        help="Downscale factor for the image given to MediaPipe (e.g. 0.5)",
+    )
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="Only run hand tracking on the region around the tracked hands",
+    )
+    parser.add_argument(
+        "--object-speed",
+        type=float,
+        default=0.0,
+        help="Make coins and bombs move and bounce at this speed (pixels/second)",
+    )
+    parser.add_argument(
+        "--point-collisions",
+        action="store_true",
+        help="Only test the current fingertip position instead of its path "
+        "since the previous frame",
+    )
+    parser.add_argument(
+        "--max-sweep",
+        type=float,
+        default=240.0,
+        help="Longest fingertip movement per frame (pixels) tested as a swipe; longer "
+        "jumps, e.g. when tracking swaps hands, only test the new position",
+    )
+    parser.add_argument(
+        "--predict",
+        action="store_true",
+        help="Predict fingertips between hand tracking results instead of "
+        "holding the last ones",
+    )
+    parser.add_argument(
+        "--inference-fps",
+        type=float,
+        default=None,
+        help="Run hand tracking at most this many times per second "
+        "(use with --predict to save CPU)",
+    )
+    parser.add_argument(
+        "--buffers",
+        action="store_true",
+        help="Reuse preallocated frame buffers instead of allocating images every "
+        "frame, and report allocations per frame",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every stage of the frame and print the stats at the end "
+        "(press 'p' in game to show them live)",
+    )
+    parser.add_argument(
+        "--profile-export",
+        default=None,
+        help="Periodically write the stage timings to this file "
+        "(.json overwrites, .jsonl and .csv append); implies --profile",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between two --profile-export writes",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Load the hand tracker and open the camera only after the settings "
+        "dialog (cold start, for comparison)",
+    )
+    parser.add_argument(
+        "--sources",
+        nargs="+",
+        default=None,
+        help="Camera sources (webcam indices or video files), each tracked by its "
+        "own process with its own players, e.g. --sources 0 1 2",
+    )
+    parser.add_argument(
+        "--hands-per-source",
+        type=int,
+        choices=(1, 2),
+        default=1,
+        help="Players per --sources camera (2 tells them apart by handedness)",
+    )
+    parser.add_argument(
+        "--kiosk",
+        action="store_true",
+        help="Play round after round, keeping the camera, hand tracker and window "
+        "open between them; close the settings dialog to exit",
+    )
+    parser.add_argument(
+        "--target-fps",
+        type=float,
+        default=None,
+        help="Adapt the quality (inference scale, hand model, render resolution "
+        "and, with --predict, the inference rate) to hold this frame rate",
+    )
+    parser.add_argument(
+        "--min-inference-scale",
+        type=float,
+        default=0.5,
+        help="Lowest inference scale --target-fps may use",
+    )
+    parser.add_argument(
+        "--min-render-scale",
+        type=float,
+        default=0.5,
+        help="Lowest render resolution --target-fps may use, as a fraction of the screen",
+    )
+    parser.add_argument(
+        "--min-inference-fps",
+        type=float,
+        default=10.0,
+        help="Lowest hand tracking rate --target-fps may use with --predict",
+    )
+    parser.add_argument(
+        "--record",
+        default=None,
+        metavar="FILE",
+        help="Record the landmarks, fingertips, scores and caught objects of the round "
+        "to this file (kiosk rounds get -1, -2, ... suffixes)",
+    )
+    parser.add_argument(
+        "--replay",
+        default=None,
+        metavar="FILE",
+        help="Play a --record file back through the game without a camera or MediaPipe",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Playback speed of --replay (0 plays as fast as possible)",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Render the --replay frames without showing them (e.g. with --profile)",
+    )
+    parser.add_argument(
+        "--show-landmarks",
+        action="store_true",
+        help="Draw the recorded hand skeletons during --replay",
+    )
+    parser.add_argument(
+        "--keep-full-model",
+        action="store_true",
+        help="Never let --target-fps switch to the lite hand model",
+    )
+    args = parser.parse_args()
+    if args.serial and (args.predict or args.inference_fps):
+        parser.error("--predict and --inference-fps need the pipeline (drop --serial)")
+    if args.sources and (args.serial or args.predict or args.buffers or args.kiosk):
+        parser.error("--sources cannot be combined with --serial, --predict, --buffers or --kiosk")
+    if args.sources and args.target_fps:
+        parser.error("--target-fps is not supported with --sources")
+    if args.sources and args.record:
+        parser.error("--record is not supported with --sources")
+
+    profiler = Profiler(
+        enabled=args.profile or args.profile_export is not None,
+        export_path=args.profile_export,
+        export_interval=args.profile_interval,
+    )
+    if args.replay:
+        stats = run_replay(
+            args.replay, args.replay_speed, display=not args.headless,
+            landmarks=args.show_landmarks, profiler=profiler,
+        )
+        print(json.dumps(stats))
+        if profiler.enabled:
+            for name, span_stats in profiler.stats().items():
+                print(f"{name:<11} {span_stats}")
         return
 
-    run_game_session(settings)
+    tracker_options = {"inference_scale": args.inference_scale, "roi": args.roi}
+    session_options = dict(
+        pipelined=not args.serial,
+        tracker_options=tracker_options,
+        game_options={"object_speed": args.object_speed, "swept": not args.point_collisions,
+                      "max_sweep": args.max_sweep},
+        predict=args.predict,
+        inference_fps=args.inference_fps,
+        buffered=args.buffers,
+        profiler=profiler,
+        record=args.record,
+    )
+    if args.record:
+        # a generator of its own, so only the game draws from it
+        session_options["game_options"]["rng"] = random.Random()
+    if args.target_fps:
+        # kiosk rounds share the controller, so each starts at the last level
+        knobs = quality_knobs(
+            inference_scale=args.inference_scale,
+            min_inference_scale=min(args.min_inference_scale, args.inference_scale),
+            min_render_scale=args.min_render_scale,
+            inference_interval=1.0 / args.inference_fps if args.inference_fps else 0.0,
+            max_inference_interval=1.0 / args.min_inference_fps if args.predict else None,
+            min_model_complexity=1 if args.keep_full_model else 0,
+        )
+        session_options["quality"] = QualityController(args.target_fps, quality_levels(knobs))
+
+    if args.sources:
+        # players come from the sources; the dialog only sets the timer
+        _, timer_duration, screen_size = get_user_settings()
+        if timer_duration is None:
+            print("Settings canceled. Exiting.")
+            return
+        run_multicam_session(
+            args.sources, timer_duration, screen_size, hands=args.hands_per_source,
+            tracker_options=tracker_options, game_options=session_options["game_options"],
+            profiler=profiler,
+        )
+        return
+
+    # load MediaPipe and open the camera while the settings dialog is shown;
+    # only the tracker of the last session's player count is warmed up
+    likely_players = last_session_players()
+    warmup = None
+    if not args.no_warmup:
+        warmup = Warmup(
+            lambda players: make_tracker(players, args.buffers, profiler, tracker_options),
+            open_camera, players=(likely_players,), frame_size=WEBCAM_SIZE,
+        ).start()
+
+    # decode and scale the sprites once, before any session starts
+    prewarm_assets()
+
+    if args.kiosk:
+        run_kiosk(session_options, warmup, players=likely_players)
+    else:
+        players, timer_duration, screen_size = get_user_settings(players=likely_players)
+        if players is None:
+            print("Settings canceled. Exiting.")
+            if warmup is not None:
+                warmup.close()
+            return
+
+        run_game_session(
+            (players, timer_duration), screen_size=screen_size, warmup=warmup, **session_options
+        )
+    if warmup is not None:
+        print(f"Warm-up during the settings dialog: {warmup.timings}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.hand_tracker import INDEX_FINGER_TIP, HandTracker
+from src.landmark_cache import CachedResults
+
+
+def _tracker_with_hand():
+    """A tracker holding results with one "Right" hand, without MediaPipe."""
+    tracker = HandTracker(mode=False, maxHands=2)
+    landmarks = np.full((1, 21, 3), 0.25, dtype=np.float32)
+    landmarks[0, INDEX_FINGER_TIP, :2] = (0.5, 0.5)
+    tracker.results = CachedResults(landmarks, ["Right"], [0.9])
+    return tracker
+
+
+def test_getters_before_first_frame():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker = HandTracker(mode=False, maxHands=2)
+
+    landmarks, labels, scores = tracker.get_landmarks(frame)
+    assert landmarks.shape == (0, 21, 3) and landmarks.dtype == np.float64
+    assert labels.dtype == np.dtype("<U5") and scores.dtype == np.float32
+    assert tracker.get_index_finger_tip(frame) == (None, None)
+    assert tracker.get_player_tips(frame, 2) == [(None, None), (None, None)]
+    assert not tracker.loaded
+
+
+def test_getters_after_reset():
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker = _tracker_with_hand()
+    assert tracker.get_index_finger_tip(frame) == (320, 240)
+    assert tracker.get_index_finger_tips_by_handedness(frame) == {"Right": (320, 240)}
+
+    tracker.reset()
+
+    assert len(tracker.get_landmarks(frame)[0]) == 0
+    assert tracker.get_index_finger_tip(frame) == (None, None)
+    assert tracker.get_index_finger_tips_by_handedness(frame) == {}
+    assert tracker.get_player_tips(frame, 1) == [(None, None)]
+    assert tracker.get_player_tips(frame, 2) == [(None, None), (None, None)]